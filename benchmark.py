@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import yaml
+
+from src.benchmark.runner import STAGES, benchmark_size, find_regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark every pipeline stage on synthetic corpora')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+    parser.add_argument('--sizes', type=int, nargs='+', default=None, help='Corpus sizes (default: benchmark.sizes)')
+    parser.add_argument('--stages', nargs='+', choices=[name for name, _ in STAGES], default=None,
+                        help='Only run these stages (default: all)')
+    parser.add_argument('--output', type=str, default='metrics/benchmark.json')
+    parser.add_argument('--workdir', type=str, default=None, help='Where to create workspaces (default: a temp dir)')
+    parser.add_argument('--keep-workspaces', action='store_true')
+    parser.add_argument('--update-baseline', action='store_true', help='Save this run as the regression baseline')
+
+    args = parser.parse_args()
+
+    with open(args.params, 'r') as f:
+        params = yaml.safe_load(f)
+    bench_params = params['benchmark']
+    regression_params = bench_params['regression']
+    sizes = args.sizes or bench_params['sizes']
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='fake-news-bench-')
+    results = {}
+    try:
+        for n_docs in sizes:
+            print(f"Benchmarking {n_docs} documents")
+            workspace = os.path.join(workdir, f'n_{n_docs}')
+            results[f'n_{n_docs}'] = benchmark_size(
+                workspace, params, n_docs, args.stages,
+                seed=bench_params.get('seed', 42),
+                inference_params=bench_params.get('inference')
+            )
+            if not args.keep_workspaces:
+                shutil.rmtree(workspace, ignore_errors=True)
+    except RuntimeError as e:
+        print(f"❌ Benchmark failed: {e}")
+        sys.exit(1)
+    finally:
+        if not args.keep_workspaces and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Benchmark results saved to {args.output}")
+
+    baseline_path = regression_params['baseline']
+    if args.update_baseline:
+        shutil.copyfile(args.output, baseline_path)
+        print(f"Baseline updated: {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(
+            results, baseline,
+            time_tolerance=regression_params['time_tolerance'],
+            memory_tolerance=regression_params['memory_tolerance'],
+            min_seconds=regression_params['min_seconds'],
+            min_latency_ms=regression_params['min_latency_ms']
+        )
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) against {baseline_path}:")
+            for message in regressions:
+                print(f"   {message}")
+            sys.exit(1)
+        print(f"✅ No regressions against {baseline_path}")
+    else:
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one")
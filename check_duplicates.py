@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import sys
+import time
+
+from src.data.dedup import NearDuplicateIndex
+from src.serving.bulk import read_chunks
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check new articles against the near-duplicate index built at ingestion')
+    parser.add_argument('input', help='Articles: CSV or JSONL with content, or title + text')
+    parser.add_argument('output', help='CSV: id, duplicate_of (corpus row id, empty if new), label, similarity')
+    parser.add_argument('--index', type=str, default='data/processed/dedup_index.npz',
+                        help='Index written by data_ingestion (data/processed/rf/dedup_index.npz for RF)')
+    parser.add_argument('--text-column', type=str, default=None, help='Column/field holding the article text')
+    parser.add_argument('--id-column', type=str, default=None, help='Column/field copied to the output id (default: row number)')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = duplicates = 0
+    try:
+        index = NearDuplicateIndex.load(args.index)
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'duplicate_of', 'label', 'similarity'])
+            for chunk in read_chunks(args.input, args.chunk_size, args.text_column, args.id_column):
+                matches, labels, similarities = index.query(chunk.texts)
+                for row_id, match, label, score in zip(chunk.ids, matches, labels, similarities):
+                    found = match >= 0
+                    writer.writerow([row_id, match if found else '', label if found else '',
+                                     f'{score:.4f}' if found else ''])
+                rows += len(chunk.ids)
+                duplicates += int((matches >= 0).sum())
+    except (OSError, ValueError) as e:
+        print(f"❌ Duplicate check failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"✅ {duplicates}/{rows} articles are near-duplicates of the {len(index)}-article corpus "
+          f"({time.perf_counter() - start:.1f}s) -> {args.output}", file=sys.stderr)
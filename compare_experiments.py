@@ -1,75 +1,114 @@
 #!/usr/bin/env python3
-import json
+import argparse
+import sys
+import time
 import pandas as pd
+import yaml
 from tabulate import tabulate
 
-print("=" * 70)
-print("FAKE NEWS DETECTION - MODEL COMPARISON REPORT")
-print("=" * 70)
-
-# Load metrics from both experiments
-try:
-    with open('model/metrics.json', 'r') as f:
-        lr_metrics = json.load(f)
-    print("✓ Loaded Linear Regression metrics")
-except Exception as e:
-    print(f"✗ Failed to load Linear Regression metrics: {e}")
-    lr_metrics = {}
-
-try:
-    with open('metrics/rf/metrics.json', 'r') as f:
-        rf_metrics = json.load(f)
-    print("✓ Loaded Random Forest metrics")
-except Exception as e:
-    print(f"✗ Failed to load Random Forest metrics: {e}")
-    rf_metrics = {}
-
-# Create comparison table
-comparison_data = []
-metrics_to_compare = [
-    'accuracy', 'precision_fake', 'recall_fake', 'f1_fake', 
-    'precision_true', 'recall_true', 'f1_true'
+from src.tracking.metrics_store import MetricsStore
+
+# Metrics shown on the leaderboard, in column order
+LEADERBOARD_METRICS = [
+    'accuracy', 'precision_fake', 'recall_fake', 'f1_fake', 'precision_true', 'recall_true', 'f1_true',
+    'train_time_s', 'throughput_docs_s', 'model_mb'
 ]
+# Trade-off axes: metric and whether larger is better
+TRADEOFFS = {
+    'latency': ('throughput_docs_s', True),
+    'size': ('model_mb', False)
+}
+
+
+def get_path(params, path):
+    node = params
+    for key in path.split('.'):
+        if not isinstance(node, dict) or key not in node:
+            return None
+        node = node[key]
+    return node
+
+
+def pareto_front(table, metric, larger_is_better):
+    """Rows not beaten on both accuracy and metric by any other row"""
+    ranked = table.dropna(subset=['accuracy', metric]).sort_values(
+        [metric, 'accuracy'], ascending=[not larger_is_better, False]
+    )
+    front, best_accuracy = [], float('-inf')
+    for index, accuracy in ranked['accuracy'].items():
+        if accuracy > best_accuracy:
+            front.append(index)
+            best_accuracy = accuracy
+    return front
+
+
+def leaderboard(store, sort, model=None, experiment=None, since_days=None):
+    since = time.time() - since_days * 86400 if since_days else None
+    entries = store.latest_metrics(model=model, experiment=experiment, since=since)
+    table = pd.DataFrame(entries)
+    if table.empty:
+        return table
+    for metric in LEADERBOARD_METRICS:
+        if metric not in table:
+            table[metric] = float('nan')
+    if sort not in table:
+        raise ValueError(f"No recorded run has metric {sort!r}")
+    # Times and sizes rank ascending, quality and throughput descending
+    ascending = sort != 'throughput_docs_s' and sort.endswith(('_s', '_ms', '_mb'))
+    return table.sort_values(sort, ascending=ascending, na_position='last').reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='N-way experiment leaderboard from the metrics store')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+    parser.add_argument('--store', type=str, default=None, help='Metrics store path (default: metrics_store.path)')
+    parser.add_argument('--model', type=str, default=None, help='Only this model (e.g. logistic_regression)')
+    parser.add_argument('--experiment', type=str, default=None, help='Only this experiment id')
+    parser.add_argument('--since-days', type=float, default=None, help='Only runs from the last N days')
+    parser.add_argument('--sort', type=str, default='accuracy', help='Metric to rank by (default: accuracy)')
+    parser.add_argument('--limit', type=int, default=20, help='Rows to show')
+    parser.add_argument('--tradeoff', choices=sorted(TRADEOFFS), default=None,
+                        help='Show only the accuracy Pareto front against latency (throughput) or model size')
+    parser.add_argument('--show-params', nargs='+', default=[], metavar='PATH',
+                        help='Params to add as columns (e.g. model_building.solver rf.train.n_estimators)')
+
+    args = parser.parse_args()
+
+    with open(args.params, 'r') as f:
+        params = yaml.safe_load(f)
+    store_params = dict(params.get('metrics_store') or {}, enabled=True)
+    if args.store:
+        store_params['path'] = args.store
+    store = MetricsStore.from_params(store_params)
+
+    try:
+        table = leaderboard(store, args.sort, args.model, args.experiment, args.since_days)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print("=" * 70)
+    print(f"FAKE NEWS DETECTION - EXPERIMENT LEADERBOARD ({store.count_runs()} runs in {store.path})")
+    print("=" * 70)
+    if table.empty:
+        print("No runs recorded yet: enable metrics_store and run the pipeline (dvc repro / dvc exp run) or sweep.py")
+        sys.exit(0)
+
+    if args.tradeoff:
+        metric, larger_is_better = TRADEOFFS[args.tradeoff]
+        table = table.loc[pareto_front(table, metric, larger_is_better)].reset_index(drop=True)
+        print(f"Pareto front: accuracy vs {metric} ({'higher' if larger_is_better else 'lower'} is better)")
+    table = table.head(args.limit)
+
+    if args.show_params:
+        params_by_hash = store.params_for(table['params_hash'].unique())
+        for path in args.show_params:
+            values = [get_path(params_by_hash.get(hash_, {}), path) for hash_ in table['params_hash']]
+            table[path] = pd.Series(values, index=table.index, dtype=object)
+    table['params_hash'] = table['params_hash'].str[:8]
+    table['updated'] = [time.strftime('%Y-%m-%d %H:%M', time.localtime(value)) for value in table['updated']]
 
-for metric in metrics_to_compare:
-    if metric in lr_metrics and metric in rf_metrics:
-        lr_val = lr_metrics.get(metric, 0)
-        rf_val = rf_metrics.get(metric, 0)
-        diff = rf_val - lr_val
-        improvement = "✓" if diff > 0 else "✗" if diff < 0 else "="
-        
-        comparison_data.append({
-            'Metric': metric.replace('_', ' ').title(),
-            'Linear Regression': f"{lr_val:.4f}",
-            'Random Forest': f"{rf_val:.4f}",
-            'Difference': f"{diff:+.4f}",
-            'Improvement': improvement
-        })
-
-# Display comparison table
-print("\n" + "=" * 70)
-print("PERFORMANCE COMPARISON")
-print("=" * 70)
-print(tabulate(comparison_data, headers='keys', tablefmt='grid', showindex=False))
-
-# Summary
-print("\n" + "=" * 70)
-print("EXPERIMENT SUMMARY")
-print("=" * 70)
-print(f"Linear Regression Accuracy: {lr_metrics.get('accuracy', 'N/A')}")
-print(f"Random Forest Accuracy:     {rf_metrics.get('accuracy', 'N/A')}")
-
-if 'accuracy' in lr_metrics and 'accuracy' in rf_metrics:
-    accuracy_diff = rf_metrics['accuracy'] - lr_metrics['accuracy']
-    print(f"Accuracy Improvement:       {accuracy_diff:+.4f} ({accuracy_diff*100:+.2f}%)")
-    
-    if accuracy_diff > 0:
-        print("🎯 CONCLUSION: Random Forest performs BETTER than Linear Regression")
-    elif accuracy_diff < 0:
-        print("🎯 CONCLUSION: Linear Regression performs BETTER than Random Forest")
-    else:
-        print("🎯 CONCLUSION: Both models perform EQUALLY")
-
-print(f"\nTraining Samples: {rf_metrics.get('training_samples', 'N/A')}")
-print(f"Test Samples:     {rf_metrics.get('test_samples', 'N/A')}")
-print("=" * 70)
+    columns = ['experiment', 'model', 'params_hash', *LEADERBOARD_METRICS, *args.show_params, 'updated']
+    if args.sort not in columns:
+        columns.insert(3, args.sort)
+    shown = table[columns].astype(object).where(table[columns].notna(), '')
+    print(tabulate(shown, headers='keys', tablefmt='github', showindex=False, floatfmt='.4f'))
@@ -1,10 +1,9 @@
-import joblib
-from src.stages.feature_engineering import TextPreprocessor
+from src.serving.prediction_cache import PredictionCache
+from src.serving.predictor import load_scorer
 
-# Load model
-model = joblib.load('model/lr_fake_news_model.joblib')
-vectorizer = joblib.load('data/processed/vectorizer.joblib')
-preprocessor = TextPreprocessor()
+# Load model (scoring bundle if available; otherwise repeated inputs are
+# answered from the prediction cache)
+predictor = load_scorer(cache=PredictionCache())
 
 print("🎭 FAKE NEWS DETECTOR - INTERACTIVE MODE")
 print("Type 'quit' to exit")
@@ -18,14 +17,11 @@ while True:
         
     if user_input.strip():
         # Preprocess and predict
-        processed_text = preprocessor.preprocess_text(user_input)
-        features = vectorizer.transform([processed_text])
-        prediction = model.predict(features)[0]
-        probability = model.predict_proba(features)[0]
+        result, confidence = predictor.predict(user_input)
         
-        if prediction == 0:
-            print(f"�� FAKE NEWS ({(probability[0]*100):.1f}% confident)")
+        if result == "FAKE NEWS":
+            print(f"�� FAKE NEWS ({(confidence*100):.1f}% confident)")
         else:
-            print(f"✅ REAL NEWS ({(probability[1]*100):.1f}% confident)")
+            print(f"✅ REAL NEWS ({(confidence*100):.1f}% confident)")
     else:
         print("Please enter some text!")
@@ -8,12 +8,9 @@ cat model/metrics.json
 
 echo -e "\n2. 🔍 TESTING THE MODEL:"
 python -c "
-import joblib
-from src.stages.feature_engineering import TextPreprocessor
+from src.serving.predictor import load_scorer
 
-model = joblib.load('model/lr_fake_news_model.joblib')
-vectorizer = joblib.load('data/processed/vectorizer.joblib')
-preprocessor = TextPreprocessor()
+predictor = load_scorer()
 
 test_news = [
     'Breaking: Scientists make major discovery in cancer research',
@@ -22,13 +19,8 @@ test_news = [
     'CELEBRITY SELLS SOUL TO DEVIL FOR FAME AND FORTUNE!'
 ]
 
-for news in test_news:
-    processed = preprocessor.preprocess_text(news)
-    features = vectorizer.transform([processed])
-    pred = model.predict(features)[0]
-    proba = model.predict_proba(features)[0]
-    result = 'FAKE' if pred == 0 else 'REAL'
-    confidence = proba[0] if pred == 0 else proba[1]
+for news, (label, confidence) in zip(test_news, predictor.predict_batch(test_news)):
+    result = label.split()[0]
     print(f'📰 {news[:50]}... → {result} ({(confidence*100):.1f}%)')
 "
 
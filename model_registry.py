@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import yaml
+from tabulate import tabulate
+
+from src.serving.registry import ModelRegistry
+
+# Metrics shown by `list`, when the version recorded them
+LIST_METRICS = ['accuracy', 'f1_fake', 'f1_true']
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Manage the local model registry served by serve.py')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+    parser.add_argument('--registry', type=str, default=None, help='Registry path (default: registry.path)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='Show versions; * marks CURRENT')
+    publish = commands.add_parser('publish', help='Register a model + vectorizer as a new version')
+    publish.add_argument('--model', type=str, default='model/lr_fake_news_model.joblib')
+    publish.add_argument('--vectorizer', type=str, default='data/processed/vectorizer.joblib')
+    publish.add_argument('--metrics', type=str, default=None, help='metrics.json to store with the version')
+    publish.add_argument('--activate', action='store_true', help='Make the new version CURRENT')
+    activate = commands.add_parser('activate', help='Make a version CURRENT')
+    activate.add_argument('version')
+    commands.add_parser('rollback', help='Re-activate the version that was CURRENT before')
+    verify = commands.add_parser('verify', help='Check artifact hashes against the manifests')
+    verify.add_argument('version', nargs='?', default=None, help='Default: every version')
+    prune = commands.add_parser('prune', help='Delete old versions (never CURRENT or its rollback target)')
+    prune.add_argument('--keep', type=int, default=None, help='Versions to keep (default: registry.keep_versions)')
+
+    args = parser.parse_args()
+
+    with open(args.params, 'r') as f:
+        registry_params = yaml.safe_load(f).get('registry', {})
+    registry = ModelRegistry(args.registry or registry_params.get('path', 'registry'))
+
+    try:
+        if args.command == 'list':
+            current = registry.current()
+            rows = []
+            for version in registry.versions():
+                manifest = registry.manifest(version)
+                metrics = manifest.get('metrics', {})
+                rows.append([
+                    '*' if version == current else '', version, manifest['created'], manifest['fingerprint'][:12],
+                    *(metrics.get(name, '') for name in LIST_METRICS)
+                ])
+            if not rows:
+                print(f"No versions in {registry.root}: run `dvc repro register_model` or `model_registry.py publish`")
+            else:
+                print(tabulate(rows, headers=['', 'version', 'created', 'fingerprint', *LIST_METRICS],
+                               tablefmt='github', floatfmt='.4f'))
+        elif args.command == 'publish':
+            version, created = registry.publish(args.model, args.vectorizer, args.metrics)
+            print(f"✅ {'Published' if created else 'Already registered as'} {version}")
+            if args.activate and registry.activate(version):
+                print(f"✅ {version} is now CURRENT")
+        elif args.command == 'activate':
+            if registry.activate(args.version):
+                print(f"✅ {args.version} is now CURRENT")
+            else:
+                print(f"{args.version} is already CURRENT")
+        elif args.command == 'rollback':
+            previous = registry.current()
+            print(f"✅ Rolled back {previous} -> {registry.rollback()}")
+        elif args.command == 'verify':
+            for version in [args.version] if args.version else registry.versions():
+                registry.verify(version)
+                print(f"✅ {version}")
+        elif args.command == 'prune':
+            removed = registry.prune(args.keep or registry_params.get('keep_versions', 10))
+            print(f"✅ Removed {len(removed)} version(s){': ' + ', '.join(removed) if removed else ''}")
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import yaml
+
+from src.serving.cascade import CascadePredictor
+from src.serving.prediction_cache import PredictionCache
+from src.serving.predictor import MODEL_PATH, VECTORIZER_PATH, MicroBatcher, Predictor
+from src.serving.registry import ModelRegistry
+
+
+def make_handler(batcher, predictor):
+    class PredictHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, {"status": "ok", "model": predictor.fingerprint[:12], "version": predictor.version})
+            elif self.path == '/stats':
+                cache = predictor.cache
+                stats = {
+                    "cache": cache.stats() if cache is not None else None,
+                    "perf": predictor.perf.summary()
+                }
+                if isinstance(predictor, CascadePredictor):
+                    stats["cascade"] = predictor.stats()
+                self._send_json(200, stats)
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError as e:
+                self._send_json(400, {"error": f"invalid JSON: {e}"})
+                return
+
+            if not isinstance(payload, dict):
+                self._send_json(400, {"error": "expected a JSON object"})
+                return
+            if 'texts' in payload:
+                texts = payload['texts']
+            elif 'text' in payload:
+                texts = [payload['text']]
+            else:
+                self._send_json(400, {"error": "expected 'text' or 'texts'"})
+                return
+            # Anything else would fail the whole micro-batch, other clients' requests included
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                self._send_json(400, {"error": "'text' must be a string and 'texts' a list of strings"})
+                return
+
+            futures = [batcher.submit(text) for text in texts]
+            try:
+                results = [
+                    {"label": label, "confidence": confidence}
+                    for label, confidence in (future.result() for future in futures)
+                ]
+            except Exception as e:
+                self._send_json(500, {"error": f"prediction failed: {e}"})
+                return
+            if 'text' in payload and 'texts' not in payload:
+                self._send_json(200, results[0])
+            else:
+                self._send_json(200, {"predictions": results})
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictHandler
+
+
+def serve_http(batcher, predictor, host, port):
+    server = ThreadingHTTPServer((host, port), make_handler(batcher, predictor))
+    print(f"Serving predictions on http://{host}:{port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def serve_stdin(batcher, window):
+    """Score one article per stdin line, writing JSON lines in input order"""
+    pending = deque()
+
+    def flush_one():
+        label, confidence = pending.popleft().result()
+        sys.stdout.write(json.dumps({"label": label, "confidence": confidence}) + '\n')
+
+    for line in sys.stdin:
+        text = line.rstrip('\n')
+        if not text.strip():
+            continue
+        pending.append(batcher.submit(text))
+        # Bound the number of in-flight requests so memory stays flat
+        if len(pending) >= window:
+            flush_one()
+    while pending:
+        flush_one()
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve fake news predictions over HTTP or stdin')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+    parser.add_argument('--mode', choices=['http', 'stdin'], default='http')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--model', type=str, default=MODEL_PATH)
+    parser.add_argument('--vectorizer', type=str, default=VECTORIZER_PATH)
+    parser.add_argument('--registry', type=str, default=None,
+                        help='Serve the active version of this model registry (default: registry.path if serving.use_registry)')
+    parser.add_argument('--no-registry', action='store_true', help='Serve --model/--vectorizer even if the registry is enabled')
+    parser.add_argument('--cascade', action='store_true',
+                        help='Serve the LR -> RF cascade (pipeline artifacts, band from model/cascade.json)')
+    parser.add_argument('--max-batch-size', type=int, default=None)
+    parser.add_argument('--max-wait-ms', type=float, default=None)
+
+    args = parser.parse_args()
+
+    with open(args.params, 'r') as f:
+        params = yaml.safe_load(f)
+    serving_params = params.get('serving', {})
+
+    max_batch_size = args.max_batch_size or serving_params.get('max_batch_size', 64)
+    max_wait_ms = args.max_wait_ms if args.max_wait_ms is not None else serving_params.get('max_wait_ms', 5.0)
+
+    # The registry's CURRENT version is hot-swapped in when it changes (publish / rollback).
+    # The cascade serves the pipeline artifacts as loaded at start-up.
+    use_cascade = args.cascade or serving_params.get('cascade', False)
+    registry = None
+    if not use_cascade and not args.no_registry and (args.registry or serving_params.get('use_registry', False)):
+        registry = ModelRegistry(args.registry or params.get('registry', {}).get('path', 'registry'))
+        if registry.current() is None:
+            if args.registry:
+                print(f"❌ Model registry {registry.root} has no active version", file=sys.stderr)
+                sys.exit(1)
+            print(f"Model registry {registry.root} has no active version, serving {args.model}", file=sys.stderr)
+            registry = None
+
+    if use_cascade:
+        try:
+            predictor = CascadePredictor.from_params(params)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot load the cascade: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Serving the LR -> RF cascade, band {predictor.band}", file=sys.stderr)
+    else:
+        predictor = Predictor(
+            args.model, args.vectorizer,
+            cache=PredictionCache.from_params(serving_params.get('cache')),
+            artifact_check_interval=serving_params.get('artifact_check_interval_s'),
+            registry=registry
+        )
+    try:
+        with MicroBatcher(predictor, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms) as batcher:
+            if args.mode == 'http':
+                serve_http(batcher, predictor, args.host, args.port)
+            else:
+                serve_stdin(batcher, window=max_batch_size * 4)
+    finally:
+        predictor.close()
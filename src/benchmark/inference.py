@@ -0,0 +1,60 @@
+import argparse
+import json
+import time
+import numpy as np
+
+from src.data.split_store import load_texts
+from src.serving.predictor import Predictor
+
+
+def latency_summary(latencies, docs):
+    """p50/p99 latency in milliseconds and overall throughput"""
+    latencies = np.asarray(latencies)
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+        "docs_per_s": round(docs / latencies.sum(), 1)
+    }
+
+
+def benchmark_inference(texts, single_requests=1000, batch_size=64, batches=100):
+    """Time Predictor loading, one-at-a-time scoring and batched scoring"""
+    start = time.perf_counter()
+    # No prediction cache: every request must reach the model
+    predictor = Predictor()
+    load_s = time.perf_counter() - start
+
+    single = []
+    for i in range(single_requests):
+        start = time.perf_counter()
+        predictor.predict(texts[i % len(texts)])
+        single.append(time.perf_counter() - start)
+
+    batched = []
+    for i in range(batches):
+        offset = (i * batch_size) % len(texts)
+        batch = (texts[offset:] + texts[:offset])[:batch_size]
+        start = time.perf_counter()
+        predictor.predict_batch(batch)
+        batched.append(time.perf_counter() - start)
+
+    return {
+        "load_s": round(load_s, 3),
+        "single": latency_summary(single, single_requests),
+        "batched": dict(latency_summary(batched, batches * batch_size), batch_size=batch_size)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark LR inference on the current artifacts')
+    parser.add_argument('--output', type=str, required=True, help='Where to write the JSON results')
+    parser.add_argument('--single-requests', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--batches', type=int, default=100)
+
+    args = parser.parse_args()
+
+    texts = load_texts('data/processed/test_data.feather').tolist()
+    results = benchmark_inference(texts, args.single_requests, args.batch_size, args.batches)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
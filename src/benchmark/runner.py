@@ -0,0 +1,146 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+import time
+import yaml
+
+from src.benchmark.synthetic import write_synthetic_corpus
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Pipeline stages in dvc.yaml order, as (name, module)
+STAGES = [
+    ('data_ingestion', 'src.stages.data_ingestion'),
+    ('feature_engineering', 'src.stages.feature_engineering'),
+    ('feature_selection', 'src.stages.feature_selection'),
+    ('model_building', 'src.stages.model_building'),
+    ('data_ingestion_rf', 'src.stages.rf.data_ingestion_rf'),
+    ('feature_engineering_rf', 'src.stages.rf.feature_engineering_rf'),
+    ('feature_selection_rf', 'src.stages.rf.feature_selection_rf'),
+    ('train_rf_model', 'src.stages.rf.train_rf'),
+    ('evaluate_rf_model', 'src.stages.rf.evaluate_rf')
+]
+INFERENCE_MODULE = 'src.benchmark.inference'
+
+# Output directories the stages expect to exist
+WORKSPACE_DIRS = ['data/raw', 'data/processed/rf', 'data/features/rf', 'model', 'models/rf', 'metrics/rf', 'logs']
+
+
+def prepare_workspace(workspace, params, n_docs, seed=42):
+    """Create a throwaway pipeline workspace with a synthetic corpus of n_docs articles"""
+    for directory in WORKSPACE_DIRS:
+        os.makedirs(os.path.join(workspace, directory), exist_ok=True)
+    write_synthetic_corpus(os.path.join(workspace, 'data/raw'), n_docs, seed)
+
+    # Every stage sees the whole corpus, and nothing is served from the feature cache
+    params = copy.deepcopy(params)
+    params['data_ingestion']['sample_size_per_class'] = None
+    params['rf']['data']['sample_size_per_class'] = None
+    params['feature_cache'] = {'enabled': False}
+    with open(os.path.join(workspace, 'params.yaml'), 'w') as f:
+        yaml.safe_dump(params, f, sort_keys=False)
+
+
+def run_module(module, workspace, args=(), log_name=None):
+    """Run `python -m module` in the workspace; returns (wall seconds, peak RSS in MB)"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+    log_path = os.path.join(workspace, 'logs', f'{log_name or module}.log')
+
+    with open(log_path, 'wb') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, '-m', module, *args], cwd=workspace, env=env,
+                                stdout=log, stderr=subprocess.STDOUT)
+        # wait4 reports the usage of this child (including worker processes it reaped),
+        # unaffected by earlier stages
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall_s = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    if proc.returncode != 0:
+        with open(log_path, 'r', errors='replace') as f:
+            tail = f.read()[-2000:]
+        raise RuntimeError(f"{module} failed with exit code {proc.returncode}:\n{tail}")
+    # ru_maxrss is in kilobytes on Linux
+    return wall_s, usage.ru_maxrss / 1024
+
+
+def benchmark_size(workspace, params, n_docs, stages=None, seed=42, inference_params=None):
+    """Run the selected stages and the inference benchmark on one corpus size"""
+    start = time.perf_counter()
+    prepare_workspace(workspace, params, n_docs, seed)
+    result = {"n_docs": n_docs, "corpus_s": round(time.perf_counter() - start, 3), "stages": {}}
+
+    for name, module in STAGES:
+        if stages and name not in stages:
+            continue
+        print(f"  [{n_docs}] {name} ...", flush=True)
+        wall_s, peak_rss_mb = run_module(module, workspace, log_name=name)
+        result["stages"][name] = {
+            "wall_s": round(wall_s, 3),
+            "peak_rss_mb": round(peak_rss_mb, 1),
+            "docs_per_s": round(n_docs / wall_s, 1)
+        }
+        # Per-step breakdown from the stage's own instrumentation
+        perf_path = os.path.join(workspace, params['instrumentation']['perf_dir'], f'{name}_perf.json')
+        if os.path.exists(perf_path):
+            with open(perf_path, 'r') as f:
+                spans = json.load(f)['spans']
+            result["stages"][name]["spans_s"] = {span: values['total_s'] for span, values in spans.items()}
+
+    inference_ran = os.path.exists(os.path.join(workspace, 'model/lr_fake_news_model.joblib'))
+    if inference_params is not None and inference_ran:
+        print(f"  [{n_docs}] inference ...", flush=True)
+        output = os.path.join(workspace, 'logs', 'inference.json')
+        args = [
+            '--output', output,
+            '--single-requests', str(inference_params.get('single_requests', 1000)),
+            '--batch-size', str(inference_params.get('batch_size', 64)),
+            '--batches', str(inference_params.get('batches', 100))
+        ]
+        wall_s, peak_rss_mb = run_module(INFERENCE_MODULE, workspace, args, log_name='inference')
+        with open(output, 'r') as f:
+            inference = json.load(f)
+        inference["peak_rss_mb"] = round(peak_rss_mb, 1)
+        result["inference"] = inference
+    return result
+
+
+def _flatten(metrics, prefix=''):
+    flat = {}
+    for key, value in metrics.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def find_regressions(current, baseline, time_tolerance=0.25, memory_tolerance=0.25,
+                     min_seconds=0.5, min_latency_ms=1.0):
+    """Compare two benchmark results; returns one message per metric that got worse.
+
+    Timings below min_seconds / min_latency_ms in both runs are treated as
+    noise. Only metrics present in both results are compared.
+    """
+    current, baseline = _flatten(current), _flatten(baseline)
+    regressions = []
+    for name in sorted(set(current) & set(baseline)):
+        new, old = current[name], baseline[name]
+        if name.endswith('wall_s'):
+            tolerance, floor = time_tolerance, min_seconds
+        elif name.endswith('_ms'):
+            tolerance, floor = time_tolerance, min_latency_ms
+        elif name.endswith('peak_rss_mb'):
+            tolerance, floor = memory_tolerance, 0
+        else:
+            continue
+        if max(new, old) < floor or old <= 0:
+            continue
+        change = new / old - 1
+        if change > tolerance:
+            regressions.append(f"{name}: {old:g} -> {new:g} (+{change:.0%}, tolerance {tolerance:.0%})")
+    return regressions
@@ -0,0 +1,79 @@
+import csv
+import os
+import numpy as np
+
+# Synthetic corpora with the Fake.csv / True.csv schema, so every stage can be
+# benchmarked at sizes the real dataset does not reach. Word frequencies are
+# Zipf-distributed and each class has its own topic words, which keeps the
+# vocabulary, sparsity and learnability roughly in line with the real data.
+
+RAW_HEADER = ['title', 'text', 'subject', 'date']
+SYLLABLES = ['ba', 'ko', 'ri', 'ten', 'mo', 'la', 'vis', 'dor', 'pe', 'nu', 'sta', 'gri',
+             'an', 'el', 'ho', 'mar', 'qui', 'zo', 'fen', 'tu', 'ca', 'lin', 'ro', 'set']
+STOP_WORDS = ['the', 'of', 'and', 'to', 'in', 'a', 'is', 'that', 'for', 'on', 'with', 'as']
+DATELINES = ['WASHINGTON (Reuters) - ', 'NEW YORK (Reuters) - ', 'LONDON (Reuters) - ']
+SUBJECTS = {'fake': ['News', 'politics', 'left-news'], 'true': ['politicsNews', 'worldnews']}
+
+
+def make_vocabulary(size, seed=0):
+    """Deterministic, distinct pseudo-words of three or four syllables"""
+    rng = np.random.default_rng(seed)
+    base = len(SYLLABLES)
+    # Codes >= base**2 need at least three syllables, so every code is a distinct word
+    codes = rng.choice(base ** 4 - base ** 2, size, replace=False) + base ** 2
+    words = []
+    for code in codes.tolist():
+        parts = []
+        while code:
+            code, digit = divmod(code, base)
+            parts.append(SYLLABLES[digit])
+        words.append(''.join(parts))
+    return np.array(words, dtype=object)
+
+
+def _documents(rng, vocab, topic, n_docs, mean_words):
+    ranks = np.arange(1, len(vocab) + 1)
+    zipf = 1.0 / ranks
+    zipf /= zipf.sum()
+    lengths = np.maximum(rng.poisson(mean_words, n_docs), 5)
+    tokens = vocab[rng.choice(len(vocab), lengths.sum(), p=zipf)]
+    # About one word in eight is a class topic word, one in five a stopword
+    draw = rng.random(lengths.sum())
+    topical = draw < 0.125
+    tokens[topical] = topic[rng.integers(0, len(topic), topical.sum())]
+    stop = draw > 0.8
+    tokens[stop] = np.array(STOP_WORDS, dtype=object)[rng.integers(0, len(STOP_WORDS), stop.sum())]
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return [' '.join(tokens[bounds[i]:bounds[i + 1]]) for i in range(n_docs)]
+
+
+def write_class_csv(path, label, n_docs, vocab, topic, seed, chunk_size=10000, mean_words=150):
+    """Stream n_docs synthetic articles of one class ('fake' or 'true') to a CSV"""
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(RAW_HEADER)
+        for start in range(0, n_docs, chunk_size):
+            n = min(chunk_size, n_docs - start)
+            titles = _documents(rng, vocab, topic, n, 10)
+            texts = _documents(rng, vocab, topic, n, mean_words)
+            subjects = rng.choice(SUBJECTS[label], n)
+            for i in range(n):
+                title, text = titles[i], texts[i]
+                if label == 'true':
+                    text = DATELINES[i % len(DATELINES)] + text
+                elif i % 4 == 0:
+                    title = title.upper() + '!'
+                writer.writerow([title, text, subjects[i], 'January 1, 2017'])
+
+
+def write_synthetic_corpus(raw_dir, n_docs, seed=42, vocab_size=50000, chunk_size=10000):
+    """Write Fake.csv and True.csv with n_docs articles in total (half per class)"""
+    os.makedirs(raw_dir, exist_ok=True)
+    vocab = make_vocabulary(vocab_size, seed)
+    rng = np.random.default_rng(seed)
+    topics = rng.permutation(len(vocab))[:400]
+    fake_topic, true_topic = vocab[topics[:200]], vocab[topics[200:]]
+
+    write_class_csv(os.path.join(raw_dir, 'Fake.csv'), 'fake', n_docs // 2, vocab, fake_topic, seed + 1, chunk_size)
+    write_class_csv(os.path.join(raw_dir, 'True.csv'), 'true', n_docs - n_docs // 2, vocab, true_topic, seed + 2, chunk_size)
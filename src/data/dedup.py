@@ -0,0 +1,278 @@
+import json
+import re
+import zlib
+import numpy as np
+
+from src.utils.parallel import chunked, map_chunks
+
+# Near-duplicate detection with MinHash + LSH. Documents are sets of word
+# shingles; num_perm universal hash functions give a MinHash signature whose
+# share of equal values estimates the Jaccard similarity of two documents.
+# Signatures are cut into bands of rows: documents that agree on every row of
+# at least one band become candidates, and only candidates are compared.
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+# Multiplier used to combine several 32-bit values into one 64-bit key (wraps mod 2**64)
+KEY_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+TOKEN = re.compile(r'\w+')
+# np.trapz was renamed in numpy 2.0 (and deprecated under its old name)
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+
+def shingle_hashes(text, shingle_size=5):
+    """Distinct 32-bit hashes of the word shingle_size-grams of text (the whole text if shorter)"""
+    if not isinstance(text, str):
+        return np.empty(0, dtype=np.uint64)
+    words = TOKEN.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words))
+    size = min(shingle_size, len(words))
+    n_shingles = len(words) - size + 1
+    shingles = np.zeros(n_shingles, dtype=np.uint64)
+    for offset in range(size):
+        shingles = shingles * KEY_MULTIPLIER + word_hashes[offset:offset + n_shingles]
+    return np.unique((shingles >> np.uint64(32)) ^ (shingles & np.uint64(MAX_HASH)))
+
+
+class MinHasher:
+    """MinHash signatures from num_perm hash functions h(x) = (a*x + b) mod p, truncated to 32 bits"""
+
+    def __init__(self, num_perm=128, shingle_size=5, seed=42):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # a, b < 2**32 and x < 2**32, so a*x + b never overflows 64 bits
+        self.a = rng.integers(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        """uint32 signature of a document, or None if it has no words"""
+        shingles = shingle_hashes(text, self.shingle_size)
+        if not len(shingles):
+            return None
+        hashed = (self.a[:, None] * shingles[None, :] + self.b[:, None]) % np.uint64(MERSENNE_PRIME)
+        return (hashed & np.uint64(MAX_HASH)).min(axis=1).astype(np.uint32)
+
+    def _signature_chunk(self, texts):
+        signatures = np.zeros((len(texts), self.num_perm), dtype=np.uint32)
+        valid = np.zeros(len(texts), dtype=bool)
+        for i, text in enumerate(texts):
+            signature = self.signature(text)
+            if signature is not None:
+                signatures[i] = signature
+                valid[i] = True
+        return signatures, valid
+
+    def signatures(self, texts, n_jobs=1, chunk_size=2000):
+        """(n, num_perm) signatures and a mask of documents that had any words"""
+        parts = map_chunks(self._signature_chunk, chunked(list(texts), chunk_size), n_jobs)
+        if not parts:
+            return np.zeros((0, self.num_perm), dtype=np.uint32), np.zeros(0, dtype=bool)
+        return np.vstack([s for s, _ in parts]), np.concatenate([v for _, v in parts])
+
+
+def lsh_bands(threshold, num_perm, false_negative_weight=0.8):
+    """(bands, rows) minimizing the weighted false positive / false negative probability mass.
+
+    Candidates are verified on full signatures, so false positives only cost
+    time; false negatives are missed duplicates and are weighted higher.
+    """
+    below = np.linspace(0, threshold, 200)
+    above = np.linspace(threshold, 1, 200)
+    best, best_error = None, np.inf
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = _trapezoid(1 - (1 - below ** rows) ** bands, below)
+            false_negative = _trapezoid((1 - above ** rows) ** bands, above)
+            error = (1 - false_negative_weight) * false_positive + false_negative_weight * false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+def band_keys(signatures, bands, rows):
+    """(bands, n) 64-bit keys: one per band of each signature"""
+    keys = np.zeros((bands, len(signatures)), dtype=np.uint64)
+    for band in range(bands):
+        for column in range(band * rows, (band + 1) * rows):
+            keys[band] = keys[band] * KEY_MULTIPLIER + signatures[:, column].astype(np.uint64)
+    return keys
+
+
+def similarity(signatures, other):
+    """Estimated Jaccard similarity, row by row (other may be a single signature)"""
+    return (signatures == other).mean(axis=1)
+
+
+def near_duplicate_clusters(signatures, valid, threshold, bands, rows):
+    """Cluster id per document; documents in one cluster are (transitively) near-duplicates.
+
+    Documents sharing a band bucket are verified against the bucket's first
+    document on their full signatures, and verified pairs are joined with
+    connected components.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    n = len(signatures)
+    documents = np.flatnonzero(valid)
+    keys = band_keys(signatures[documents], bands, rows)
+    left, right = [], []
+    for band_key in keys:
+        order = np.argsort(band_key, kind='stable')
+        sorted_keys = band_key[order]
+        starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        # Every bucket member is compared with the bucket's first document
+        leaders = order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]
+        members = ~starts
+        if not members.any():
+            continue
+        pairs_left, pairs_right = documents[leaders[members]], documents[order[members]]
+        verified = similarity(signatures[pairs_left], signatures[pairs_right]) >= threshold
+        left.append(pairs_left[verified])
+        right.append(pairs_right[verified])
+
+    left = np.concatenate(left) if left else np.empty(0, dtype=np.int64)
+    right = np.concatenate(right) if right else np.empty(0, dtype=np.int64)
+    graph = coo_matrix((np.ones(len(left), dtype=np.int8), (left, right)), shape=(n, n))
+    _, clusters = connected_components(graph, directed=False)
+    return clusters
+
+
+def cluster_stats(clusters, keep, labels):
+    """Summary of the near-duplicate clusters and of what collapsing them removed"""
+    labels = np.asarray(labels)
+    sizes = np.bincount(clusters)
+    duplicated = np.flatnonzero(sizes > 1)
+    lowest = np.full(len(sizes), labels.max() if len(labels) else 0)
+    highest = np.full(len(sizes), labels.min() if len(labels) else 0)
+    np.minimum.at(lowest, clusters, labels)
+    np.maximum.at(highest, clusters, labels)
+    mixed = (lowest[duplicated] != highest[duplicated]).sum()
+    return {
+        "documents": int(len(clusters)),
+        "kept": int(keep.sum()),
+        "removed": int((~keep).sum()),
+        "removed_by_label": {str(label): int(((labels == label) & ~keep).sum()) for label in np.unique(labels)},
+        "duplicate_clusters": int(len(duplicated)),
+        "documents_in_clusters": int(sizes[duplicated].sum()),
+        "largest_cluster": int(sizes.max()) if len(sizes) else 0,
+        "cluster_sizes": {
+            "2": int((sizes == 2).sum()),
+            "3-5": int(((sizes >= 3) & (sizes <= 5)).sum()),
+            "6-20": int(((sizes >= 6) & (sizes <= 20)).sum()),
+            ">20": int((sizes > 20).sum())
+        },
+        # Clusters whose members carry different labels (one label survives)
+        "mixed_label_clusters": int(mixed)
+    }
+
+
+class NearDuplicateIndex:
+    """Persistent LSH index over the signatures of a deduplicated corpus.
+
+    Band keys are kept sorted, so a new document is checked with one binary
+    search per band plus a comparison against the few candidates found.
+    """
+
+    def __init__(self, hasher, threshold, bands, rows, signatures, row_ids, labels):
+        self.hasher = hasher
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.signatures = signatures
+        self.row_ids = np.asarray(row_ids, dtype=np.int64)
+        self.labels = np.asarray(labels, dtype=np.int64)
+        keys = band_keys(signatures, bands, rows)
+        self._order = np.argsort(keys, axis=1, kind='stable')
+        self._keys = np.take_along_axis(keys, self._order, axis=1)
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def save(self, path):
+        np.savez(
+            path,
+            params=np.array(json.dumps({
+                "num_perm": self.hasher.num_perm, "shingle_size": self.hasher.shingle_size, "seed": self.hasher.seed,
+                "threshold": self.threshold, "bands": self.bands, "rows": self.rows
+            })),
+            signatures=self.signatures, row_ids=self.row_ids, labels=self.labels
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            params = json.loads(str(data['params']))
+            hasher = MinHasher(params['num_perm'], params['shingle_size'], params['seed'])
+            return cls(hasher, params['threshold'], params['bands'], params['rows'],
+                       data['signatures'], data['row_ids'], data['labels'])
+
+    def subset(self, row_ids):
+        """Index over the documents with the given row ids only"""
+        mask = np.isin(self.row_ids, np.asarray(row_ids, dtype=np.int64))
+        return NearDuplicateIndex(self.hasher, self.threshold, self.bands, self.rows,
+                                  self.signatures[mask], self.row_ids[mask], self.labels[mask])
+
+    def query_signature(self, signature):
+        """(position, similarity) of the most similar indexed document, or (-1, 0.0)"""
+        keys = band_keys(signature[None, :], self.bands, self.rows)[:, 0]
+        candidates = []
+        for band, key in enumerate(keys):
+            lo = np.searchsorted(self._keys[band], key, side='left')
+            hi = np.searchsorted(self._keys[band], key, side='right')
+            candidates.append(self._order[band, lo:hi])
+        candidates = np.unique(np.concatenate(candidates))
+        if not len(candidates):
+            return -1, 0.0
+        scores = similarity(self.signatures[candidates], signature)
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return -1, 0.0
+        return int(candidates[best]), float(scores[best])
+
+    def query(self, texts):
+        """Near-duplicate match per text: (row ids, labels, similarities); row id -1 = no match"""
+        matches = np.full(len(texts), -1, dtype=np.int64)
+        labels = np.full(len(texts), -1, dtype=np.int64)
+        similarities = np.zeros(len(texts))
+        for i, text in enumerate(texts):
+            signature = self.hasher.signature(text)
+            if signature is None:
+                continue
+            position, score = self.query_signature(signature)
+            if position >= 0:
+                matches[i], labels[i], similarities[i] = self.row_ids[position], self.labels[position], score
+        return matches, labels, similarities
+
+
+def deduplicate(texts, labels, dedup_params, row_ids=None):
+    """Collapse near-duplicate clusters of a labelled corpus.
+
+    Returns (keep mask, NearDuplicateIndex over the kept documents, stats).
+    One document per cluster is kept: the first one in corpus order. With
+    drop: false the keep mask is all True, but the index and stats are still
+    built.
+    """
+    texts = list(texts)
+    labels = np.asarray(labels)
+    row_ids = np.arange(len(texts)) if row_ids is None else np.asarray(row_ids)
+    threshold = dedup_params['threshold']
+    hasher = MinHasher(dedup_params['num_perm'], dedup_params['shingle_size'], dedup_params.get('seed', 42))
+    bands, rows = lsh_bands(threshold, hasher.num_perm)
+    signatures, valid = hasher.signatures(texts, dedup_params.get('n_jobs', 1), dedup_params.get('chunk_size', 2000))
+
+    clusters = near_duplicate_clusters(signatures, valid, threshold, bands, rows)
+    first = np.full(clusters.max() + 1 if len(clusters) else 0, len(clusters))
+    np.minimum.at(first, clusters, np.arange(len(clusters)))
+    keep = first[clusters] == np.arange(len(clusters))
+    stats = dict(cluster_stats(clusters, keep, labels), threshold=threshold, bands=bands, rows=rows)
+    if not dedup_params.get('drop', True):
+        keep = np.ones(len(clusters), dtype=bool)
+
+    indexed = keep & valid
+    index = NearDuplicateIndex(hasher, threshold, bands, rows, signatures[indexed], row_ids[indexed], labels[indexed])
+    return keep, index, stats
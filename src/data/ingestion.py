@@ -0,0 +1,115 @@
+from itertools import zip_longest
+import numpy as np
+import pandas as pd
+
+# Only these raw columns are ever used downstream; subject/date are never parsed
+RAW_COLUMNS = ['title', 'text']
+# Data params that determine which rows load_labelled_corpus returns
+CORPUS_PARAMS = ('sample_size_per_class', 'sampling', 'random_state')
+
+
+def iter_raw_chunks(path, chunk_size=10000, nrows=None, usecols=RAW_COLUMNS):
+    """Stream a raw CSV in chunks, parsing only the requested columns.
+
+    Columns are read as text: a chunk whose titles are all missing (or all
+    numeric) would otherwise get a float column and break build_content.
+    """
+    yield from pd.read_csv(path, usecols=usecols, chunksize=chunk_size, nrows=nrows, dtype=object)
+
+
+def build_content(df):
+    """Combine title and text the same way the original ingestion stages did"""
+    return df['title'] + ' ' + df['text']
+
+
+def head_sample(path, n, chunk_size=10000):
+    """First n rows of a raw CSV (all rows when n is None), as a content Series"""
+    parts = [build_content(chunk) for chunk in iter_raw_chunks(path, chunk_size, nrows=n)]
+    if not parts:
+        return pd.Series([], dtype=object, name='content')
+    return pd.concat(parts, ignore_index=True).rename('content')
+
+
+def reservoir_sample(path, k, random_state, chunk_size=10000):
+    """Uniform random sample of k rows (Algorithm R) from a raw CSV, in one pass.
+
+    Only the reservoir is kept in memory, so memory scales with k rather than
+    with the file size. The sample is returned in file order.
+    """
+    rng = np.random.default_rng(random_state)
+    reservoir = np.empty(k, dtype=object)
+    row_numbers = np.full(k, -1, dtype=np.int64)
+    seen = 0
+
+    for chunk in iter_raw_chunks(path, chunk_size):
+        content = build_content(chunk).to_numpy(dtype=object)
+        positions = np.arange(seen, seen + len(content))
+
+        # Fill the reservoir while it still has free slots
+        fill = min(max(k - seen, 0), len(content))
+        reservoir[seen:seen + fill] = content[:fill]
+        row_numbers[seen:seen + fill] = positions[:fill]
+
+        # Row i (0-based) replaces slot j ~ U[0, i] when j < k. Within a chunk
+        # a later row must win a slot chosen more than once, so keep the last
+        # occurrence of every slot.
+        rest = positions[fill:]
+        if len(rest):
+            slots = rng.integers(0, rest + 1)
+            chosen = slots < k
+            slots, rows = slots[chosen][::-1], np.nonzero(chosen)[0][::-1] + fill
+            slots, first = np.unique(slots, return_index=True)
+            reservoir[slots] = content[rows[first]]
+            row_numbers[slots] = positions[rows[first]]
+        seen += len(content)
+
+    filled = min(seen, k)
+    order = np.argsort(row_numbers[:filled], kind='stable')
+    return pd.Series(reservoir[:filled][order], name='content', dtype=object)
+
+
+def load_class_sample(path, label, sample_size, sampling='head', random_state=42, chunk_size=10000):
+    """Load one class of the raw corpus as a DataFrame with 'content' and 'label'.
+
+    sampling='head' keeps the first sample_size rows (the original behaviour),
+    'reservoir' draws an unbiased random sample of sample_size rows. A
+    sample_size of None keeps every row.
+    """
+    if sampling == 'head' or sample_size is None:
+        content = head_sample(path, sample_size, chunk_size)
+    elif sampling == 'reservoir':
+        content = reservoir_sample(path, sample_size, [random_state, label], chunk_size)
+    else:
+        raise ValueError(f"Unsupported sampling: {sampling}")
+    return pd.DataFrame({'content': content, 'label': label})
+
+
+def load_labelled_corpus(data_params, fake_path='data/raw/Fake.csv', true_path='data/raw/True.csv'):
+    """Sample Fake (label 0) and True (label 1) articles as one DataFrame"""
+    kwargs = dict(
+        sample_size=data_params['sample_size_per_class'],
+        sampling=data_params.get('sampling', 'head'),
+        random_state=data_params['random_state'],
+        chunk_size=data_params.get('chunk_size', 10000)
+    )
+    df_fake = load_class_sample(fake_path, 0, **kwargs)
+    df_true = load_class_sample(true_path, 1, **kwargs)
+    return pd.concat([df_fake, df_true], ignore_index=True)
+
+
+def iter_labelled_chunks(fake_path='data/raw/Fake.csv', true_path='data/raw/True.csv', chunk_size=10000):
+    """Stream the whole raw corpus as DataFrames with 'content' and 'label'.
+
+    Fake (label 0) and True (label 1) chunks are read in lockstep, so every
+    yielded frame holds up to chunk_size rows of each class. Rows whose title
+    or text is missing are dropped.
+    """
+    fake_chunks = iter_raw_chunks(fake_path, chunk_size)
+    true_chunks = iter_raw_chunks(true_path, chunk_size)
+    for fake, true in zip_longest(fake_chunks, true_chunks):
+        parts = [
+            pd.DataFrame({'content': build_content(chunk), 'label': label})
+            for chunk, label in ((fake, 0), (true, 1)) if chunk is not None
+        ]
+        df = pd.concat(parts, ignore_index=True)
+        yield df[df['content'].notna()].reset_index(drop=True)
@@ -0,0 +1,47 @@
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+# Processed train/test splits are stored as uncompressed Arrow IPC (Feather v2)
+# files with one column per field. Uncompressed files can be memory-mapped, and
+# every column can be read on its own, so e.g. labels are available without
+# touching the article text.
+TEXT_COLUMN = 'content'
+LABEL_COLUMN = 'label'
+ROW_ID_COLUMN = 'row_id'
+
+
+def save_split(path, X, y):
+    """Write a text split (X: content Series, y: label Series) to a columnar file"""
+    table = pa.table({
+        ROW_ID_COLUMN: pa.array(X.index.to_numpy(), type=pa.int64()),
+        TEXT_COLUMN: pa.array(X.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True),
+        LABEL_COLUMN: pa.array(y.to_numpy(), type=pa.int64())
+    })
+    feather.write_feather(table, path, compression='uncompressed')
+
+
+def read_columns(path, columns):
+    """Memory-map a split file and read only the requested columns"""
+    return feather.read_table(path, columns=columns, memory_map=True)
+
+
+def _to_series(table, column):
+    index = pd.Index(table.column(ROW_ID_COLUMN).to_numpy())
+    return pd.Series(table.column(column).to_pandas().to_numpy(), index=index, name=column)
+
+
+def load_texts(path):
+    """Load the article text of a split as a Series indexed like the original split"""
+    return _to_series(read_columns(path, [ROW_ID_COLUMN, TEXT_COLUMN]), TEXT_COLUMN)
+
+
+def load_labels(path):
+    """Load only the labels of a split, without deserializing any text"""
+    return _to_series(read_columns(path, [ROW_ID_COLUMN, LABEL_COLUMN]), LABEL_COLUMN)
+
+
+def load_split(path):
+    """Load both the text and the labels of a split"""
+    table = read_columns(path, [ROW_ID_COLUMN, TEXT_COLUMN, LABEL_COLUMN])
+    return _to_series(table, TEXT_COLUMN), _to_series(table, LABEL_COLUMN)
@@ -0,0 +1,95 @@
+import time
+import numpy as np
+from sklearn.metrics import classification_report
+
+TARGET_NAMES = ('Fake', 'True')
+
+
+def classification_metrics(y_true, y_pred, target_names=TARGET_NAMES):
+    """Accuracy plus per-class precision/recall/F1, keyed like metrics/rf/metrics.json (precision_fake, ...)"""
+    report = classification_report(y_true, y_pred, target_names=list(target_names), output_dict=True)
+    metrics = {"accuracy": round(report['accuracy'], 4)}
+    for name in target_names:
+        suffix = name.lower()
+        metrics[f"precision_{suffix}"] = round(report[name]['precision'], 4)
+        metrics[f"recall_{suffix}"] = round(report[name]['recall'], 4)
+        metrics[f"f1_{suffix}"] = round(report[name]['f1-score'], 4)
+    return metrics
+
+
+class ConfusionCounts:
+    """Confusion matrix (rows: true class, columns: predicted) accumulated one chunk at a time.
+
+    Metrics come from the counts alone, so evaluating a chunked test set never
+    holds all of its predictions.
+    """
+
+    def __init__(self, classes):
+        self.classes = np.asarray(classes)
+        self.counts = np.zeros((len(self.classes), len(self.classes)), dtype=np.int64)
+
+    def _indices(self, labels):
+        labels = np.asarray(labels)
+        # sklearn keeps classes_ sorted
+        indices = np.minimum(np.searchsorted(self.classes, labels), len(self.classes) - 1)
+        if not np.array_equal(self.classes[indices], labels):
+            raise ValueError(f"Labels {sorted(set(labels.tolist()) - set(self.classes.tolist()))} "
+                             f"are not among the classes {self.classes.tolist()}")
+        return indices
+
+    def update(self, y_true, y_pred):
+        k = len(self.classes)
+        flat = self._indices(y_true) * k + self._indices(y_pred)
+        self.counts += np.bincount(flat, minlength=k * k).reshape(k, k)
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    @property
+    def docs(self):
+        return int(self.counts.sum())
+
+    def per_class(self):
+        """(precision, recall, f1, support) arrays, 0 where undefined like sklearn's default"""
+        tp = np.diag(self.counts).astype(float)
+        predicted, support = self.counts.sum(axis=0), self.counts.sum(axis=1)
+        precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+        total = precision + recall
+        f1 = np.divide(2 * precision * recall, total, out=np.zeros_like(tp), where=total > 0)
+        return precision, recall, f1, support
+
+    def metrics(self, target_names=TARGET_NAMES):
+        """Same keys and rounding as classification_metrics"""
+        precision, recall, f1, _ = self.per_class()
+        accuracy = np.trace(self.counts) / self.docs if self.docs else 0.0
+        metrics = {"accuracy": round(float(accuracy), 4)}
+        for i, name in enumerate(target_names):
+            suffix = name.lower()
+            metrics[f"precision_{suffix}"] = round(float(precision[i]), 4)
+            metrics[f"recall_{suffix}"] = round(float(recall[i]), 4)
+            metrics[f"f1_{suffix}"] = round(float(f1[i]), 4)
+        return metrics
+
+    def report(self, target_names=TARGET_NAMES):
+        """Plain-text per-class table, like sklearn's classification_report"""
+        from tabulate import tabulate
+
+        precision, recall, f1, support = self.per_class()
+        rows = [[name, precision[i], recall[i], f1[i], int(support[i])] for i, name in enumerate(target_names)]
+        return tabulate(rows, headers=['', 'precision', 'recall', 'f1-score', 'support'], floatfmt='.4f')
+
+
+def predict_counts(model, X, y, chunk_size=5000):
+    """ConfusionCounts of model.predict over the rows of X, chunk_size rows at a time, and the seconds predicting"""
+    y = np.asarray(y)
+    counts = ConfusionCounts(model.classes_)
+    seconds = 0.0
+    for start in range(0, X.shape[0], chunk_size):
+        begin = time.perf_counter()
+        y_pred = model.predict(X[start:start + chunk_size])
+        seconds += time.perf_counter() - begin
+        counts.update(y[start:start + chunk_size], y_pred)
+    return counts, seconds
@@ -0,0 +1,88 @@
+import time
+
+from src.benchmark.inference import latency_summary
+from src.data.split_store import LABEL_COLUMN, TEXT_COLUMN, read_columns
+from src.evaluation.metrics import ConfusionCounts
+from src.utils.parallel import chunked, map_chunks
+
+# Chunked evaluation of a bulk-scoring model (lr, bundle, rf, rf_flat) on a
+# split file. Worker processes memory-map the split, score row ranges of it
+# end to end (normalize, vectorize, predict) and send back only a confusion
+# matrix per range, so memory stays flat however many articles are scored.
+
+_worker = {}
+
+
+def _init_worker(name, params, split_path):
+    from src.serving.bulk import load_bulk_model, scoring_function
+
+    model = load_bulk_model(name, params)
+    _worker['score'] = scoring_function(model)
+    _worker['classes'] = model.classes
+    _worker['table'] = read_columns(split_path, [TEXT_COLUMN, LABEL_COLUMN])
+
+
+def _rows(table, start, stop):
+    part = table.slice(start, stop - start)
+    return part.column(TEXT_COLUMN).to_pylist(), part.column(LABEL_COLUMN).to_numpy()
+
+
+def _score_rows(rows):
+    texts, y = _rows(_worker['table'], *rows)
+    begin = time.perf_counter()
+    proba = _worker['score'](texts)
+    seconds = time.perf_counter() - begin
+    classes = _worker['classes']
+    return ConfusionCounts(classes).update(y, classes.take(proba.argmax(axis=1))), seconds
+
+
+def split_rows(split_path):
+    return read_columns(split_path, [LABEL_COLUMN]).num_rows
+
+
+def evaluate_split(name, params, split_path, chunk_size=2000, n_jobs=-1):
+    """ConfusionCounts of a bulk model over a split, and the seconds spent scoring (summed over workers)"""
+    n = split_rows(split_path)
+    if not n:
+        raise ValueError(f"{split_path} has no rows to evaluate")
+    ranges = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    results = map_chunks(_score_rows, ranges, n_jobs, initializer=_init_worker, initargs=(name, params, split_path))
+    counts, seconds = None, 0.0
+    for chunk_counts, chunk_seconds in results:
+        counts = chunk_counts if counts is None else counts.merge(chunk_counts)
+        seconds += chunk_seconds
+    return counts, seconds
+
+
+def latency_curve(name, params, split_path, batch_sizes, rows=1024):
+    """Batch latency and throughput at each batch size, scoring the first `rows` articles of the split"""
+    from src.serving.bulk import load_bulk_model, scoring_function
+
+    score = scoring_function(load_bulk_model(name, params))
+    texts, _ = _rows(read_columns(split_path, [TEXT_COLUMN, LABEL_COLUMN]), 0, min(rows, split_rows(split_path)))
+    if not texts:
+        return []
+    # Lazy initialization is not part of any batch's latency
+    score(texts[:max(batch_sizes)])
+
+    curve = []
+    for batch_size in batch_sizes:
+        batches = chunked(texts, batch_size)
+        if len(batches) > 1 and len(batches[-1]) < batch_size:
+            batches.pop()
+        latencies = []
+        for batch in batches:
+            begin = time.perf_counter()
+            score(batch)
+            latencies.append(time.perf_counter() - begin)
+        docs = sum(len(batch) for batch in batches)
+        curve.append(dict(batch_size=batch_size, batches=len(batches), **latency_summary(latencies, docs)))
+    return curve
+
+
+def recommend_batch_size(curve, throughput_fraction=0.9):
+    """Smallest batch size reaching throughput_fraction of the best throughput on the curve"""
+    if not curve:
+        return None
+    best = max(point['docs_per_s'] for point in curve)
+    return min(point['batch_size'] for point in curve if point['docs_per_s'] >= throughput_fraction * best)
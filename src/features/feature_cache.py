@@ -0,0 +1,163 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+
+from src.utils.hashing import artifact_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cache entries changes
+CACHE_VERSION = 1
+ENTRY_FILE = 'entry.json'
+
+# Featurization params that change how the work is scheduled, not its output
+NON_OUTPUT_PARAMS = {'n_jobs', 'chunk_size'}
+
+# Source modules whose code determines the cached outputs. They are located,
+# not imported, so the cache check does not pay for loading sklearn.
+SOURCE_MODULES = ('src.preprocessing.text_normalizer', 'src.features.vectorizers')
+
+
+def _path_size(path):
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(dirpath, name))
+            for dirpath, _, names in os.walk(path) for name in names
+        )
+    return os.path.getsize(path)
+
+
+def _copy(src, dst):
+    if os.path.isdir(src):
+        if os.path.exists(dst):
+            shutil.rmtree(dst)
+        shutil.copytree(src, dst)
+    else:
+        os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+        shutil.copy2(src, dst)
+
+
+def featurization_key(input_paths, variant, featurize_params):
+    """Content key of a featurization: input splits, variant, output-relevant params and source code"""
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}|{variant}|".encode())
+    for path in input_paths:
+        digest.update(artifact_hash(path).encode())
+    relevant = {k: v for k, v in featurize_params.items() if k not in NON_OUTPUT_PARAMS}
+    digest.update(json.dumps(relevant, sort_keys=True).encode())
+    # Code changes to preprocessing or vectorization invalidate every entry
+    for module in SOURCE_MODULES:
+        digest.update(artifact_hash(importlib.util.find_spec(module).origin).encode())
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """Content-addressed cache of featurization outputs (vectorizer + feature matrices).
+
+    Entries are keyed on the hash of the input splits, the preprocessing
+    variant, the output-relevant vectorizer params and the featurization
+    source code. The cache lives outside the DVC outputs (which DVC deletes
+    before re-running a stage) and is shared by every experiment workspace;
+    the least recently used entries are evicted once it grows past max_size_mb.
+    """
+
+    def __init__(self, root, max_size_mb=4096):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def from_params(cls, cache_params):
+        """Build the cache from the feature_cache params block, or None if disabled"""
+        if not cache_params or not cache_params.get('enabled', False):
+            return None
+        return cls(cache_params.get('dir', '~/.cache/fake_news_mlops/features'), cache_params.get('max_size_mb', 4096))
+
+    def make_key(self, input_paths, variant, featurize_params):
+        return featurization_key(input_paths, variant, featurize_params)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _read_entry(self, entry_dir):
+        with open(os.path.join(entry_dir, ENTRY_FILE), 'r') as f:
+            return json.load(f)
+
+    def _write_entry(self, entry_dir, entry):
+        tmp_path = os.path.join(entry_dir, f'{ENTRY_FILE}.{uuid.uuid4().hex}')
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, os.path.join(entry_dir, ENTRY_FILE))
+
+    def restore(self, key, outputs):
+        """Copy a cached entry into place. outputs maps entry names to destination paths.
+
+        Returns True on a hit, False if the key is not cached.
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            entry = self._read_entry(entry_dir)
+        except (OSError, ValueError):
+            return False
+        if set(entry['outputs']) != set(outputs):
+            return False
+
+        for name, dst in outputs.items():
+            _copy(os.path.join(entry_dir, name), dst)
+        entry['last_access'] = time.time()
+        self._write_entry(entry_dir, entry)
+        logger.info(f"Feature cache hit {key[:12]}")
+        return True
+
+    def store(self, key, outputs):
+        """Add freshly computed outputs to the cache, then evict down to the size limit"""
+        entry_dir = self._entry_dir(key)
+        if os.path.exists(entry_dir):
+            return
+        tmp_dir = os.path.join(self.root, f'.tmp-{uuid.uuid4().hex}')
+        os.makedirs(tmp_dir)
+        try:
+            for name, src in outputs.items():
+                _copy(src, os.path.join(tmp_dir, name))
+            now = time.time()
+            self._write_entry(tmp_dir, {
+                "outputs": sorted(outputs),
+                "size_bytes": _path_size(tmp_dir),
+                "created": now,
+                "last_access": now
+            })
+            # Publishing is a single rename, so readers never see half an entry
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(entry_dir):
+                raise
+        logger.info(f"Feature cache stored {key[:12]}")
+        self.evict()
+
+    def entries(self):
+        """All complete entries as (key, entry metadata) pairs"""
+        result = []
+        for key in os.listdir(self.root):
+            if key.startswith('.'):
+                continue
+            try:
+                result.append((key, self._read_entry(self._entry_dir(key))))
+            except (OSError, ValueError):
+                continue
+        return result
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_size_mb"""
+        entries = sorted(self.entries(), key=lambda item: item[1]['last_access'])
+        total = sum(entry['size_bytes'] for _, entry in entries)
+        while entries and total > self.max_bytes:
+            key, entry = entries.pop(0)
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= entry['size_bytes']
+            logger.info(f"Feature cache evicted {key[:12]}")
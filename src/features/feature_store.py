@@ -0,0 +1,60 @@
+import json
+import os
+import numpy as np
+import scipy.sparse as sp
+
+# A stored feature matrix is a directory holding the three CSR component arrays
+# as .npy files plus a small JSON manifest. Loading memory-maps the arrays, so
+# any number of processes can open the same matrix without copying or
+# unpickling it.
+COMPONENTS = ('data', 'indices', 'indptr')
+META_FILE = 'meta.json'
+
+
+def save_features(directory, matrix, vectorizer_hash):
+    """Save a sparse matrix as raw CSR arrays plus shape/dtype/vectorizer metadata"""
+    matrix = sp.csr_matrix(matrix)
+    # Canonical form (sorted, no duplicates) is required on load: scipy would
+    # otherwise try to sort the read-only mapped arrays in place.
+    matrix.sum_duplicates()
+    os.makedirs(directory, exist_ok=True)
+    for name in COMPONENTS:
+        np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(getattr(matrix, name)))
+
+    meta = {
+        "format": "csr",
+        "shape": list(matrix.shape),
+        "nnz": int(matrix.nnz),
+        "dtype": str(matrix.dtype),
+        "index_dtype": str(matrix.indices.dtype),
+        "vectorizer_hash": vectorizer_hash
+    }
+    with open(os.path.join(directory, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_meta(directory):
+    with open(os.path.join(directory, META_FILE), 'r') as f:
+        return json.load(f)
+
+
+def load_features(directory, vectorizer_hash=None, mmap=True):
+    """Open a stored feature matrix, memory-mapped (read-only) by default.
+
+    If vectorizer_hash is given it must match the hash recorded at save time,
+    otherwise a ValueError is raised before any array is touched.
+    """
+    meta = load_meta(directory)
+    if vectorizer_hash is not None and meta['vectorizer_hash'] != vectorizer_hash:
+        raise ValueError(
+            f"Features in {directory} were built with vectorizer {meta['vectorizer_hash'][:12]}, "
+            f"expected {vectorizer_hash[:12]}; re-run feature engineering"
+        )
+
+    mmap_mode = 'r' if mmap else None
+    data, indices, indptr = (
+        np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode) for name in COMPONENTS
+    )
+    matrix = sp.csr_matrix((data, indices, indptr), shape=tuple(meta['shape']), copy=False)
+    matrix.has_canonical_format = True
+    return matrix
@@ -0,0 +1,108 @@
+import copy
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+# Supervised feature selection on fitted TF-IDF features. The selected
+# columns are baked into a pruned copy of the vectorizer (vocabulary and IDF
+# restricted to the survivors), so inference only ever counts the surviving
+# n-grams and every consumer of vectorizer.joblib works unchanged.
+
+SELECTION_METHODS = ('chi2', 'mutual_info')
+
+
+def presence_mutual_info(X, y):
+    """Mutual information (nats) between each feature's presence in a document and the class"""
+    X = sp.csr_matrix(X)
+    present = X.copy()
+    present.data = np.ones_like(present.data)
+    classes = np.unique(y)
+    n_docs = X.shape[0]
+
+    # Contingency counts: documents with / without the feature, per class
+    class_docs = np.array([(y == c).sum() for c in classes], dtype=np.float64)
+    with_feature = np.vstack([
+        np.asarray(present[np.flatnonzero(y == c)].sum(axis=0)).ravel() for c in classes
+    ]).astype(np.float64)
+    without_feature = class_docs[:, None] - with_feature
+
+    p_class = class_docs / n_docs
+    mi = np.zeros(X.shape[1])
+    for counts in (with_feature, without_feature):
+        p_joint = counts / n_docs
+        p_feature = p_joint.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = p_joint * np.log(p_joint / (p_feature[None, :] * p_class[:, None]))
+        mi += np.nansum(terms, axis=0)
+    return mi
+
+
+def score_features(X, y, method):
+    """Relevance score per column of X for labels y (higher is better)"""
+    y = np.asarray(y)
+    if method == 'chi2':
+        from sklearn.feature_selection import chi2
+        scores, _ = chi2(X, y)
+    elif method == 'mutual_info':
+        scores = presence_mutual_info(X, y)
+    else:
+        raise ValueError(f"Unknown feature selection method {method!r}; expected one of {SELECTION_METHODS}")
+    # chi2 is undefined for columns that never occur
+    return np.nan_to_num(np.asarray(scores, dtype=np.float64), nan=0.0)
+
+
+def top_k(scores, k):
+    """Indices of the k best scores, ascending (ties keep the lower column)"""
+    order = np.argsort(-scores, kind='stable')[:k]
+    return np.sort(order)
+
+
+def select_columns(X, columns, norm='l2'):
+    """Keep columns of a row-normalized TF-IDF matrix and re-normalize the rows.
+
+    The result equals what the pruned vectorizer produces for the same
+    documents: dropping columns scales each row by a constant, which the
+    re-normalization undoes.
+    """
+    selected = sp.csr_matrix(X)[:, columns]
+    if norm:
+        selected = normalize(selected, norm=norm, copy=False)
+    return selected
+
+
+def select_vectorizer(vectorizer, columns):
+    """Copy of a fitted vocabulary-based TF-IDF vectorizer that only produces the given columns"""
+    if not hasattr(vectorizer, 'vocabulary_'):
+        raise ValueError("Feature selection needs a vocabulary-based vectorizer (vectorizer: tfidf)")
+    terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+
+    selected = copy.deepcopy(vectorizer)
+    # Columns ascend, so the pruned vocabulary stays in sorted term order
+    selected.vocabulary_ = {term: i for i, term in enumerate(terms[columns])}
+    if getattr(vectorizer, 'use_idf', True):
+        selected._tfidf.idf_ = np.asarray(vectorizer.idf_)[columns]
+    selected._tfidf.n_features_in_ = len(columns)
+    return selected
+
+
+def select_features(vectorizer, X_train, y_train, select_params, extra=()):
+    """Apply a feature_selection / rf.select params block.
+
+    Returns (vectorizer, X_train, [selected extra matrices], columns); columns
+    is None when nothing was dropped (method null, k null or k >= width, or
+    a hashing vectorizer).
+    """
+    method = (select_params or {}).get('method')
+    k = (select_params or {}).get('k')
+    if not method or not k or k >= X_train.shape[1] or not hasattr(vectorizer, 'vocabulary_'):
+        return vectorizer, X_train, list(extra), None
+    columns = top_k(score_features(X_train, y_train, method), k)
+    norm = getattr(vectorizer, 'norm', 'l2')
+    return (
+        select_vectorizer(vectorizer, columns),
+        select_columns(X_train, columns, norm),
+        [select_columns(X, columns, norm) for X in extra],
+        columns
+    )
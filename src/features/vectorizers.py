@@ -0,0 +1,341 @@
+import re
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from src.utils.parallel import chunked, map_chunks, resolve_n_jobs
+
+# sklearn's default token pattern (words of two or more characters)
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+# Per-worker state for the transform pass, set once by the pool initializer so
+# the IDF vector is not pickled again for every chunk.
+_worker_state = {}
+
+
+def _init_worker(hasher, idf):
+    _worker_state['hasher'] = hasher
+    _worker_state['idf'] = idf
+
+
+class NewsAnalyzer:
+    """Picklable document -> n-gram list analyzer.
+
+    Optionally normalizes the document first, then tokenizes and builds word
+    n-grams in one pass. On normalized text the output is identical to
+    TfidfVectorizer(lowercase=False, ngram_range=..., token_pattern=...).build_analyzer().
+    Unlike that analyzer it holds no reference to a vectorizer, so it can be
+    shipped to worker processes on its own.
+    """
+
+    def __init__(self, ngram_range=(1, 1), token_pattern=TOKEN_PATTERN, normalizer=None):
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.normalizer = normalizer
+        self._token_re = re.compile(token_pattern)
+
+    def __call__(self, doc):
+        if self.normalizer is not None:
+            doc = self.normalizer.normalize(doc)
+        if not isinstance(doc, str):
+            raise ValueError(f"Invalid document {doc!r}, expected a string")
+        tokens = self._token_re.findall(doc)
+
+        # Same n-gram order as sklearn's _word_ngrams
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n + 1, len(tokens) + 1)):
+            for i in range(len(tokens) - n + 1):
+                grams.append(' '.join(tokens[i:i + n]))
+        return grams
+
+
+def _count_terms(analyzer, docs, vocabulary=None, dtype=np.float64):
+    """Term counts of docs, as (sorted terms, CSR counts) or CSR counts over a fixed vocabulary"""
+    fixed = vocabulary is not None
+    terms = vocabulary if fixed else {}
+    indices, values, indptr = [], [], [0]
+    for doc in docs:
+        counts = {}
+        for gram in analyzer(doc):
+            column = terms.get(gram)
+            if column is None:
+                if fixed:
+                    continue
+                column = terms[gram] = len(terms)
+            counts[column] = counts.get(column, 0) + 1
+        indices.extend(counts)
+        values.extend(counts.values())
+        indptr.append(len(indices))
+
+    indices = np.asarray(indices, dtype=np.int64)
+    if not fixed:
+        # Renumber columns in sorted term order, like CountVectorizer._sort_features
+        sorted_terms = sorted(terms)
+        order = np.empty(len(sorted_terms), dtype=np.int64)
+        order[[terms[term] for term in sorted_terms]] = np.arange(len(sorted_terms))
+        indices = order[indices] if len(indices) else indices
+    matrix = sp.csr_matrix(
+        (np.asarray(values, dtype=dtype), indices, np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(terms))
+    )
+    matrix.sort_indices()
+    return matrix if fixed else (np.array(sorted_terms, dtype=object), matrix)
+
+
+def _init_count_worker(analyzer, vocabulary, dtype):
+    _worker_state['analyzer'] = analyzer
+    _worker_state['vocabulary'] = vocabulary
+    _worker_state['dtype'] = dtype
+
+
+def _chunk_count_terms(chunk):
+    return _count_terms(_worker_state['analyzer'], chunk, _worker_state['vocabulary'], _worker_state['dtype'])
+
+
+def _document_frequency(hasher, chunk):
+    counts = hasher.transform(chunk)
+    df = np.bincount(counts.indices, minlength=hasher.n_features)
+    return df, counts.shape[0]
+
+
+def _hashed_tfidf(hasher, idf, chunk):
+    counts = hasher.transform(chunk)
+    counts.data *= idf[counts.indices]
+    return normalize(counts, norm='l2', copy=False)
+
+
+def _chunk_document_frequency(chunk):
+    return _document_frequency(_worker_state['hasher'], chunk)
+
+
+def _chunk_tfidf(chunk):
+    return _hashed_tfidf(_worker_state['hasher'], _worker_state['idf'], chunk)
+
+
+class HashingTfidfVectorizer:
+    """TF-IDF over n-grams hashed into a fixed number of columns.
+
+    Unlike TfidfVectorizer there is no vocabulary to build, so memory does not
+    grow with the number of distinct n-grams. fit() makes one parallel pass
+    over chunks of documents to count document frequencies, transform() makes
+    a second pass that weights the hashed counts by IDF and L2-normalizes each
+    row. IDF uses the same smoothed formula as TfidfTransformer.
+    Input documents are expected to be normalized already, unless a
+    normalizer is passed to fit/transform (it then runs in the workers).
+    """
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 1), n_jobs=1, chunk_size=5000, dtype=np.float64):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+
+    def _hasher(self, normalizer=None):
+        return HashingVectorizer(
+            n_features=self.n_features,
+            preprocessor=normalizer,
+            ngram_range=self.ngram_range,
+            lowercase=False,
+            alternate_sign=False,
+            norm=None,
+            dtype=self.dtype
+        )
+
+    def _chunks(self, docs):
+        return chunked(list(docs), self.chunk_size)
+
+    def _parallel(self, chunks):
+        return resolve_n_jobs(self.n_jobs) > 1 and len(chunks) > 1
+
+    def _document_frequencies(self, docs, normalizer=None):
+        hasher = self._hasher(normalizer)
+        chunks = self._chunks(docs)
+        if self._parallel(chunks):
+            results = map_chunks(
+                _chunk_document_frequency, chunks, self.n_jobs,
+                initializer=_init_worker, initargs=(hasher, None)
+            )
+        else:
+            results = [_document_frequency(hasher, chunk) for chunk in chunks]
+        df = np.zeros(self.n_features, dtype=np.int64)
+        n_docs = 0
+        for chunk_df, chunk_docs in results:
+            df += chunk_df
+            n_docs += chunk_docs
+        return df, n_docs
+
+    def _set_idf(self, df, n_docs):
+        self.df_ = df
+        self.n_docs_ = n_docs
+        self.idf_ = (np.log((1 + n_docs) / (1 + df)) + 1).astype(self.dtype)
+
+    def fit(self, docs, y=None, normalizer=None):
+        self._set_idf(*self._document_frequencies(docs, normalizer))
+        return self
+
+    def partial_fit(self, docs, y=None):
+        """Add documents to the document frequencies and refresh the IDF"""
+        if not hasattr(self, 'df_'):
+            return self.fit(docs)
+        df, n_docs = self._document_frequencies(docs)
+        self._set_idf(self.df_ + df, self.n_docs_ + n_docs)
+        return self
+
+    def transform(self, docs, normalizer=None):
+        if not hasattr(self, 'idf_'):
+            raise ValueError("HashingTfidfVectorizer is not fitted yet")
+        chunks = self._chunks(docs)
+        if not chunks:
+            return sp.csr_matrix((0, self.n_features), dtype=self.dtype)
+        hasher = self._hasher(normalizer)
+        if self._parallel(chunks):
+            parts = map_chunks(
+                _chunk_tfidf, chunks, self.n_jobs,
+                initializer=_init_worker, initargs=(hasher, self.idf_)
+            )
+        else:
+            parts = [_hashed_tfidf(hasher, self.idf_, chunk) for chunk in chunks]
+        return parts[0] if len(parts) == 1 else sp.vstack(parts, format='csr')
+
+    def fit_transform(self, docs, y=None, normalizer=None):
+        docs = list(docs)
+        return self.fit(docs, normalizer=normalizer).transform(docs, normalizer)
+
+
+class ShardedTfidfVectorizer(TfidfVectorizer):
+    """TfidfVectorizer whose counting pass is sharded across worker processes.
+
+    Each worker analyzes a chunk of documents with a NewsAnalyzer (tokenize,
+    n-grams and, optionally, normalization in one pass) and counts its terms.
+    fit merges the chunk counts and selects the max_features most frequent
+    terms exactly as CountVectorizer does, so vocabulary_, idf_ and the
+    matrices are those of a single-process TfidfVectorizer(lowercase=False).
+    The fitted object is still a TfidfVectorizer: transform() in a single
+    process, the scoring bundle export and incremental updates work unchanged.
+
+    fit_transform/transform take an optional normalizer for raw documents;
+    it is applied in the workers and never stored, so the fitted vectorizer
+    keeps expecting normalized text.
+    """
+
+    def __init__(self, *, max_features=None, ngram_range=(1, 1), token_pattern=TOKEN_PATTERN,
+                 n_jobs=1, chunk_size=5000, dtype=np.float64):
+        super().__init__(
+            lowercase=False,
+            max_features=max_features,
+            ngram_range=ngram_range,
+            token_pattern=token_pattern,
+            dtype=dtype
+        )
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+
+    def _count(self, docs, normalizer=None, vocabulary=None):
+        analyzer = NewsAnalyzer(self.ngram_range, self.token_pattern, normalizer)
+        chunks = chunked(list(docs), self.chunk_size)
+        if resolve_n_jobs(self.n_jobs) > 1 and len(chunks) > 1:
+            return map_chunks(
+                _chunk_count_terms, chunks, self.n_jobs,
+                initializer=_init_count_worker, initargs=(analyzer, vocabulary, self.dtype)
+            )
+        return [_count_terms(analyzer, chunk, vocabulary, self.dtype) for chunk in chunks]
+
+    def _merge_vocabulary(self, parts):
+        """Global vocabulary from per-chunk (terms, counts); returns (vocabulary, count matrix)"""
+        all_terms = np.concatenate([terms for terms, _ in parts])
+        terms, inverse = np.unique(all_terms, return_inverse=True)
+        if not len(terms):
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+        term_counts = np.zeros(len(terms), dtype=self.dtype)
+        offset = 0
+        columns = []
+        for chunk_terms, counts in parts:
+            chunk_columns = inverse[offset:offset + len(chunk_terms)]
+            offset += len(chunk_terms)
+            term_counts[chunk_columns] += np.asarray(counts.sum(axis=0)).ravel()
+            columns.append(chunk_columns)
+
+        # CountVectorizer._limit_features with min_df=1, max_df=1.0: the same
+        # argsort over the same (sorted-term) count vector picks the same terms
+        keep = np.ones(len(terms), dtype=bool)
+        if self.max_features is not None and len(terms) > self.max_features:
+            keep = np.zeros(len(terms), dtype=bool)
+            keep[(-term_counts).argsort()[:self.max_features]] = True
+        new_columns = np.where(keep, np.cumsum(keep) - 1, -1)
+        vocabulary = dict(zip(terms[keep].tolist(), range(int(keep.sum()))))
+
+        matrices = []
+        for chunk_columns, (_, counts) in zip(columns, parts):
+            # Project chunk-local columns onto the kept global columns
+            target = new_columns[chunk_columns]
+            rows = np.flatnonzero(target >= 0)
+            projection = sp.csr_matrix(
+                (np.ones(len(rows), dtype=self.dtype), (rows, target[rows])), shape=(len(target), len(vocabulary))
+            )
+            matrix = (counts @ projection).tocsr()
+            matrix.sort_indices()
+            matrices.append(matrix)
+        return vocabulary, sp.vstack(matrices, format='csr') if len(matrices) > 1 else matrices[0]
+
+    def _fit_counts(self, docs, normalizer=None):
+        self._validate_ngram_range()
+        self._tfidf = TfidfTransformer(
+            norm=self.norm,
+            use_idf=self.use_idf,
+            smooth_idf=self.smooth_idf,
+            sublinear_tf=self.sublinear_tf
+        )
+        vocabulary, counts = self._merge_vocabulary(self._count(docs, normalizer))
+        self.vocabulary_ = vocabulary
+        self.fixed_vocabulary_ = False
+        self._tfidf.fit(counts)
+        return counts
+
+    def fit(self, raw_documents, y=None, normalizer=None):
+        self._fit_counts(raw_documents, normalizer)
+        return self
+
+    def fit_transform(self, raw_documents, y=None, normalizer=None):
+        counts = self._fit_counts(raw_documents, normalizer)
+        return self._tfidf.transform(counts, copy=False)
+
+    def transform(self, raw_documents, normalizer=None):
+        if not hasattr(self, 'vocabulary_'):
+            raise ValueError("The TF-IDF vectorizer is not fitted")
+        parts = self._count(raw_documents, normalizer, self.vocabulary_)
+        if not parts:
+            return sp.csr_matrix((0, len(self.vocabulary_)), dtype=self.dtype)
+        counts = parts[0] if len(parts) == 1 else sp.vstack(parts, format='csr')
+        return self._tfidf.transform(counts, copy=False)
+
+
+def build_vectorizer(featurize_params):
+    """Create the vectorizer selected by a feature_engineering/rf.featurize params block"""
+    kind = featurize_params.get('vectorizer', 'tfidf')
+    ngram_range = tuple(featurize_params['ngram_range'])
+    # float32 halves the feature matrices (and is what tree models train on anyway)
+    dtype = np.dtype(featurize_params.get('dtype', 'float64'))
+
+    if kind == 'tfidf':
+        # Documents are normalized (and lowercased) before they reach the vectorizer
+        return ShardedTfidfVectorizer(
+            max_features=featurize_params['max_features'],
+            ngram_range=ngram_range,
+            n_jobs=featurize_params.get('n_jobs', 1),
+            chunk_size=featurize_params.get('chunk_size', 5000),
+            dtype=dtype
+        )
+    if kind == 'hashing':
+        return HashingTfidfVectorizer(
+            n_features=featurize_params.get('hash_n_features', 2 ** 18),
+            ngram_range=ngram_range,
+            n_jobs=featurize_params.get('n_jobs', 1),
+            chunk_size=featurize_params.get('chunk_size', 5000),
+            dtype=dtype
+        )
+    raise ValueError(f"Unsupported vectorizer: {kind}")
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import joblib
+from joblib.numpy_pickle import NumpyPickler
+
+from src.data.split_store import load_labels, load_split, load_texts, save_split
+from src.features.feature_store import load_features, save_features
+from src.utils.hashing import artifact_hash
+
+# Stage inputs and outputs go through an Artifacts object. The base class is
+# plain disk I/O, which is what a stage run by DVC (`python -m ...`) uses.
+# MemoryArtifacts, used by the in-process pipeline executor, still writes every
+# output (DVC hashes and caches them) and keeps what it reads back from disk,
+# so every downstream stage shares one load and none re-checks it. Stages
+# never get the live object a stage wrote, and pickles are written by
+# dump_pickle: outputs must not depend on how the pipeline was run.
+
+
+def _key(path):
+    return os.path.normpath(path)
+
+
+class _CanonicalPickler(NumpyPickler):
+    """joblib's pickler, memoizing strings by value instead of identity.
+
+    Which attribute-name strings an unpickled object shares depends on what
+    the process loaded before (instance dicts share their keys per class), so
+    pickling a loaded estimator is otherwise not reproducible.
+    """
+
+    def __init__(self, fp, protocol=None):
+        super().__init__(fp, protocol=protocol)
+        self._strings = {}
+
+    def save(self, obj):
+        if type(obj) is str:
+            obj = self._strings.setdefault(obj, obj)
+        return super().save(obj)
+
+
+def dump_pickle(obj, path):
+    """joblib.dump whose bytes depend only on the object's value (loaded with joblib.load)"""
+    with open(path, 'wb') as f:
+        _CanonicalPickler(f).dump(obj)
+
+
+class Artifacts:
+    """Stage artifacts on disk"""
+
+    def texts(self, path):
+        return load_texts(path)
+
+    def labels(self, path):
+        return load_labels(path)
+
+    def split(self, path):
+        return load_split(path)
+
+    def save_split(self, path, X, y):
+        save_split(path, X, y)
+
+    def load(self, path):
+        return joblib.load(path)
+
+    def dump(self, path, obj):
+        dump_pickle(obj, path)
+
+    def hash(self, path):
+        return artifact_hash(path)
+
+    def features(self, path, vectorizer_path):
+        """Feature matrix, checked against the vectorizer it was built with"""
+        return load_features(path, self.hash(vectorizer_path))
+
+    def save_features(self, path, matrix, vectorizer_path):
+        save_features(path, matrix, self.hash(vectorizer_path))
+
+    def shared(self, name, key, func):
+        """Result of func(); stages calling it with the same name and key may share one call"""
+        return func()
+
+    def release(self, path):
+        pass
+
+
+class MemoryArtifacts(Artifacts):
+    """Artifacts that are written to disk and also kept in memory for later stages.
+
+    Kept objects are shared between stages, which must treat them as read-only.
+    """
+
+    def __init__(self):
+        self._objects = {}
+        self._hashes = {}
+        self._shared = {}
+        self._lock = threading.Lock()
+        self._shared_locks = {}
+
+    def _get(self, path, loader):
+        key = _key(path)
+        with self._lock:
+            if key in self._objects:
+                return self._objects[key]
+        value = loader(path)
+        with self._lock:
+            self._objects[key] = value
+        return value
+
+    def _put(self, path, value):
+        with self._lock:
+            self._objects[_key(path)] = value
+
+    def texts(self, path):
+        return self.split(path)[0]
+
+    def labels(self, path):
+        key = _key(path)
+        with self._lock:
+            if key in self._objects:
+                return self._objects[key][1]
+        # Not produced in this run: read only the label column
+        return load_labels(path)
+
+    def split(self, path):
+        return self._get(path, load_split)
+
+    def save_split(self, path, X, y):
+        save_split(path, X, y)
+        self._put(path, load_split(path))
+
+    def load(self, path):
+        return self._get(path, joblib.load)
+
+    def dump(self, path, obj):
+        dump_pickle(obj, path)
+        digest = artifact_hash(path)
+        with self._lock:
+            self._hashes[_key(path)] = digest
+        self._put(path, joblib.load(path))
+
+    def hash(self, path):
+        key = _key(path)
+        with self._lock:
+            if key in self._hashes:
+                return self._hashes[key]
+        digest = artifact_hash(path)
+        with self._lock:
+            self._hashes[key] = digest
+        return digest
+
+    def features(self, path, vectorizer_path):
+        return self._get(path, lambda p: load_features(p, self.hash(vectorizer_path)))
+
+    def save_features(self, path, matrix, vectorizer_path):
+        super().save_features(path, matrix, vectorizer_path)
+        self._put(path, load_features(path))
+
+    def shared(self, name, key, func):
+        """func() runs once per (name, key); concurrent callers wait for its result"""
+        shared_key = (name, json.dumps(key, sort_keys=True, default=str))
+        with self._lock:
+            lock = self._shared_locks.setdefault(shared_key, threading.Lock())
+        with lock:
+            if shared_key not in self._shared:
+                self._shared[shared_key] = func()
+            return self._shared[shared_key]
+
+    def release(self, path):
+        """Drop the in-memory copy of an output no remaining stage reads"""
+        with self._lock:
+            self._objects.pop(_key(path), None)
+
+    def release_shared(self):
+        with self._lock:
+            self._shared.clear()
@@ -0,0 +1,189 @@
+import copy
+import importlib
+import logging
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import yaml
+
+from src.pipeline.artifacts import MemoryArtifacts
+
+logger = logging.getLogger(__name__)
+
+# Runs the dvc.yaml stages in one Python process. The DAG comes from
+# dvc.yaml itself (a stage depends on the stages whose outs it lists in its
+# deps), so it cannot drift from what `dvc repro` runs. Stages are called as
+# functions on worker threads: independent branches (LR and RF) overlap,
+# imports happen once, and intermediates are handed over in memory through
+# MemoryArtifacts while every output is still written for DVC.
+
+DVC_FILE = 'dvc.yaml'
+
+# Stage function of each stage module, called as func(params, artifacts)
+ENTRYPOINTS = {
+    'src.stages.data_ingestion': 'load_data',
+    'src.stages.feature_engineering': 'engineer_features',
+    'src.stages.feature_selection': 'run_feature_selection',
+    'src.stages.model_building': 'train_model',
+    'src.stages.export_bundle': 'export_scoring_bundle',
+    'src.stages.register_model': 'register_model',
+    'src.stages.incremental_update': 'update_model',
+    'src.stages.calibrate_cascade': 'calibrate_cascade',
+    'src.stages.evaluate_models': 'evaluate_models',
+    'src.stages.rf.data_ingestion_rf': 'ingest_rf_data',
+    'src.stages.rf.feature_engineering_rf': 'engineer_rf_features',
+    'src.stages.rf.feature_selection_rf': 'select_rf_features',
+    'src.stages.rf.train_rf': 'train_rf_model',
+    'src.stages.rf.evaluate_rf': 'evaluate_rf_model',
+    'src.stages.rf.export_rf': 'export_rf_model'
+}
+MODULE_CMD = re.compile(r'^python -m ([\w.]+)$')
+
+Stage = namedtuple('Stage', ['name', 'module', 'deps', 'outs'])
+
+
+def _paths(entries):
+    """Paths of a dvc.yaml deps/outs/metrics list (entries may carry options)"""
+    paths = []
+    for entry in entries or []:
+        paths.extend(entry.keys() if isinstance(entry, dict) else [entry])
+    return [os.path.normpath(path) for path in paths]
+
+
+def load_stages(dvc_path=DVC_FILE):
+    """Stages of dvc.yaml in file order"""
+    with open(dvc_path, 'r') as f:
+        spec = yaml.safe_load(f)
+    stages = []
+    for name, stage in spec['stages'].items():
+        match = MODULE_CMD.match(stage['cmd'].strip())
+        if not match or match.group(1) not in ENTRYPOINTS:
+            raise ValueError(f"Stage {name}: cannot run {stage['cmd']!r} in-process (no entry in ENTRYPOINTS)")
+        outs = _paths(stage.get('outs')) + _paths(stage.get('metrics'))
+        stages.append(Stage(name, match.group(1), _paths(stage.get('deps')), outs))
+    return stages
+
+
+def upstream_stages(stages):
+    """Names of the stages each stage depends on through its deps"""
+    producers = {path: stage.name for stage in stages for path in stage.outs}
+    return {
+        stage.name: {producers[path] for path in stage.deps if path in producers and producers[path] != stage.name}
+        for stage in stages
+    }
+
+
+def plan(stages, targets=None):
+    """Stages to run for targets (with everything upstream of them), in dvc.yaml order"""
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets or [] if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    upstream = upstream_stages(stages)
+    selected, todo = set(), list(targets or by_name)
+    while todo:
+        name = todo.pop()
+        if name not in selected:
+            selected.add(name)
+            todo.extend(upstream[name])
+    return [stage for stage in stages if stage.name in selected]
+
+
+def missing_inputs(stages):
+    """{stage: [deps]} of deps that no planned stage produces and that do not exist on disk"""
+    produced = {path for stage in stages for path in stage.outs}
+    missing = {}
+    for stage in stages:
+        paths = [path for path in stage.deps if path not in produced and not os.path.exists(path)]
+        if paths:
+            missing[stage.name] = paths
+    return missing
+
+
+def drop_unrunnable(stages, missing):
+    """Planned stages minus those with missing inputs and everything downstream of them"""
+    upstream = upstream_stages(stages)
+    dropped = set(missing)
+    for stage in stages:
+        if upstream[stage.name] & dropped:
+            dropped.add(stage.name)
+    return [stage for stage in stages if stage.name not in dropped], [s.name for s in stages if s.name in dropped]
+
+
+class PipelineExecutor:
+    """Runs planned stages in-process on up to `jobs` threads, as soon as their upstream stages finish"""
+
+    def __init__(self, stages, params, jobs=2):
+        self.stages = stages
+        self.params = params
+        self.jobs = max(1, jobs)
+        self.artifacts = MemoryArtifacts()
+        self.results = {}
+        self.wall_s = None
+        self._functions = {}
+
+    def _load_functions(self):
+        # Import everything up front, on one thread
+        for stage in self.stages:
+            module = importlib.import_module(stage.module)
+            self._functions[stage.name] = getattr(module, ENTRYPOINTS[stage.module])
+
+    def _run_stage(self, stage):
+        start = time.perf_counter()
+        logger.info(f"Running stage {stage.name}")
+        # Stages get their own params copy; artifacts are shared
+        self._functions[stage.name](copy.deepcopy(self.params), self.artifacts)
+        return time.perf_counter() - start
+
+    def run(self):
+        """Run every stage; returns {stage: {status, wall_s}} and raises RuntimeError if one failed"""
+        self._load_functions()
+        names = {stage.name for stage in self.stages}
+        upstream = {name: deps & names for name, deps in upstream_stages(self.stages).items() if name in names}
+        # Remaining readers per path, so in-memory copies are dropped after their last reader
+        readers = {}
+        for stage in self.stages:
+            for path in stage.deps:
+                readers[path] = readers.get(path, 0) + 1
+
+        sources = {name for name, deps in upstream.items() if not deps}
+        self.results = {stage.name: {"status": "skipped"} for stage in self.stages}
+        pending = list(self.stages)
+        done, failed = set(), None
+        running = {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix='stage') as pool:
+            while pending or running:
+                if failed is None:
+                    for stage in [s for s in pending if upstream[s.name] <= done][:self.jobs - len(running)]:
+                        pending.remove(stage)
+                        running[pool.submit(self._run_stage, stage)] = stage
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        self.results[stage.name] = {"status": "done", "wall_s": round(future.result(), 3)}
+                    except Exception as e:
+                        logger.exception(f"Stage {stage.name} failed")
+                        self.results[stage.name] = {"status": "failed", "error": str(e)}
+                        failed = failed or stage.name
+                        continue
+                    done.add(stage.name)
+                    for path in stage.deps:
+                        readers[path] -= 1
+                        if not readers[path]:
+                            self.artifacts.release(path)
+                    for path in stage.outs:
+                        if not readers.get(path):
+                            self.artifacts.release(path)
+                    if sources <= done:
+                        # Shared work (the raw corpus parse) only serves the source stages
+                        self.artifacts.release_shared()
+        self.wall_s = time.perf_counter() - start
+        if failed:
+            raise RuntimeError(f"Stage {failed} failed: {self.results[failed]['error']}")
+        return self.results
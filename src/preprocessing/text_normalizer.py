@@ -0,0 +1,82 @@
+import re
+
+from src.utils.parallel import chunked, map_chunks
+
+# Reuters/AP style datelines, e.g. "WASHINGTON (Reuters) - ". Both patterns are
+# applied in sequence, exactly like the original TextPreprocessor.
+DATELINE_HYPHEN = re.compile(r'^[A-Z\s]+ \([A-Z\s]+\) - ')
+DATELINE_EN_DASH = re.compile(r'^[A-Z\s]+\s\([A-Z\s]+\) – ')
+NON_LETTERS = re.compile(r'[^a-zA-Z\s]')
+
+# Bytes that NON_LETTERS removes from pure-ASCII text: everything that is
+# neither an ASCII letter nor whitespace as understood by `re` and str.split().
+ASCII_NON_LETTERS = bytes(c for c in range(128) if not chr(c).isalpha() and not chr(c).isspace())
+
+
+def load_stop_words(language='english'):
+    """Load the NLTK stopword list, downloading the corpus on first use"""
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        return frozenset(stopwords.words(language))
+    except LookupError:
+        nltk.download('stopwords')
+        return frozenset(stopwords.words(language))
+
+
+class TextNormalizer:
+    """Text cleanup shared by the LR and RF pipelines and the predictors.
+
+    strip_datelines=True reproduces TextPreprocessor.preprocess_text (LR
+    pipeline); strip_datelines=False reproduces the RF pipeline's
+    preprocess_text. Output is identical to those functions, non-string values
+    are passed through unchanged.
+    """
+
+    def __init__(self, stop_words=None, strip_datelines=True, language='english'):
+        if stop_words is None:
+            stop_words = load_stop_words(language)
+        self.stop_words = frozenset(stop_words)
+        self.strip_datelines = strip_datelines
+
+    def normalize(self, text):
+        """Normalize a single document"""
+        if not isinstance(text, str):
+            return text
+        if self.strip_datelines:
+            text = DATELINE_HYPHEN.sub('', text, count=1)
+            text = DATELINE_EN_DASH.sub('', text, count=1)
+        if text.isascii():
+            # bytes.translate deletes characters in a single C pass, which is
+            # much cheaper than the regex for the (common) pure-ASCII case
+            text = text.encode('ascii').translate(None, ASCII_NON_LETTERS).decode('ascii')
+        else:
+            text = NON_LETTERS.sub('', text)
+        stop_words = self.stop_words
+        return ' '.join([word for word in text.lower().split() if word not in stop_words])
+
+    __call__ = normalize
+
+    def _normalize_chunk(self, texts):
+        normalize = self.normalize
+        return [normalize(text) for text in texts]
+
+    def normalize_many(self, texts, n_jobs=1, chunk_size=5000):
+        """Normalize a pandas Series or any iterable of documents in bulk.
+
+        Corpora larger than one chunk are split into chunks of chunk_size
+        documents and spread over n_jobs worker processes. A Series comes back
+        as a Series with the same index and name, anything else as a list.
+        """
+        import pandas as pd
+
+        is_series = isinstance(texts, pd.Series)
+        values = texts.tolist() if is_series else list(texts)
+
+        chunks = chunked(values, chunk_size)
+        normalized = [text for chunk in map_chunks(self._normalize_chunk, chunks, n_jobs) for text in chunk]
+
+        if is_series:
+            return pd.Series(normalized, index=texts.index, name=texts.name, dtype=object)
+        return normalized
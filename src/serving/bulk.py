@@ -0,0 +1,346 @@
+import csv
+import itertools
+import json
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.serving.labels import LABELS
+from src.utils.instrumentation import Instrumentation
+from src.utils.parallel import resolve_n_jobs
+
+# Bulk scoring runs as a bounded producer/consumer pipeline:
+#
+#   reader thread --(chunks)--> featurizer processes --(features)--> main thread
+#   (CSV / JSONL)               (normalize + vectorize)              (predict_proba)
+#                                                                         |
+#                                           writer thread <--(rows)------+
+#
+# Every hand-off is bounded (queue_size chunks, max_in_flight featurizations),
+# so a slow stage blocks the ones before it and memory stays flat however
+# large the input file is. Output rows are written in input order.
+
+OUTPUT_FIELDS = ['id', 'prediction', 'label', 'confidence', 'p_fake', 'p_true']
+
+Chunk = namedtuple('Chunk', ['ids', 'texts', 'valid'])
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, error):
+        self.error = error
+
+
+def _build_featurizer(spec):
+    kind, *args = spec
+    if kind == 'vectorizer':
+        import joblib
+        vectorizer_path, strip_datelines, language = args
+        vectorizer = joblib.load(vectorizer_path)
+        normalizer = TextNormalizer(strip_datelines=strip_datelines, language=language)
+        return lambda texts: vectorizer.transform(normalizer.normalize_many(texts))
+    if kind == 'bundle':
+        from src.serving.scoring_bundle import BundleScorer
+        # The bundle is cheap enough to score completely in the worker
+        return BundleScorer(args[0]).predict_proba
+    raise ValueError(f"Unknown featurizer {kind!r}")
+
+
+_featurizer = None
+
+
+def _init_worker(spec):
+    global _featurizer
+    _featurizer = _build_featurizer(spec)
+
+
+def _featurize(texts):
+    return _featurizer(texts)
+
+
+BulkModel = namedtuple('BulkModel', ['name', 'featurizer_spec', 'predict_proba', 'classes'])
+
+
+def load_bulk_model(name, params):
+    """Artifacts for bulk scoring: 'lr', 'bundle', 'rf' (sklearn) or 'rf_flat' (flat forest)"""
+    paths = params['bulk_scoring']['artifacts']
+    if name == 'bundle':
+        from src.serving.scoring_bundle import BundleScorer
+        classes = BundleScorer(paths['bundle']).classes_
+        return BulkModel(name, ('bundle', paths['bundle']), None, classes)
+
+    if name == 'lr':
+        spec = ('vectorizer', paths['lr_vectorizer'], True, 'english')
+    elif name in ('rf', 'rf_flat'):
+        spec = ('vectorizer', paths['rf_vectorizer'], False, params['rf']['featurize']['stop_words'])
+    else:
+        raise ValueError(f"Unknown model {name!r}; expected 'lr', 'bundle', 'rf' or 'rf_flat'")
+
+    if name == 'rf_flat':
+        from src.serving.forest import FlatForest
+        model = FlatForest(paths['rf_forest'])
+    else:
+        import joblib
+        model = joblib.load(paths['lr_model'] if name == 'lr' else paths['rf_model'])
+    return BulkModel(name, spec, model.predict_proba, model.classes_)
+
+
+def scoring_function(model):
+    """texts -> class probabilities for a BulkModel, featurizing in the calling process"""
+    featurize = _build_featurizer(model.featurizer_spec)
+    if model.predict_proba is None:
+        return featurize
+    return lambda texts: model.predict_proba(featurize(texts))
+
+
+def _file_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def _texts(columns, text_column):
+    """Article text from a {column: values} mapping: text_column, 'content', or title + ' ' + text"""
+    if text_column:
+        return columns[text_column]
+    if 'content' in columns:
+        return columns['content']
+    if 'title' in columns and 'text' in columns:
+        return [
+            title + ' ' + text if isinstance(title, str) and isinstance(text, str) else None
+            for title, text in zip(columns['title'], columns['text'])
+        ]
+    raise ValueError("Input needs a 'content' column, 'title' and 'text' columns, or --text-column")
+
+
+def _read_csv(path, chunk_size, text_column, id_column):
+    import pandas as pd
+
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = [text_column] if text_column else (['content'] if 'content' in header else ['title', 'text'])
+    missing = [column for column in wanted + ([id_column] if id_column else []) if column not in header]
+    if missing:
+        raise ValueError(f"{path} has no column(s) {', '.join(missing)}")
+    usecols = wanted + ([id_column] if id_column and id_column not in wanted else [])
+    for df in pd.read_csv(path, usecols=usecols, chunksize=chunk_size, dtype=object, keep_default_na=False,
+                          na_values=['']):
+        columns = {column: df[column].tolist() for column in usecols}
+        yield columns.get(id_column), _texts(columns, text_column)
+
+
+def _read_jsonl(path, chunk_size, text_column, id_column):
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            lines = [line for line in itertools.islice(f, chunk_size) if line.strip()]
+            if not lines:
+                return
+            records = [json.loads(line) for line in lines]
+            names = [text_column] if text_column else ['content', 'title', 'text']
+            columns = {name: [record.get(name) for record in records] for name in names}
+            if not text_column and all(value is None for value in columns['content']):
+                del columns['content']
+            ids = [record.get(id_column) for record in records] if id_column else None
+            yield ids, _texts(columns, text_column)
+
+
+def read_chunks(path, chunk_size=5000, text_column=None, id_column=None, fmt=None):
+    """Stream (ids, texts, valid mask) chunks; ids default to the 0-based row number"""
+    reader = _read_jsonl if _file_format(path, fmt) == 'jsonl' else _read_csv
+    offset = 0
+    for ids, texts in reader(path, chunk_size, text_column, id_column):
+        if ids is None:
+            ids = range(offset, offset + len(texts))
+        valid = np.fromiter((isinstance(text, str) for text in texts), dtype=bool, count=len(texts))
+        yield Chunk(list(ids), texts, valid)
+        offset += len(texts)
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return '' if math.isnan(value) else f'{value:.6f}'
+    return value
+
+
+class _Writer:
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        if fmt == 'csv':
+            self.csv = csv.writer(self.file)
+            self.csv.writerow(OUTPUT_FIELDS)
+
+    def write(self, rows):
+        if self.fmt == 'csv':
+            self.csv.writerows([[_format_value(value) for value in row] for row in rows])
+        else:
+            self.file.writelines(
+                json.dumps(dict(zip(OUTPUT_FIELDS, (None if isinstance(v, float) and math.isnan(v) else v for v in row))))
+                + '\n' for row in rows
+            )
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def output_rows(chunk, proba, classes):
+    """One output row per input row; rows without text get empty predictions"""
+    fake_col = int(np.flatnonzero(classes == 0)[0])
+    true_col = int(np.flatnonzero(classes == 1)[0])
+    rows = []
+    scored = iter(range(len(proba)))
+    for row_id, valid in zip(chunk.ids, chunk.valid):
+        if not valid:
+            rows.append([row_id, None, '', float('nan'), float('nan'), float('nan')])
+            continue
+        i = next(scored)
+        best = int(proba[i].argmax())
+        prediction = int(classes[best])
+        rows.append([row_id, prediction, LABELS[prediction], float(proba[i, best]),
+                     float(proba[i, fake_col]), float(proba[i, true_col])])
+    return rows
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once stop is set (so a failed pipeline never hangs)"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class BulkScorer:
+    """Streams an article file through a model and writes one prediction row per article.
+
+    n_workers featurizer processes normalize and vectorize chunks (0 = in the
+    main thread); the reader and writer run in their own threads.
+    """
+
+    def __init__(self, model, chunk_size=5000, n_workers=-1, queue_size=4, max_in_flight=None):
+        self.model = model
+        self.chunk_size = chunk_size
+        self.n_workers = resolve_n_jobs(n_workers) if n_workers else 0
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight or max(2, 2 * self.n_workers)
+        self.perf = Instrumentation()
+
+    def _reader(self, chunks, out, stop):
+        try:
+            iterator = iter(chunks)
+            while not stop.is_set():
+                with self.perf.span('read'):
+                    chunk = next(iterator, _DONE)
+                if not _put(out, chunk, stop) or chunk is _DONE:
+                    return
+        except Exception as e:
+            _put(out, _Failed(e), stop)
+
+    def _writer(self, writer, rows_queue, state):
+        try:
+            while True:
+                rows = rows_queue.get()
+                if rows is _DONE:
+                    return
+                if 'error' in state:
+                    continue  # keep draining so the main thread never blocks
+                with self.perf.span('write'):
+                    writer.write(rows)
+        except Exception as e:
+            state['error'] = e
+            while rows_queue.get() is not _DONE:
+                pass
+
+    def score_file(self, input_path, output_path, text_column=None, id_column=None, input_format=None,
+                   output_format=None):
+        """Score input_path into output_path; returns throughput stats"""
+        start = time.perf_counter()
+        chunks = read_chunks(input_path, self.chunk_size, text_column, id_column, input_format)
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        writer = _Writer(output_path, _file_format(output_path, output_format))
+
+        stop = threading.Event()
+        chunk_queue = queue.Queue(maxsize=self.queue_size)
+        rows_queue = queue.Queue(maxsize=self.queue_size)
+        writer_state = {}
+        reader_thread = threading.Thread(target=self._reader, args=(chunks, chunk_queue, stop),
+                                         name='bulk-reader', daemon=True)
+        writer_thread = threading.Thread(target=self._writer, args=(writer, rows_queue, writer_state),
+                                         name='bulk-writer', daemon=True)
+        pool = None
+        stats = {"rows": 0, "scored": 0, "skipped": 0}
+        try:
+            if self.n_workers:
+                pool = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                           initargs=(self.model.featurizer_spec,))
+            else:
+                _init_worker(self.model.featurizer_spec)
+            reader_thread.start()
+            writer_thread.start()
+
+            in_flight = deque()
+            while True:
+                chunk = chunk_queue.get()
+                if isinstance(chunk, _Failed):
+                    raise chunk.error
+                if chunk is _DONE:
+                    break
+                texts = [text for text, valid in zip(chunk.texts, chunk.valid) if valid]
+                if not texts:
+                    in_flight.append((chunk, None))
+                elif pool is not None:
+                    in_flight.append((chunk, pool.submit(_featurize, texts)))
+                else:
+                    with self.perf.span('featurize'):
+                        in_flight.append((chunk, _featurize(texts)))
+                while len(in_flight) >= self.max_in_flight:
+                    self._finish(in_flight.popleft(), rows_queue, stats, stop, writer_state)
+            while in_flight:
+                self._finish(in_flight.popleft(), rows_queue, stats, stop, writer_state)
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            rows_queue.put(_DONE)
+            if writer_thread.is_alive():
+                writer_thread.join()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            writer.close()
+            reader_thread.join(timeout=1)
+        if 'error' in writer_state:
+            raise writer_state['error']
+
+        elapsed = time.perf_counter() - start
+        stats["seconds"] = round(elapsed, 3)
+        stats["rows_per_s"] = round(stats["rows"] / elapsed, 1) if elapsed else None
+        stats.update(self.perf.summary())
+        return stats
+
+    def _finish(self, item, rows_queue, stats, stop, writer_state):
+        chunk, features = item
+        if 'error' in writer_state:
+            raise writer_state['error']
+        if features is not None and hasattr(features, 'result'):
+            with self.perf.span('featurize_wait'):
+                features = features.result()
+        n_valid = int(chunk.valid.sum())
+        with self.perf.span('predict'):
+            if not n_valid:
+                proba = np.empty((0, len(self.model.classes)))
+            elif self.model.predict_proba is None:
+                proba = features
+            else:
+                proba = self.model.predict_proba(features)
+        _put(rows_queue, output_rows(chunk, proba, self.model.classes), stop)
+        stats["rows"] += len(chunk.ids)
+        stats["scored"] += n_valid
+        stats["skipped"] += len(chunk.ids) - n_valid
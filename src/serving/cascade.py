@@ -0,0 +1,250 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.serving.labels import LABELS
+from src.serving.predictor import MODEL_PATH, VECTORIZER_PATH
+from src.utils.hashing import artifact_hash
+from src.utils.instrumentation import Instrumentation
+
+# Two-tier cascade: every article is scored by the logistic regression, and
+# only those whose P(real) falls inside the uncertainty band [low, high] are
+# re-scored by the Random Forest (with its own normalization and vectorizer).
+# The band is chosen by the calibrate_cascade stage and read from
+# CALIBRATION_PATH; a band of None never escalates.
+
+RF_FOREST_PATH = 'models/rf/rf_forest.npz'
+RF_VECTORIZER_PATH = 'data/features/rf/vectorizer.joblib'
+CALIBRATION_PATH = 'model/cascade.json'
+TIERS = ('lr', 'rf')
+
+
+def load_rf_model(path):
+    """Flat forest (.npz) or pickled RandomForestClassifier"""
+    if path.endswith('.npz'):
+        from src.serving.forest import FlatForest
+        return FlatForest(path)
+    import joblib
+    return joblib.load(path)
+
+
+def _per_doc_ms(seconds, docs):
+    return round(seconds * 1000 / docs, 4) if docs else None
+
+
+class CascadePredictor:
+    """LR on every article, the RF only on articles the LR is unsure about"""
+
+    def __init__(self, lr_model, lr_vectorizer, rf_model, rf_vectorizer, band=None, rf_language='english',
+                 fingerprint=None):
+        if list(lr_model.classes_) != list(rf_model.classes_):
+            raise ValueError(f"LR classes {list(lr_model.classes_)} and RF classes {list(rf_model.classes_)} differ")
+        self.lr_model = lr_model
+        self.lr_vectorizer = lr_vectorizer
+        self.rf_model = rf_model
+        self.rf_vectorizer = rf_vectorizer
+        self.band = tuple(band) if band is not None else None
+        # Each tier sees text preprocessed like its own training data
+        self.lr_normalizer = TextNormalizer(strip_datelines=True)
+        self.rf_normalizer = TextNormalizer(strip_datelines=False, language=rf_language)
+        self.classes_ = lr_model.classes_
+        self._real = list(self.classes_).index(1)
+        self.fingerprint = fingerprint
+        # Serving interface shared with Predictor (no cache, no registry versions)
+        self.cache = None
+        self.version = None
+        self.perf = Instrumentation()
+        self._docs = dict.fromkeys(TIERS, 0)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_params(cls, params, calibration_path=CALIBRATION_PATH):
+        """Load the pipeline artifacts; the band comes from the calibration file, else cascade.band"""
+        import joblib
+
+        cascade_params = params['cascade']
+        band = cascade_params.get('band')
+        if os.path.exists(calibration_path):
+            with open(calibration_path, 'r') as f:
+                band = json.load(f)['band']
+        rf_path = cascade_params.get('rf_model', RF_FOREST_PATH)
+        paths = [MODEL_PATH, VECTORIZER_PATH, rf_path, RF_VECTORIZER_PATH]
+        fingerprint = artifact_hash(paths[0])[:16] + ''.join(artifact_hash(path)[:16] for path in paths[1:])
+        return cls(
+            joblib.load(MODEL_PATH), joblib.load(VECTORIZER_PATH),
+            load_rf_model(rf_path), joblib.load(RF_VECTORIZER_PATH),
+            band=band, rf_language=params['rf']['featurize']['stop_words'],
+            fingerprint=f"{fingerprint}:{band}"
+        )
+
+    def lr_proba(self, texts):
+        with self.perf.span('lr'):
+            return self.lr_model.predict_proba(self.lr_vectorizer.transform(self.lr_normalizer.normalize_many(texts)))
+
+    def rf_proba(self, texts):
+        with self.perf.span('rf'):
+            return self.rf_model.predict_proba(self.rf_vectorizer.transform(self.rf_normalizer.normalize_many(texts)))
+
+    def escalate(self, p_real):
+        """Mask of articles whose LR P(real) lies inside the band"""
+        if self.band is None:
+            return np.zeros(len(p_real), dtype=bool)
+        low, high = self.band
+        return (p_real >= low) & (p_real <= high)
+
+    def predict_tiers(self, texts):
+        """(probabilities, escalated mask) for a batch of texts"""
+        texts = list(texts)
+        proba = self.lr_proba(texts)
+        escalated = self.escalate(proba[:, self._real])
+        if escalated.any():
+            proba[escalated] = self.rf_proba([texts[i] for i in np.flatnonzero(escalated)])
+        with self._lock:
+            self._docs['lr'] += len(texts)
+            self._docs['rf'] += int(escalated.sum())
+        return proba, escalated
+
+    def predict_proba(self, texts):
+        return self.predict_tiers(texts)[0]
+
+    def predict_batch(self, texts):
+        """Return a (label, confidence) pair per text, like Predictor.predict_batch"""
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [
+            (LABELS[int(self.classes_[col])], float(probabilities[row, col]))
+            for row, col in enumerate(best)
+        ]
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+    def stats(self):
+        """Traffic share and mean latency per article of each tier since start-up"""
+        spans = self.perf.summary()['spans']
+        with self._lock:
+            docs = dict(self._docs)
+        return {
+            "band": list(self.band) if self.band is not None else None,
+            "docs": docs['lr'],
+            "tiers": {
+                tier: {
+                    "docs": docs[tier],
+                    "share": round(docs[tier] / docs['lr'], 4) if docs['lr'] else None,
+                    "ms_per_doc": _per_doc_ms(spans.get(tier, {}).get('total_s', 0.0), docs[tier])
+                }
+                for tier in TIERS
+            }
+        }
+
+    def close(self):
+        pass
+
+    def evaluate(self, texts, y, batch_size=64):
+        """Cascade accuracy, per-tier traffic share / latency / accuracy, and each model alone"""
+        texts, y = list(texts), np.asarray(y)
+        lr_pred, rf_pred, cascade_pred, escalated = [], [], [], []
+        lr_s = rf_s = cascade_s = 0.0
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            begin = time.perf_counter()
+            proba, mask = self.predict_tiers(batch)
+            cascade_s += time.perf_counter() - begin
+            # Each model alone, for comparison
+            begin = time.perf_counter()
+            lr_pred.append(self.classes_.take(self.lr_proba(batch).argmax(axis=1)))
+            lr_s += time.perf_counter() - begin
+            begin = time.perf_counter()
+            rf_pred.append(self.classes_.take(self.rf_proba(batch).argmax(axis=1)))
+            rf_s += time.perf_counter() - begin
+            cascade_pred.append(self.classes_.take(proba.argmax(axis=1)))
+            escalated.append(mask)
+        lr_pred, rf_pred = np.concatenate(lr_pred), np.concatenate(rf_pred)
+        cascade_pred, escalated = np.concatenate(cascade_pred), np.concatenate(escalated)
+
+        def accuracy(pred, mask):
+            return round(float((pred[mask] == y[mask]).mean()), 4) if mask.any() else None
+
+        everything = np.ones(len(y), dtype=bool)
+        return {
+            "docs": len(y),
+            "band": list(self.band) if self.band is not None else None,
+            "batch_size": batch_size,
+            "accuracy": accuracy(cascade_pred, everything),
+            "ms_per_doc": _per_doc_ms(cascade_s, len(y)),
+            "tiers": {
+                # Articles each tier had the final say on
+                "lr": {
+                    "share": round(float((~escalated).mean()), 4) if len(y) else None,
+                    "accuracy": accuracy(lr_pred, ~escalated)
+                },
+                "rf": {
+                    "share": round(float(escalated.mean()), 4) if len(y) else None,
+                    "accuracy": accuracy(rf_pred, escalated),
+                    # What the LR would have scored on the escalated articles
+                    "lr_accuracy": accuracy(lr_pred, escalated)
+                }
+            },
+            "lr_only": {"accuracy": accuracy(lr_pred, everything), "ms_per_doc": _per_doc_ms(lr_s, len(y))},
+            "rf_only": {"accuracy": accuracy(rf_pred, everything), "ms_per_doc": _per_doc_ms(rf_s, len(y))}
+        }
+
+
+def tier_costs(predictor, texts, batch_size=64):
+    """Mean milliseconds per article of each tier alone, scoring batch_size articles at a time"""
+    texts = list(texts)
+    seconds = dict.fromkeys(TIERS, 0.0)
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        for tier, score in (('lr', predictor.lr_proba), ('rf', predictor.rf_proba)):
+            begin = time.perf_counter()
+            score(batch)
+            seconds[tier] += time.perf_counter() - begin
+    return {tier: seconds[tier] * 1000 / len(texts) for tier in TIERS}
+
+
+def calibrate_band(p_real, lr_correct, rf_correct, lr_ms, rf_ms, budget_ms, grid_size=101):
+    """Band of LR P(real) maximizing cascade accuracy with expected latency <= budget_ms.
+
+    Expected latency per article is lr_ms plus the escalated share times
+    rf_ms. Candidate band edges are grid_size quantiles of p_real; ties go to
+    the band escalating fewer articles. Returns a dict with band (None when
+    escalating nothing is best or nothing fits the budget), accuracy,
+    escalation share and expected ms per article on these articles.
+    """
+    n = len(p_real)
+    order = np.argsort(p_real, kind='stable')
+    p = p_real[order]
+    lr_correct = np.asarray(lr_correct, dtype=np.int64)[order]
+    rf_correct = np.asarray(rf_correct, dtype=np.int64)[order]
+    # gain[k]: extra correct answers from escalating the k lowest-probability articles
+    gain = np.concatenate([[0], np.cumsum(rf_correct - lr_correct)])
+
+    edges = np.unique(np.quantile(p, np.linspace(0, 1, grid_size))) if n else np.empty(0)
+    first = np.searchsorted(p, edges, side='left')
+    last = np.searchsorted(p, edges, side='right')
+    low, high = np.triu_indices(len(edges))
+    escalated = last[high] - first[low]
+    correct = lr_correct.sum() + gain[last[high]] - gain[first[low]]
+    latency = lr_ms + escalated / max(n, 1) * rf_ms
+
+    best = {
+        "band": None, "accuracy": float(lr_correct.mean()) if n else None,
+        "escalation_share": 0.0, "expected_ms_per_doc": lr_ms
+    }
+    feasible = np.flatnonzero((latency <= budget_ms) & (correct > lr_correct.sum()))
+    if len(feasible):
+        # Most correct answers first, then fewest escalations
+        pick = feasible[np.lexsort((escalated[feasible], -correct[feasible]))[0]]
+        best = {
+            "band": [float(edges[low[pick]]), float(edges[high[pick]])],
+            "accuracy": float(correct[pick] / n),
+            "escalation_share": float(escalated[pick] / n),
+            "expected_ms_per_doc": float(latency[pick])
+        }
+    return best
@@ -0,0 +1,124 @@
+import numpy as np
+
+# A flat forest stores every tree of a fitted RandomForestClassifier in shared,
+# contiguous node arrays (split feature, threshold, children, leaf class
+# probabilities) in one .npz file. Split features are renumbered to the
+# columns the trees actually use, so evaluation only ever touches those
+# columns of the TF-IDF matrix. Loading needs neither pickle nor sklearn.
+
+FOREST_VERSION = 1
+LEAF = -1
+
+
+def export_forest(model, path):
+    """Write a fitted RandomForestClassifier as a flat forest; returns the number of used columns"""
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    columns = np.unique(np.concatenate([tree.feature[tree.feature >= 0] for tree in trees]))
+
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    feature, threshold, left, right, value = [], [], [], [], []
+    for offset, tree in zip(offsets, trees):
+        is_leaf = tree.children_left < 0
+        feature.append(np.where(is_leaf, LEAF, np.searchsorted(columns, tree.feature)))
+        threshold.append(tree.threshold)
+        # Child indices become global node ids; leaves point to themselves
+        own = np.arange(tree.node_count) + offset
+        left.append(np.where(is_leaf, own, tree.children_left + offset))
+        right.append(np.where(is_leaf, own, tree.children_right + offset))
+        # Normalized exactly like DecisionTreeClassifier.predict_proba
+        proba = tree.value[:, 0, :model.n_classes_].astype(np.float64)
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        value.append(proba / normalizer)
+
+    with open(path, 'wb') as f:
+        np.savez(
+            f,
+            version=np.array(FOREST_VERSION),
+            roots=offsets[:-1].astype(np.int64),
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.int64),
+            right=np.concatenate(right).astype(np.int64),
+            value=np.concatenate(value),
+            columns=columns.astype(np.int64),
+            n_features_in=np.array(model.n_features_in_),
+            classes=np.asarray(model.classes_)
+        )
+    return len(columns)
+
+
+class FlatForest:
+    """Vectorized evaluator for a flat forest, matching RandomForestClassifier predictions.
+
+    Input may be the full-width feature matrix (the used columns are
+    selected) or an already column-restricted one. Rows are evaluated
+    rows_per_chunk at a time: all (row, tree) pairs descend one level per step.
+    """
+
+    def __init__(self, path, rows_per_chunk=2048):
+        with np.load(path, allow_pickle=False) as forest:
+            arrays = {name: forest[name] for name in forest.files}
+        if int(arrays['version']) != FOREST_VERSION:
+            raise ValueError(f"Unsupported flat forest version {int(arrays['version'])}")
+        self.roots = arrays['roots']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        # Interleaved children: 2 * node is the left child, 2 * node + 1 the right
+        self.children = np.column_stack([arrays['left'], arrays['right']]).ravel()
+        self.value = arrays['value']
+        self.columns = arrays['columns']
+        self.n_features_in_ = int(arrays['n_features_in'])
+        self.classes_ = arrays['classes']
+        self.rows_per_chunk = rows_per_chunk
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _select_columns(self, X):
+        if X.shape[1] == len(self.columns):
+            return X
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} or {len(self.columns)} features, got {X.shape[1]}")
+        return X[:, self.columns]
+
+    def apply(self, X):
+        """Leaf node id per (row, tree) for a dense float32 block of used columns"""
+        n_rows, n_cols = X.shape
+        n_trees = len(self.roots)
+        values = np.ascontiguousarray(X).ravel()
+        leaves = np.empty(n_rows * n_trees, dtype=np.int64)
+
+        # Only unfinished (row, tree) pairs are carried to the next level
+        position = np.arange(n_rows * n_trees)
+        node = np.tile(self.roots, n_rows)
+        row_start = np.repeat(np.arange(n_rows, dtype=np.int64) * n_cols, n_trees)
+        while len(node):
+            feature = self.feature[node]
+            done = feature == LEAF
+            if done.any():
+                leaves[position[done]] = node[done]
+                keep = ~done
+                position, node, row_start, feature = position[keep], node[keep], row_start[keep], feature[keep]
+            # float32 input vs float64 threshold, the same comparison sklearn makes
+            go_right = values[row_start + feature] > self.threshold[node]
+            node = self.children[2 * node + go_right]
+        return leaves.reshape(n_rows, n_trees)
+
+    def predict_proba(self, X):
+        X = self._select_columns(X)
+        proba = np.zeros((X.shape[0], len(self.classes_)), dtype=np.float64)
+        for start in range(0, X.shape[0], self.rows_per_chunk):
+            block = X[start:start + self.rows_per_chunk]
+            block = block.toarray() if hasattr(block, 'toarray') else np.asarray(block)
+            leaves = self.apply(block.astype(np.float32))
+            chunk = proba[start:start + len(block)]
+            # Trees are summed in order, like a single-threaded sklearn forest
+            for tree in range(leaves.shape[1]):
+                chunk += self.value[leaves[:, tree]]
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
@@ -0,0 +1,2 @@
+# Class index -> display label, shared by every scorer
+LABELS = {0: "FAKE NEWS", 1: "REAL NEWS"}
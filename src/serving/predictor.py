@@ -0,0 +1,286 @@
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+import logging
+
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.serving.labels import LABELS
+from src.serving.registry import artifacts_fingerprint
+from src.serving.scoring_bundle import BundleScorer
+from src.utils.hashing import artifact_hash
+from src.utils.instrumentation import Instrumentation
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = 'model/lr_fake_news_model.joblib'
+VECTORIZER_PATH = 'data/processed/vectorizer.joblib'
+BUNDLE_PATH = 'model/scoring_bundle.npz'
+
+# Scored once by freshly loaded artifacts before they start taking requests
+WARMUP_TEXTS = [
+    "President signs new education bill into law",
+    "SHOCKING: Drinking coffee makes you live forever!"
+]
+
+# Model and vectorizer are swapped together as one object, so a batch never
+# scores with a vectorizer from one version and a model from another.
+Artifacts = namedtuple('Artifacts', ['model', 'vectorizer', 'fingerprint', 'signature', 'version'])
+
+
+def _file_signature(*paths):
+    return tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+
+
+class Predictor:
+    """Long-lived scorer: loads the artifacts once and scores texts in batches.
+
+    Artifacts come from model_path/vectorizer_path, or from the active version
+    of a ModelRegistry. With a PredictionCache, texts are looked up by their
+    normalized form and only cache misses reach the vectorizer and model.
+
+    With artifact_check_interval, a background thread checks every that many
+    seconds whether the artifact files (or the registry's CURRENT pointer)
+    changed. New artifacts are loaded and warmed up on that thread, then
+    swapped in as one object: requests keep scoring with the old version
+    until the swap, and none wait for the load. Time spent loading,
+    preprocessing, transforming and predicting is accumulated in self.perf.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH, normalizer=None,
+                 cache=None, artifact_check_interval=None, registry=None):
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.registry = registry
+        self.normalizer = normalizer or TextNormalizer(strip_datelines=True)
+        self.cache = cache
+        self.artifact_check_interval = artifact_check_interval
+        self._reload_lock = threading.Lock()
+        self.perf = Instrumentation()
+        self._artifacts = self._load()
+        if self.cache is not None:
+            self.cache.bind(self._artifacts.fingerprint)
+        self._stop = threading.Event()
+        self._watcher = None
+        if artifact_check_interval is not None:
+            self._watcher = threading.Thread(target=self._watch, name="artifact-watcher", daemon=True)
+            self._watcher.start()
+
+    def _signature(self):
+        if self.registry is not None:
+            return self.registry.current()
+        return _file_signature(self.model_path, self.vectorizer_path)
+
+    def _load(self):
+        # joblib (and through the pickles, sklearn and scipy) is only needed here
+        import joblib
+
+        with self.perf.span('load'):
+            if self.registry is None:
+                signature = _file_signature(self.model_path, self.vectorizer_path)
+                fingerprint = artifacts_fingerprint(artifact_hash(self.model_path), artifact_hash(self.vectorizer_path))
+                return Artifacts(joblib.load(self.model_path), joblib.load(self.vectorizer_path),
+                                 fingerprint, signature, None)
+
+            version = self.registry.current()
+            if version is None:
+                raise ValueError(f"Model registry {self.registry.root} has no active version")
+            manifest = self.registry.verify(version)
+            paths = self.registry.paths(version)
+            return Artifacts(joblib.load(paths['model']), joblib.load(paths['vectorizer']),
+                             manifest['fingerprint'], version, version)
+
+    def _warm_up(self, artifacts):
+        """Score a few texts so the first real request does not pay for lazy initialization"""
+        with self.perf.span('warmup'):
+            processed = [self.normalizer.normalize(text) for text in WARMUP_TEXTS]
+            artifacts.model.predict_proba(artifacts.vectorizer.transform(processed))
+
+    @property
+    def model(self):
+        return self._artifacts.model
+
+    @property
+    def vectorizer(self):
+        return self._artifacts.vectorizer
+
+    @property
+    def fingerprint(self):
+        return self._artifacts.fingerprint
+
+    @property
+    def version(self):
+        """Registry version being served (None when serving plain artifact paths)"""
+        return self._artifacts.version
+
+    def reload(self, force=False):
+        """Reload the artifacts if their contents changed; returns True if reloaded"""
+        with self._reload_lock:
+            current = self._artifacts
+            if not force and self._signature() == current.signature:
+                return False
+            artifacts = self._load()
+            if not force and artifacts.fingerprint == current.fingerprint:
+                self._artifacts = current._replace(signature=artifacts.signature, version=artifacts.version)
+                return False
+            self._warm_up(artifacts)
+            self._artifacts = artifacts
+            if self.cache is not None:
+                self.cache.bind(artifacts.fingerprint)
+            logger.info(f"Reloaded model artifacts {artifacts.version or ''} {artifacts.fingerprint[:12]}")
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.artifact_check_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                # A half-written or broken artifact: keep serving the current model
+                logger.warning(f"Artifact check failed, keeping current model: {e}")
+
+    def close(self):
+        """Stop the artifact watcher"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+
+    def _score(self, artifacts, processed):
+        with self.perf.span('transform'):
+            features = artifacts.vectorizer.transform(processed)
+        with self.perf.span('predict'):
+            probabilities = artifacts.model.predict_proba(features)
+        best = probabilities.argmax(axis=1)
+        classes = artifacts.model.classes_[best]
+        return [
+            (LABELS[int(cls)], float(probabilities[row, col]))
+            for row, (cls, col) in enumerate(zip(classes, best))
+        ]
+
+    def predict_batch(self, texts):
+        """Return a (label, confidence) pair per text from one predict_proba pass"""
+        if not texts:
+            return []
+        artifacts = self._artifacts
+        with self.perf.span('preprocess'):
+            processed = [self.normalizer.normalize(text) for text in texts]
+        if self.cache is None:
+            return self._score(artifacts, processed)
+
+        results = [None] * len(processed)
+        pending = {}
+        for i, key in enumerate(processed):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                # Duplicates inside one batch are scored once
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            keys = list(pending)
+            for key, result in zip(keys, self._score(artifacts, keys)):
+                if artifacts.fingerprint == self.cache.fingerprint:
+                    self.cache.put(key, result)
+                for i in pending[key]:
+                    results[i] = result
+        return results
+
+    def predict(self, text):
+        """Score a single text"""
+        return self.predict_batch([text])[0]
+
+
+def load_scorer(bundle_path=BUNDLE_PATH, cache=None):
+    """Fastest available scorer for short-lived jobs.
+
+    Uses the scoring bundle when it exists: it needs neither sklearn nor the
+    NLTK corpus, since its stopwords are stored in the bundle. Otherwise falls
+    back to a Predictor over the joblib artifacts (the cache only applies there).
+    """
+    if os.path.exists(bundle_path):
+        return BundleScorer(bundle_path)
+    return Predictor(cache=cache)
+
+
+class MicroBatcher:
+    """Groups concurrent predict calls into micro-batches for a Predictor.
+
+    A background thread waits for the first pending request, then keeps
+    collecting until either max_batch_size requests are queued or max_wait_ms
+    has passed, and scores them together.
+    """
+
+    def __init__(self, predictor, max_batch_size=64, max_wait_ms=5.0):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        """Queue a text for scoring and return a Future for its result"""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def predict(self, text, timeout=None):
+        """Score a text through the batcher, blocking until the result is ready"""
+        return self.submit(text).result(timeout=timeout)
+
+    def close(self):
+        """Stop accepting requests and finish the ones already queued"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the sentinel back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                break
+            texts = [text for text, _ in batch]
+            try:
+                results = self.predictor.predict_batch(texts)
+            except Exception as e:
+                logger.exception("Batch prediction failed")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
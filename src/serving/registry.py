@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+import logging
+
+from src.utils.hashing import artifact_hash
+
+logger = logging.getLogger(__name__)
+
+# Registry layout:
+#
+#   <root>/versions/v0001/{model.joblib, vectorizer.joblib, metrics.json, manifest.json}
+#                          (+ delta.feather and vectorizer_full.joblib for versions from incremental_update)
+#   <root>/CURRENT         name of the active version (replaced atomically)
+#   <root>/history.jsonl   append-only log of activations and rollbacks
+#
+# Version directories are written to a temp dir and renamed into place, and
+# CURRENT is swapped with os.replace, so a reader never sees a half-published
+# version or a half-written pointer.
+
+MANIFEST_FILE = 'manifest.json'
+ARTIFACT_FILES = {
+    'model': 'model.joblib',
+    'vectorizer': 'vectorizer.joblib',
+    'metrics': 'metrics.json',
+    'delta': 'delta.feather',
+    'vectorizer_full': 'vectorizer_full.joblib'
+}
+
+
+def artifacts_fingerprint(model_hash, vectorizer_hash):
+    """Identity of a model + vectorizer pair (the same one Predictor binds its cache to)"""
+    return hashlib.sha256((model_hash + vectorizer_hash).encode()).hexdigest()
+
+
+def _numeric_metrics(metrics):
+    return {
+        name: value for name, value in metrics.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+class ModelRegistry:
+    """Local registry of versioned model + vectorizer artifacts with an active-version pointer"""
+
+    def __init__(self, root):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.current_path = os.path.join(root, 'CURRENT')
+        self.history_path = os.path.join(root, 'history.jsonl')
+
+    @classmethod
+    def from_params(cls, registry_params):
+        return cls(registry_params.get('path', 'registry'))
+
+    def versions(self):
+        """Published versions (v0001, v0002, ...) in order"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(name for name in os.listdir(self.versions_dir) if name.startswith('v') and name[1:].isdigit())
+
+    def current(self):
+        """Name of the active version, or None if nothing was activated yet"""
+        try:
+            with open(self.current_path, 'r') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, version):
+        path = os.path.join(self.versions_dir, version, MANIFEST_FILE)
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown model version {version!r} in {self.root}")
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def paths(self, version):
+        """Absolute artifact paths of a version, by name (model, vectorizer, metrics)"""
+        manifest = self.manifest(version)
+        version_dir = os.path.join(self.versions_dir, version)
+        return {name: os.path.join(version_dir, entry['path']) for name, entry in manifest['files'].items()}
+
+    def verify(self, version):
+        """Raise ValueError if any artifact of version does not match its manifest hash"""
+        manifest = self.manifest(version)
+        for name, path in self.paths(version).items():
+            if not os.path.exists(path) or artifact_hash(path) != manifest['files'][name]['sha256']:
+                raise ValueError(f"Model version {version}: {name} does not match its manifest")
+        return manifest
+
+    def find(self, fingerprint):
+        """Version holding the artifacts with this fingerprint, or None"""
+        for version in reversed(self.versions()):
+            if self.manifest(version)['fingerprint'] == fingerprint:
+                return version
+        return None
+
+    def publish(self, model_path, vectorizer_path, metrics_path=None, source=None, extra_files=None, lineage=None):
+        """Copy artifacts into a new version; returns (version, created).
+
+        extra_files maps further ARTIFACT_FILES names to paths (e.g. the
+        delta of an incremental update); lineage is stored in the manifest
+        as is. Publishing artifacts that are already registered returns the
+        existing version, so re-running the pipeline does not pile up duplicates.
+        """
+        hashes = {'model': artifact_hash(model_path), 'vectorizer': artifact_hash(vectorizer_path)}
+        fingerprint = artifacts_fingerprint(hashes['model'], hashes['vectorizer'])
+        existing = self.find(fingerprint)
+        if existing:
+            return existing, False
+
+        sources = {'model': model_path, 'vectorizer': vectorizer_path}
+        if metrics_path:
+            sources['metrics'] = metrics_path
+        sources.update(extra_files or {})
+        metrics = {}
+        if metrics_path:
+            with open(metrics_path, 'r') as f:
+                metrics = _numeric_metrics(json.load(f))
+
+        os.makedirs(self.versions_dir, exist_ok=True)
+        tmp_dir = os.path.join(self.versions_dir, f'.tmp-{uuid.uuid4().hex}')
+        os.makedirs(tmp_dir)
+        try:
+            files = {}
+            for name, path in sources.items():
+                shutil.copyfile(path, os.path.join(tmp_dir, ARTIFACT_FILES[name]))
+                files[name] = {
+                    "path": ARTIFACT_FILES[name],
+                    "sha256": hashes.get(name) or artifact_hash(path),
+                    "bytes": os.path.getsize(path)
+                }
+            manifest = {
+                "fingerprint": fingerprint,
+                "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                "files": files,
+                "metrics": metrics,
+                "source": source or {name: os.path.abspath(path) for name, path in sources.items()}
+            }
+            if lineage is not None:
+                manifest["lineage"] = lineage
+            # Another publisher may take a version number first: try the next one
+            while True:
+                versions = self.versions()
+                version = f"v{int(versions[-1][1:]) + 1 if versions else 1:04d}"
+                with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+                    json.dump(dict(manifest, version=version), f, indent=2)
+                try:
+                    os.rename(tmp_dir, os.path.join(self.versions_dir, version))
+                    return version, True
+                except OSError:
+                    if not os.path.exists(os.path.join(self.versions_dir, version)):
+                        raise
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def _write_current(self, version):
+        tmp_path = f'{self.current_path}.tmp-{uuid.uuid4().hex}'
+        with open(tmp_path, 'w') as f:
+            f.write(version + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.current_path)
+
+    def _log(self, action, version, previous):
+        with open(self.history_path, 'a') as f:
+            f.write(json.dumps({"action": action, "version": version, "previous": previous, "time": time.time()}) + '\n')
+
+    def history(self):
+        if not os.path.exists(self.history_path):
+            return []
+        with open(self.history_path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _activation_stack(self):
+        """Versions activated and not rolled back, oldest first"""
+        stack = []
+        for entry in self.history():
+            if entry['action'] == 'activate':
+                stack.append(entry['version'])
+            elif stack:
+                stack.pop()
+        return stack
+
+    def activate(self, version):
+        """Point CURRENT at version (after checking its artifacts)"""
+        self.verify(version)
+        previous = self.current()
+        if previous == version:
+            return False
+        self._write_current(version)
+        self._log('activate', version, previous)
+        logger.info(f"Activated model version {version} (was {previous})")
+        return True
+
+    def rollback(self):
+        """Re-activate the version that was active before the current one; returns it"""
+        stack = self._activation_stack()
+        current = self.current()
+        if stack and stack[-1] == current:
+            stack.pop()
+        # Skip versions that were pruned since
+        while stack and stack[-1] not in self.versions():
+            stack.pop()
+        if not stack:
+            raise ValueError(f"No earlier model version to roll back to from {current}")
+        version = stack[-1]
+        self.verify(version)
+        self._write_current(version)
+        self._log('rollback', version, current)
+        logger.info(f"Rolled back model version {current} -> {version}")
+        return version
+
+    def prune(self, keep):
+        """Delete all but the newest keep versions, never the active one or its rollback target"""
+        stack = self._activation_stack()
+        protected = {self.current(), *stack[-2:]}
+        versions = self.versions()
+        removed = []
+        for version in versions[:max(len(versions) - keep, 0)]:
+            if version not in protected:
+                shutil.rmtree(os.path.join(self.versions_dir, version))
+                removed.append(version)
+        return removed
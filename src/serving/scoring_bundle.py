@@ -0,0 +1,196 @@
+import re
+import struct
+import numpy as np
+
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.serving.labels import LABELS
+from src.utils.instrumentation import Instrumentation
+
+# A scoring bundle is a flat .npz of NumPy arrays holding everything needed to
+# reproduce predict_proba of the TF-IDF + logistic regression pipeline:
+# stopwords, tokenization settings, the sorted n-gram table (or the hashing
+# width), IDF weights and the pruned coefficient vector. Loading it needs
+# neither pickle nor sklearn.
+
+BUNDLE_VERSION = 1
+
+
+def murmurhash3_32(data, seed=0):
+    """Signed 32-bit MurmurHash3 (x86), bit-compatible with sklearn.utils.murmurhash3_32"""
+    c1, c2, mask = 0xcc9e2d51, 0x1b873593, 0xffffffff
+    length = len(data)
+    h1 = seed & mask
+    n_blocks = length // 4
+    for k1 in struct.unpack_from(f'<{n_blocks}I', data):
+        k1 = (k1 * c1) & mask
+        k1 = ((k1 << 15) | (k1 >> 17)) & mask
+        h1 ^= (k1 * c2) & mask
+        h1 = ((h1 << 13) | (h1 >> 19)) & mask
+        h1 = (h1 * 5 + 0xe6546b64) & mask
+
+    tail = data[n_blocks * 4:]
+    if tail:
+        k1 = int.from_bytes(tail, 'little')
+        k1 = (k1 * c1) & mask
+        k1 = ((k1 << 15) | (k1 >> 17)) & mask
+        h1 ^= (k1 * c2) & mask
+
+    h1 ^= length
+    h1 ^= h1 >> 16
+    h1 = (h1 * 0x85ebca6b) & mask
+    h1 ^= h1 >> 13
+    h1 = (h1 * 0xc2b2ae35) & mask
+    h1 ^= h1 >> 16
+    return h1 - (1 << 32) if h1 & 0x80000000 else h1
+
+
+def _check_vectorizer(vectorizer):
+    for attr, expected in (('analyzer', 'word'), ('tokenizer', None), ('preprocessor', None),
+                           ('stop_words', None), ('norm', 'l2'), ('use_idf', True),
+                           ('sublinear_tf', False), ('binary', False)):
+        value = getattr(vectorizer, attr, expected)
+        if value != expected:
+            raise ValueError(f"Cannot export vectorizer with {attr}={value!r} (expected {expected!r})")
+
+
+def export_bundle(vectorizer, model, path, stop_words, strip_datelines=True, prune_threshold=0.0):
+    """Write a fitted vectorizer + binary LogisticRegression as a scoring bundle.
+
+    Coefficients with |w| <= prune_threshold are dropped. The full n-gram
+    table and IDF vector are kept, because every feature still counts towards
+    the L2 norm of a document. Returns the number of coefficients kept.
+    """
+    if len(model.classes_) != 2:
+        raise ValueError("Scoring bundles support binary classifiers only")
+    if getattr(model, 'loss', 'log_loss') != 'log_loss':
+        # Bundles score with a sigmoid, which is predict_proba only for log loss
+        raise ValueError(f"Cannot export a model trained with loss={model.loss!r}")
+    coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+    kept = np.flatnonzero(np.abs(coef) > prune_threshold).astype(np.int32)
+
+    arrays = {
+        "version": np.array(BUNDLE_VERSION),
+        "stop_words": np.array(sorted(stop_words), dtype='S'),
+        "strip_datelines": np.array(strip_datelines),
+        "ngram_range": np.array(vectorizer.ngram_range, dtype=np.int64),
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float64),
+        "weight_index": kept,
+        "weights": coef[kept],
+        "intercept": np.array(float(np.ravel(model.intercept_)[0])),
+        "classes": np.asarray(model.classes_, dtype=np.int64)
+    }
+    if hasattr(vectorizer, 'vocabulary_'):
+        _check_vectorizer(vectorizer)
+        terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+        arrays["kind"] = np.array("vocabulary")
+        arrays["token_pattern"] = np.array(vectorizer.token_pattern)
+        # Normalized text is ASCII-only, so one byte per character is enough
+        arrays["terms"] = np.array(terms, dtype='S')
+        if not np.all(arrays["terms"][:-1] < arrays["terms"][1:]):
+            raise ValueError("Vectorizer vocabulary indices are not in sorted term order")
+    elif hasattr(vectorizer, 'n_features') and hasattr(vectorizer, 'idf_'):
+        arrays["kind"] = np.array("hashing")
+        arrays["token_pattern"] = np.array(r"(?u)\b\w\w+\b")
+        arrays["n_features"] = np.array(vectorizer.n_features, dtype=np.int64)
+    else:
+        raise ValueError(f"Unsupported vectorizer for scoring bundles: {type(vectorizer).__name__}")
+
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+    return len(kept)
+
+
+class BundleScorer:
+    """Lightweight logistic-regression scorer backed by a scoring bundle"""
+
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as bundle:
+            arrays = {name: bundle[name] for name in bundle.files}
+        if int(arrays['version']) != BUNDLE_VERSION:
+            raise ValueError(f"Unsupported scoring bundle version {int(arrays['version'])}")
+        self.perf = Instrumentation()
+
+        self.kind = str(arrays['kind'])
+        self.normalizer = TextNormalizer(
+            stop_words=[word.decode('ascii') for word in arrays['stop_words']],
+            strip_datelines=bool(arrays['strip_datelines'])
+        )
+        self.token_re = re.compile(str(arrays['token_pattern']))
+        self.ngram_range = tuple(int(n) for n in arrays['ngram_range'])
+        self.idf = arrays['idf']
+        self.intercept = float(arrays['intercept'])
+        self.classes_ = arrays['classes']
+        self.weights = np.zeros(len(self.idf), dtype=np.float64)
+        self.weights[arrays['weight_index']] = arrays['weights']
+        if self.kind == 'vocabulary':
+            self.terms = arrays['terms']
+        else:
+            self.n_features = int(arrays['n_features'])
+
+    def _ngrams(self, tokens):
+        # Same n-gram order and bounds as sklearn's _word_ngrams
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n + 1, len(tokens) + 1)):
+            for i in range(len(tokens) - n + 1):
+                grams.append(' '.join(tokens[i:i + n]))
+        return grams
+
+    def _hash_columns(self, grams):
+        columns = np.empty(len(grams), dtype=np.int64)
+        for i, gram in enumerate(grams):
+            h = murmurhash3_32(gram.encode('utf-8'))
+            columns[i] = (2147483647 - (self.n_features - 1)) % self.n_features if h == -2147483648 else abs(h) % self.n_features
+        return columns
+
+    def decision_function(self, texts):
+        with self.perf.span('preprocess'):
+            rows, grams = [], []
+            for row, text in enumerate(texts):
+                normalized = self.normalizer.normalize(text)
+                if not isinstance(normalized, str):
+                    raise ValueError(f"Invalid document at position {row}: {text!r}")
+                doc_grams = self._ngrams(self.token_re.findall(normalized))
+                grams.extend(doc_grams)
+                rows.extend([row] * len(doc_grams))
+            rows = np.asarray(rows, dtype=np.int64)
+        with self.perf.span('predict'):
+            return self._score(len(texts), rows, grams)
+
+    def _score(self, n_docs, rows, grams):
+        if self.kind == 'vocabulary':
+            keys = np.array(grams, dtype='S') if grams else np.array([], dtype='S1')
+            positions = np.minimum(np.searchsorted(self.terms, keys), len(self.terms) - 1)
+            found = self.terms[positions] == keys
+            rows, columns = rows[found], positions[found]
+        else:
+            columns = self._hash_columns(grams)
+
+        # Term counts per (document, column), then TF-IDF, L2 norm and dot product
+        n_columns = len(self.idf)
+        cells, tf = np.unique(rows * n_columns + columns, return_counts=True)
+        rows, columns = cells // n_columns, cells % n_columns
+        values = tf * self.idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=n_docs))
+        dots = np.bincount(rows, weights=values * self.weights[columns], minlength=n_docs)
+        return self.intercept + np.divide(dots, norms, out=np.zeros(n_docs), where=norms > 0)
+
+    def predict_proba(self, texts):
+        positive = np.exp(-np.logaddexp(0, -self.decision_function(texts)))
+        return np.column_stack([1 - positive, positive])
+
+    def predict_batch(self, texts):
+        """Return a (label, confidence) pair per text, like Predictor.predict_batch"""
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [
+            (LABELS[int(self.classes_[col])], float(probabilities[row, col]))
+            for row, col in enumerate(best)
+        ]
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
@@ -0,0 +1,108 @@
+import json
+import os
+import yaml
+import numpy as np
+import logging
+
+from src.pipeline.artifacts import Artifacts
+from src.serving.cascade import (CALIBRATION_PATH, RF_FOREST_PATH, RF_VECTORIZER_PATH, CascadePredictor,
+                                 calibrate_band, load_rf_model, tier_costs)
+from src.serving.predictor import MODEL_PATH, VECTORIZER_PATH
+from src.utils.instrumentation import StageMonitor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def shared_test_articles(artifacts):
+    """Articles in both the LR and the RF test split: neither model trained on them"""
+    X_lr, y_lr = artifacts.split('data/processed/test_data.feather')
+    X_rf = artifacts.texts('data/processed/rf/test_data.feather')
+    both = X_lr.isin(set(X_rf)) & ~X_lr.duplicated()
+    return X_lr[both].tolist(), y_lr[both].to_numpy()
+
+def calibrate_cascade(params=None, artifacts=None):
+    """Pick the LR uncertainty band escalated to the RF under the latency budget"""
+    # Load parameters (the in-process pipeline executor passes them in)
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    artifacts = artifacts or Artifacts()
+
+    perf = StageMonitor.start('calibrate_cascade', params)
+    cascade_params = params['cascade']
+    calibrate_params = cascade_params['calibrate']
+    batch_size = calibrate_params['batch_size']
+
+    with perf.span('load'):
+        texts, y = shared_test_articles(artifacts)
+        predictor = CascadePredictor(
+            artifacts.load(MODEL_PATH), artifacts.load(VECTORIZER_PATH),
+            load_rf_model(cascade_params.get('rf_model', RF_FOREST_PATH)), artifacts.load(RF_VECTORIZER_PATH),
+            rf_language=params['rf']['featurize']['stop_words']
+        )
+    if len(texts) < 2:
+        raise ValueError("The LR and RF test splits share fewer than 2 articles; nothing to calibrate on")
+
+    # Half of the unseen articles choose the band, the other half report on it
+    rng = np.random.default_rng(calibrate_params.get('random_state', 42))
+    order = rng.permutation(len(texts))
+    n_report = max(1, int(len(texts) * calibrate_params['holdout_fraction']))
+    calibration, report = order[n_report:], order[:n_report]
+    calibration_texts = [texts[i] for i in calibration]
+    logger.info(f"Calibrating on {len(calibration)} articles, reporting on {len(report)} "
+                f"(of {len(texts)} in both test splits)")
+
+    with perf.span('score'):
+        lr_proba = predictor.lr_proba(calibration_texts)
+        rf_proba = predictor.rf_proba(calibration_texts)
+        costs = tier_costs(predictor, calibration_texts, batch_size)
+    classes = predictor.classes_
+    lr_correct = classes.take(lr_proba.argmax(axis=1)) == y[calibration]
+    rf_correct = classes.take(rf_proba.argmax(axis=1)) == y[calibration]
+
+    budget_ms = calibrate_params.get('latency_budget_ms') or costs['lr'] * calibrate_params['max_latency_ratio']
+    with perf.span('calibrate'):
+        chosen = calibrate_band(
+            lr_proba[:, list(classes).index(1)], lr_correct, rf_correct,
+            costs['lr'], costs['rf'], budget_ms, calibrate_params['grid_size']
+        )
+    if chosen['band'] is None:
+        logger.warning("No band improves on the LR within the latency budget: the cascade will not escalate")
+
+    predictor.band = tuple(chosen['band']) if chosen['band'] is not None else None
+    with perf.span('evaluate'):
+        evaluation = predictor.evaluate([texts[i] for i in report], y[report], batch_size)
+
+    calibration_record = {
+        "band": chosen['band'],
+        "latency_budget_ms": round(budget_ms, 4),
+        "lr_ms_per_doc": round(costs['lr'], 4),
+        "rf_ms_per_doc": round(costs['rf'], 4),
+        "calibration_docs": len(calibration),
+        "calibration_accuracy": chosen['accuracy'],
+        "calibration_escalation_share": chosen['escalation_share'],
+        "expected_ms_per_doc": round(chosen['expected_ms_per_doc'], 4)
+    }
+    with open(CALIBRATION_PATH, 'w') as f:
+        json.dump(calibration_record, f, indent=2)
+    os.makedirs('metrics', exist_ok=True)
+    with open('metrics/cascade.json', 'w') as f:
+        json.dump(evaluation, f, indent=2)
+    perf.log_metrics({
+        "accuracy": evaluation['accuracy'],
+        "escalation_share": evaluation['tiers']['rf']['share'],
+        "ms_per_doc": evaluation['ms_per_doc'],
+        "lr_only_accuracy": evaluation['lr_only']['accuracy'],
+        "rf_only_accuracy": evaluation['rf_only']['accuracy']
+    })
+    perf.finish()
+
+    logger.info(
+        f"Cascade band {chosen['band']}: accuracy {evaluation['accuracy']} at {evaluation['ms_per_doc']} ms/article, "
+        f"{evaluation['tiers']['rf']['share']:.1%} escalated (LR alone {evaluation['lr_only']['accuracy']} at "
+        f"{evaluation['lr_only']['ms_per_doc']} ms, RF alone {evaluation['rf_only']['accuracy']} at "
+        f"{evaluation['rf_only']['ms_per_doc']} ms)"
+    )
+
+if __name__ == "__main__":
+    calibrate_cascade()
@@ -1,49 +1,74 @@
-import pandas as pd
-import joblib
+import json
 import yaml
 from sklearn.model_selection import train_test_split
 import logging
 import os
 
+from src.data.dedup import deduplicate
+from src.data.ingestion import CORPUS_PARAMS, load_labelled_corpus
+from src.pipeline.artifacts import Artifacts
+from src.utils.instrumentation import StageMonitor
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def load_data():
+def load_data(params=None, artifacts=None):
     """Load and prepare the dataset"""
-    # Load parameters
-    with open('params.yaml', 'r') as f:
-        params = yaml.safe_load(f)
-    
-    sample_size = params['data_ingestion']['sample_size_per_class']
-    test_size = params['data_ingestion']['test_size']
-    random_state = params['data_ingestion']['random_state']
+    # Load parameters (the in-process pipeline executor passes them in)
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    artifacts = artifacts or Artifacts()
     
-    logger.info(f"Loading data with sample_size={sample_size}, test_size={test_size}")
+    perf = StageMonitor.start('data_ingestion', params)
+    data_params = params['data_ingestion']
+    sample_size = data_params['sample_size_per_class']
+    test_size = data_params['test_size']
+    random_state = data_params['random_state']
+    sampling = data_params.get('sampling', 'head')
     
-    # Load datasets - FIXED PATHS
-    df_fake = pd.read_csv('data/raw/Fake.csv').head(sample_size)
-    df_true = pd.read_csv('data/raw/True.csv').head(sample_size)
+    logger.info(f"Loading data with sample_size={sample_size}, sampling={sampling}, test_size={test_size}")
     
-    # Add labels and combine
-    df_fake['label'] = 0
-    df_true['label'] = 1
-    df = pd.concat([df_fake, df_true], ignore_index=True)
+    # Stream only title/text from the raw CSVs; content and label per class.
+    # Under the pipeline executor the RF branch reuses the parse (and the
+    # deduplication below) when its data params match.
+    corpus_key = {key: data_params.get(key) for key in CORPUS_PARAMS}
+    with perf.span('load'):
+        df = artifacts.shared('corpus', corpus_key, lambda: load_labelled_corpus(data_params))
     
-    # Combine title and text
-    df['content'] = df['title'] + ' ' + df['text']
+    # Collapse near-duplicate clusters (reposts, light edits) before the split,
+    # so copies of one article cannot end up on both sides of it
+    with perf.span('dedup'):
+        keep, index, dedup_stats = artifacts.shared(
+            'dedup', [corpus_key, data_params['dedup']],
+            lambda: deduplicate(df['content'], df['label'], data_params['dedup'], row_ids=df.index)
+        )
+        df = df[keep]
+        index.save('data/processed/dedup_index.npz')
+    os.makedirs('metrics', exist_ok=True)
+    with open('metrics/dedup.json', 'w') as f:
+        json.dump(dedup_stats, f, indent=2)
+    perf.gauge('dedup_removed', dedup_stats['removed'])
+    logger.info(f"Near-duplicates: removed {dedup_stats['removed']}/{dedup_stats['documents']} rows "
+                f"in {dedup_stats['duplicate_clusters']} clusters")
     
     # Split features and target
     X = df['content']
     y = df['label']
     
     # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state, stratify=y
-    )
+    with perf.span('split'):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=random_state, stratify=y
+        )
     
     # Save processed data
-    joblib.dump({'X_train': X_train, 'y_train': y_train}, 'data/processed/train_data.joblib')
-    joblib.dump({'X_test': X_test, 'y_test': y_test}, 'data/processed/test_data.joblib')
+    with perf.span('dump'):
+        artifacts.save_split('data/processed/train_data.feather', X_train, y_train)
+        artifacts.save_split('data/processed/test_data.feather', X_test, y_test)
+    perf.gauge('train_rows', len(X_train))
+    perf.gauge('test_rows', len(X_test))
+    perf.finish()
     
     logger.info(f"Data ingestion complete. Train: {len(X_train)}, Test: {len(X_test)}")
 
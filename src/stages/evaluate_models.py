@@ -0,0 +1,82 @@
+import json
+import os
+import time
+import yaml
+import logging
+
+from src.evaluation.streaming import evaluate_split, latency_curve, recommend_batch_size
+from src.utils.instrumentation import StageMonitor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Test split each bulk-scoring model was held out from
+TEST_SPLITS = {
+    'lr': 'data/processed/test_data.feather',
+    'bundle': 'data/processed/test_data.feather',
+    'rf': 'data/processed/rf/test_data.feather',
+    'rf_flat': 'data/processed/rf/test_data.feather'
+}
+METRICS_PATH = 'metrics/evaluation.json'
+
+def evaluate_model(name, params, perf):
+    """Quality from streamed confusion counts, plus the model's batch latency curve"""
+    eval_params = params['evaluation']
+    split_path = TEST_SPLITS[name]
+    start = time.perf_counter()
+    with perf.span(f'{name}.score'):
+        counts, score_s = evaluate_split(name, params, split_path, eval_params['chunk_size'], eval_params['n_jobs'])
+    wall_s = time.perf_counter() - start
+
+    latency_params = eval_params['latency']
+    with perf.span(f'{name}.latency'):
+        curve = latency_curve(name, params, split_path, latency_params['batch_sizes'], latency_params['rows'])
+
+    return {
+        "docs": counts.docs,
+        **counts.metrics(eval_params['target_names']),
+        "confusion_matrix": counts.counts.tolist(),
+        "chunk_size": eval_params['chunk_size'],
+        "wall_s": round(wall_s, 3),
+        "docs_per_s": round(counts.docs / wall_s, 1) if wall_s else None,
+        "worker_docs_per_s": round(counts.docs / score_s, 1) if score_s else None,
+        "latency": curve,
+        "recommended_batch_size": recommend_batch_size(curve, latency_params['throughput_fraction'])
+    }
+
+def evaluate_models(params=None, artifacts=None):
+    """Score every configured model on its test split in parallel chunks and write metrics/evaluation.json"""
+    # Load parameters (the in-process pipeline executor passes them in)
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+
+    perf = StageMonitor.start('evaluate_models', params)
+    models = params['evaluation']['models']
+    unknown = [name for name in models if name not in TEST_SPLITS]
+    if unknown:
+        raise ValueError(f"Unknown model(s) {', '.join(unknown)}; expected some of {', '.join(TEST_SPLITS)}")
+
+    results = {}
+    for name in models:
+        results[name] = evaluate_model(name, params, perf)
+        result = results[name]
+        logger.info(
+            f"{name}: accuracy {result['accuracy']} on {result['docs']} articles, {result['docs_per_s']} docs/s; "
+            f"recommended batch size {result['recommended_batch_size']}"
+        )
+
+    os.makedirs('metrics', exist_ok=True)
+    with open(METRICS_PATH, 'w') as f:
+        json.dump(results, f, indent=2)
+    perf.log_metrics({
+        f"{name}_{key}": result[key]
+        for name, result in results.items()
+        for key in ('accuracy', 'docs_per_s', 'recommended_batch_size')
+    })
+    perf.finish()
+
+    logger.info(f"Evaluation saved to {METRICS_PATH}")
+
+if __name__ == "__main__":
+    evaluate_models()
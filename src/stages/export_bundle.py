@@ -0,0 +1,67 @@
+import os
+import time
+import yaml
+import numpy as np
+import logging
+
+from src.pipeline.artifacts import Artifacts
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.serving.scoring_bundle import BundleScorer, export_bundle
+from src.utils.instrumentation import StageMonitor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def export_scoring_bundle(params=None, artifacts=None):
+    """Export the LR model + vectorizer as a compact scoring bundle and verify it"""
+    # Load parameters (the in-process pipeline executor passes them in)
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    artifacts = artifacts or Artifacts()
+
+    perf = StageMonitor.start('export_bundle', params)
+    prune_threshold = params['scoring_bundle']['prune_threshold']
+    tolerance = params['scoring_bundle']['tolerance']
+
+    with perf.span('load'):
+        model = artifacts.load('model/lr_fake_news_model.joblib')
+        vectorizer = artifacts.load('data/processed/vectorizer.joblib')
+        normalizer = TextNormalizer(strip_datelines=True)
+
+    with perf.span('dump'):
+        kept = export_bundle(
+            vectorizer, model, 'model/scoring_bundle.npz',
+            stop_words=normalizer.stop_words,
+            strip_datelines=normalizer.strip_datelines,
+            prune_threshold=prune_threshold
+        )
+    perf.gauge('kept_coefficients', kept)
+    logger.info(f"Kept {kept}/{model.coef_.shape[1]} coefficients (|w| > {prune_threshold})")
+
+    # The bundle must reproduce predict_proba of the full pipeline
+    start = time.perf_counter()
+    scorer = BundleScorer('model/scoring_bundle.npz')
+    load_ms = (time.perf_counter() - start) * 1000
+
+    X_test = artifacts.texts('data/processed/test_data.feather').tolist()
+    with perf.span('predict'):
+        expected = model.predict_proba(vectorizer.transform(normalizer.normalize_many(X_test)))[:, 1]
+    with perf.span('predict_bundle'):
+        actual = scorer.predict_proba(X_test)[:, 1]
+    max_diff = float(np.max(np.abs(expected - actual))) if len(X_test) else 0.0
+    if max_diff > tolerance:
+        raise ValueError(f"Scoring bundle deviates from predict_proba by {max_diff:.2e} (tolerance {tolerance:.0e})")
+
+    bundle_mb = os.path.getsize('model/scoring_bundle.npz') / 1e6
+    pickled_mb = (os.path.getsize('model/lr_fake_news_model.joblib') + os.path.getsize('data/processed/vectorizer.joblib')) / 1e6
+    perf.gauge('bundle_load_ms', load_ms)
+    perf.gauge('bundle_mb', bundle_mb)
+    perf.finish()
+    logger.info(
+        f"Scoring bundle exported: {bundle_mb:.2f} MB (joblib artifacts {pickled_mb:.2f} MB), "
+        f"load {load_ms:.1f} ms, max |p - predict_proba| = {max_diff:.2e}"
+    )
+
+if __name__ == "__main__":
+    export_scoring_bundle()
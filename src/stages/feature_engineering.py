@@ -1,65 +1,90 @@
-import joblib
-import yaml
-import re
-import nltk
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
 import logging
 
+from src.preprocessing.text_normalizer import TextNormalizer
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TextPreprocessor:
-    def __init__(self):
-        try:
-            self.stop_words = set(stopwords.words('english'))
-        except LookupError:
-            nltk.download('stopwords')
-            self.stop_words = set(stopwords.words('english'))
+    """Single-document wrapper around the shared TextNormalizer (LR variant)"""
+    def __init__(self, stop_words=None):
+        self.normalizer = TextNormalizer(stop_words=stop_words, strip_datelines=True)
+        self.stop_words = self.normalizer.stop_words
     
     def preprocess_text(self, text):
-        if isinstance(text, str):
-            text = re.sub(r'^[A-Z\s]+ \([A-Z\s]+\) - ', '', text)
-            text = re.sub(r'^[A-Z\s]+\s\([A-Z\s]+\) – ', '', text)
-            text = re.sub(r'[^a-zA-Z\s]', '', text)
-            text = text.lower()
-            text = ' '.join([word for word in text.split() if word not in self.stop_words])
-        return text
+        return self.normalizer.normalize(text)
 
-def engineer_features():
+def engineer_features(params=None, artifacts=None):
     """Perform feature engineering"""
-    # Load parameters
-    with open('params.yaml', 'r') as f:
-        params = yaml.safe_load(f)
+    # Training-only dependencies (sklearn, pandas, scipy) are imported here so
+    # that importing TextPreprocessor from this module stays cheap
+    import yaml
+    from src.features.feature_cache import FeatureCache
+    from src.features.vectorizers import build_vectorizer
+    from src.pipeline.artifacts import Artifacts
+    from src.utils.instrumentation import StageMonitor
+
+    # Load parameters (the in-process pipeline executor passes them in)
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    artifacts = artifacts or Artifacts()
     
-    max_features = params['feature_engineering']['max_features']
-    ngram_range = tuple(params['feature_engineering']['ngram_range'])
+    perf = StageMonitor.start('feature_engineering', params)
+    fe_params = params['feature_engineering']
+    max_features = fe_params['max_features']
+    ngram_range = tuple(fe_params['ngram_range'])
+    vectorizer_kind = fe_params.get('vectorizer', 'tfidf')
     
-    logger.info(f"Feature engineering with max_features={max_features}, ngram_range={ngram_range}")
+    logger.info(f"Feature engineering with vectorizer={vectorizer_kind}, max_features={max_features}, ngram_range={ngram_range}")
     
-    # Load data
-    train_data = joblib.load('data/processed/train_data.joblib')
-    test_data = joblib.load('data/processed/test_data.joblib')
+    # Identical inputs + featurization params: reuse a previous run's outputs
+    split_paths = ['data/processed/train_data.feather', 'data/processed/test_data.feather']
+    outputs = {
+        'vectorizer.joblib': 'data/processed/vectorizer_full.joblib',
+        'X_train_tfidf': 'data/processed/X_train_full',
+        'X_test_tfidf': 'data/processed/X_test_full'
+    }
+    cache = FeatureCache.from_params(params.get('feature_cache'))
+    if cache:
+        cache_key = cache.make_key(split_paths, 'lr-english', fe_params)
+        with perf.span('cache_restore'):
+            hit = cache.restore(cache_key, outputs)
+        if hit:
+            perf.gauge('cache_hit', 1)
+            perf.finish()
+            logger.info("Feature engineering complete (restored from feature cache)")
+            return
     
-    X_train = train_data['X_train']
-    X_test = test_data['X_test']
+    # Load data (text column only)
+    with perf.span('load'):
+        X_train = artifacts.texts('data/processed/train_data.feather')
+        X_test = artifacts.texts('data/processed/test_data.feather')
     
-    # Initialize preprocessor and vectorizer
-    preprocessor = TextPreprocessor()
-    vectorizer = TfidfVectorizer(
-        max_features=max_features,
-        ngram_range=ngram_range,
-        preprocessor=preprocessor.preprocess_text
-    )
+    # Normalization runs inside the vectorizer's worker processes, in the same
+    # pass as tokenizing and counting. The saved vectorizer carries no
+    # preprocessor: callers must normalize before transform().
+    normalizer = TextNormalizer(strip_datelines=True)
+    vectorizer = build_vectorizer(fe_params)
     
     # Fit and transform
-    X_train_tfidf = vectorizer.fit_transform(X_train)
-    X_test_tfidf = vectorizer.transform(X_test)
+    with perf.span('fit'):
+        X_train_tfidf = vectorizer.fit_transform(X_train, normalizer=normalizer)
+    with perf.span('transform'):
+        X_test_tfidf = vectorizer.transform(X_test, normalizer=normalizer)
+    perf.matrix('X_train_tfidf', X_train_tfidf)
+    perf.matrix('X_test_tfidf', X_test_tfidf)
     
-    # Save features and vectorizer
-    joblib.dump(X_train_tfidf, 'data/processed/X_train_tfidf.joblib')
-    joblib.dump(X_test_tfidf, 'data/processed/X_test_tfidf.joblib')
-    joblib.dump(vectorizer, 'data/processed/vectorizer.joblib')
+    # Save vectorizer, then the features tagged with its hash
+    with perf.span('dump'):
+        artifacts.dump('data/processed/vectorizer_full.joblib', vectorizer)
+        artifacts.save_features('data/processed/X_train_full', X_train_tfidf, 'data/processed/vectorizer_full.joblib')
+        artifacts.save_features('data/processed/X_test_full', X_test_tfidf, 'data/processed/vectorizer_full.joblib')
+    if cache:
+        with perf.span('cache_store'):
+            cache.store(cache_key, outputs)
+    perf.gauge('cache_hit', 0)
+    perf.finish()
     
     logger.info(f"Feature engineering complete. Features: {X_train_tfidf.shape[1]}")
 
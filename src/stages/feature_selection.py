@@ -0,0 +1,48 @@
+import yaml
+import logging
+
+from src.features.selection import select_features
+from src.pipeline.artifacts import Artifacts
+from src.utils.instrumentation import StageMonitor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run_feature_selection(params=None, artifacts=None):
+    """Keep the top-k TF-IDF columns by a supervised score and prune the vectorizer to them"""
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    artifacts = artifacts or Artifacts()
+    
+    perf = StageMonitor.start('feature_selection', params)
+    select_params = params['feature_selection']
+    
+    with perf.span('load'):
+        vectorizer = artifacts.load('data/processed/vectorizer_full.joblib')
+        X_train = artifacts.features('data/processed/X_train_full', 'data/processed/vectorizer_full.joblib')
+        X_test = artifacts.features('data/processed/X_test_full', 'data/processed/vectorizer_full.joblib')
+        y_train = artifacts.labels('data/processed/train_data.feather')
+    n_features = X_train.shape[1]
+    
+    # The pruned vectorizer only counts surviving n-grams, so serving gets
+    # the reduction too without knowing about the selection
+    with perf.span('select'):
+        vectorizer, X_train, (X_test,), columns = select_features(vectorizer, X_train, y_train, select_params, [X_test])
+    if columns is None and select_params.get('method') and not hasattr(vectorizer, 'vocabulary_'):
+        logger.warning("Hashing vectorizer has no vocabulary to prune; keeping every column")
+    perf.matrix('X_train_tfidf', X_train)
+    perf.matrix('X_test_tfidf', X_test)
+    perf.gauge('n_features', X_train.shape[1])
+    
+    with perf.span('dump'):
+        artifacts.dump('data/processed/vectorizer.joblib', vectorizer)
+        artifacts.save_features('data/processed/X_train_tfidf', X_train, 'data/processed/vectorizer.joblib')
+        artifacts.save_features('data/processed/X_test_tfidf', X_test, 'data/processed/vectorizer.joblib')
+    perf.finish()
+    
+    logger.info(f"Feature selection complete ({select_params.get('method') or 'none'}): "
+                f"kept {X_train.shape[1]}/{n_features} features")
+
+if __name__ == "__main__":
+    run_feature_selection()
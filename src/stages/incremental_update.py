@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import tempfile
+import yaml
+import numpy as np
+import pandas as pd
+import logging
+
+from src.data.ingestion import load_class_sample
+from src.data.split_store import load_split, save_split
+from src.features.vectorizers import build_vectorizer
+from src.pipeline.artifacts import Artifacts, dump_pickle
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.serving.registry import ModelRegistry
+from src.training.incremental import (continue_training, document_frequencies, known_coverage, refit, reweight,
+                                      same_columns, stack, update_vectorizer)
+from src.utils.hashing import artifact_hash
+from src.utils.instrumentation import StageMonitor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PIPELINE_MODEL = 'model/lr_fake_news_model.joblib'
+PIPELINE_VECTORIZER = 'data/processed/vectorizer.joblib'
+PIPELINE_FULL_VECTORIZER = 'data/processed/vectorizer_full.joblib'
+TRAIN_SPLIT = 'data/processed/train_data.feather'
+
+def load_parent(registry, artifacts):
+    """What the update starts from: the registry's CURRENT version if it is an
+    incremental update of the current train split, else the DVC pipeline outputs.
+
+    Returns (lineage, {model, vectorizer, vectorizer_full: path}, earlier
+    delta or None). Each incremental version stores every delta applied since
+    the pipeline model and the vectorizer before feature selection, so
+    pruning older versions never loses history.
+    """
+    base = artifacts.hash(TRAIN_SPLIT)
+    current = registry.current()
+    lineage = registry.manifest(current).get('lineage') if current else None
+    if lineage and lineage['base'] == base:
+        paths = registry.paths(current)
+        return dict(lineage, version=current), paths, load_split(paths['delta'])
+    lineage = {
+        "version": None,
+        "base": base,
+        "n_docs": len(artifacts.labels(TRAIN_SPLIT)),
+        "delta_hash": None
+    }
+    paths = {'model': PIPELINE_MODEL, 'vectorizer': PIPELINE_VECTORIZER, 'vectorizer_full': PIPELINE_FULL_VECTORIZER}
+    return lineage, paths, None
+
+def load_delta(delta_dir, random_state):
+    """New labelled articles from <delta_dir>/Fake.csv and True.csv (either may be missing)"""
+    parts, hashes = [], []
+    for name, label in (('Fake.csv', 0), ('True.csv', 1)):
+        path = os.path.join(delta_dir, name)
+        if os.path.exists(path):
+            parts.append(load_class_sample(path, label, None, random_state=random_state))
+            hashes.append(f"{name}:{artifact_hash(path)}")
+    if not parts:
+        return None, None
+    df = pd.concat(parts, ignore_index=True)
+    df = df[df['content'].notna()].reset_index(drop=True)
+    return df, hashlib.sha256('|'.join(hashes).encode()).hexdigest()
+
+def history_features(vectorizer, artifacts, normalizer, earlier=None, rows=None):
+    """Train split (rows of it, if given) plus the earlier deltas, featurized with vectorizer.
+
+    While the vocabulary is still the pipeline's, the stored X_train_tfidf is
+    re-weighted to the vectorizer's IDF instead of vectorizing the articles again.
+    """
+    y_train = artifacts.labels(TRAIN_SPLIT).to_numpy()
+    pipeline_vectorizer = artifacts.load(PIPELINE_VECTORIZER)
+    if same_columns(pipeline_vectorizer, vectorizer):
+        X = artifacts.features('data/processed/X_train_tfidf', PIPELINE_VECTORIZER)
+        X = reweight(X[rows] if rows is not None else X, pipeline_vectorizer.idf_, vectorizer.idf_)
+    else:
+        texts = artifacts.texts(TRAIN_SPLIT)
+        texts = texts.iloc[rows] if rows is not None else texts
+        X = vectorizer.transform(normalizer.normalize_many(texts.tolist()))
+    parts, labels = [X], [y_train[rows] if rows is not None else y_train]
+    if earlier is not None:
+        X_old, y_old = earlier
+        parts.append(vectorizer.transform(normalizer.normalize_many(X_old.tolist())))
+        labels.append(y_old.to_numpy())
+    return stack(parts), np.concatenate(labels)
+
+def update_model(params=None, artifacts=None):
+    """Apply a delta of new labelled articles to the active model and publish the result to the registry"""
+    # Load parameters (the in-process pipeline executor passes them in)
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    artifacts = artifacts or Artifacts()
+
+    perf = StageMonitor.start('incremental_update', params)
+    inc_params = params['incremental_update']
+    registry = ModelRegistry.from_params(params['registry'])
+    random_state = inc_params.get('random_state', 42)
+
+    with perf.span('load'):
+        parent, parent_paths, earlier = load_parent(registry, artifacts)
+        delta, delta_hash = load_delta(inc_params['delta_dir'], random_state)
+
+    status = {"parent_version": parent['version']}
+    if delta is None or delta.empty:
+        status["status"] = "no_delta"
+    elif delta_hash == parent['delta_hash']:
+        status["status"] = "already_applied"
+    os.makedirs('metrics', exist_ok=True)
+    if "status" in status:
+        logger.info(f"Nothing to update ({status['status']})")
+        with open('metrics/incremental_update.json', 'w') as f:
+            json.dump(status, f, indent=2)
+        perf.finish()
+        return
+
+    # The model and vectorizer are copied before they are updated
+    model = artifacts.load(parent_paths['model'])
+    vectorizer = artifacts.load(parent_paths['vectorizer'])
+    full_vectorizer = artifacts.load(parent_paths['vectorizer_full'])
+    normalizer = TextNormalizer(strip_datelines=True)
+    X_test, y_test = artifacts.split('data/processed/test_data.feather')
+
+    with perf.span('preprocess'):
+        delta_docs = normalizer.normalize_many(delta['content'].tolist())
+        test_docs = normalizer.normalize_many(X_test.tolist())
+    y_delta = delta['label'].to_numpy()
+    y_test = y_test.to_numpy()
+    with perf.span('predict'):
+        accuracy_before = float((model.predict(vectorizer.transform(test_docs)) == y_test).mean())
+
+    # Drift check: n-gram coverage of the delta vs. the held-out test split,
+    # over the vocabulary before feature selection (a hashing vectorizer is
+    # never pruned, and its coverage needs the up-to-date frequencies)
+    with perf.span('drift_check'):
+        df = document_frequencies(vectorizer, parent['n_docs'])
+        drift_vectorizer = full_vectorizer if hasattr(full_vectorizer, 'vocabulary_') else vectorizer
+        reference_coverage = known_coverage(drift_vectorizer, test_docs, df)
+        delta_coverage = known_coverage(drift_vectorizer, delta_docs, df)
+    coverage_drop = reference_coverage - delta_coverage
+    full_refit = coverage_drop > inc_params['max_coverage_drop']
+    logger.info(f"Coverage: test {reference_coverage:.4f}, delta {delta_coverage:.4f} (drop {coverage_drop:+.4f})")
+
+    if full_refit:
+        # The vocabulary moved too far: refit on the whole history plus the delta
+        logger.info("Coverage drop above max_coverage_drop: full refit")
+        X_train, y_train = artifacts.split(TRAIN_SPLIT)
+        history = [(X_train.tolist(), y_train.to_numpy())]
+        if earlier is not None:
+            history.append((earlier[0].tolist(), earlier[1].to_numpy()))
+        with perf.span('preprocess'):
+            docs = [doc for texts, _ in history for doc in normalizer.normalize_many(texts)] + delta_docs
+        y_all = np.concatenate([y for _, y in history] + [y_delta])
+        with perf.span('fit'):
+            model, vectorizer, full_vectorizer = refit(
+                model, lambda: build_vectorizer(params['feature_engineering']), docs, y_all,
+                params.get('feature_selection')
+            )
+        n_docs = train_rows = len(docs)
+    else:
+        # Exact document-frequency update, then a few SGD passes over the
+        # delta plus a replay sample of the history (SGD or logistic regression)
+        vectorizer, df, n_docs = update_vectorizer(vectorizer, delta_docs, df, parent['n_docs'])
+        n_train = len(artifacts.labels(TRAIN_SPLIT))
+        rng = np.random.default_rng(random_state)
+        rows = np.sort(rng.choice(n_train, min(inc_params['replay_size'], n_train), replace=False))
+        with perf.span('history'):
+            X_history, y_history = history_features(vectorizer, artifacts, normalizer, earlier, rows)
+        with perf.span('fit'):
+            X = stack([vectorizer.transform(delta_docs), X_history])
+            y = np.concatenate([y_delta, y_history])
+            model = continue_training(model, X, y, n_docs, sgd_epochs=inc_params['sgd_epochs'],
+                                      eta0=inc_params.get('eta0', 0.5), random_state=random_state)
+        train_rows = X.shape[0]
+
+    with perf.span('predict'):
+        accuracy = float((model.predict(vectorizer.transform(test_docs)) == y_test).mean())
+
+    # Every delta since the pipeline model travels with the version
+    if earlier is not None:
+        delta = pd.concat([pd.DataFrame({'content': earlier[0].to_numpy(), 'label': earlier[1].to_numpy()}),
+                           delta[['content', 'label']]], ignore_index=True)
+    lineage = {
+        "parent": parent['version'],
+        "mode": "full_refit" if full_refit else "incremental",
+        "base": parent['base'],
+        "n_docs": int(n_docs),
+        "delta_hash": delta_hash,
+        "delta_rows": len(delta)
+    }
+    summary = dict(
+        lineage,
+        reference_coverage=round(reference_coverage, 6),
+        delta_coverage=round(delta_coverage, 6),
+        train_rows=int(train_rows),
+        fit_s=round(perf.spans['fit']['total_s'], 3),
+        accuracy_before=accuracy_before,
+        accuracy=accuracy
+    )
+    with perf.span('publish'), tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {name: os.path.join(tmp_dir, name) for name in ('model.joblib', 'vectorizer.joblib', 'delta.feather',
+                                                                 'metrics.json', 'vectorizer_full.joblib')}
+        dump_pickle(model, paths['model.joblib'])
+        dump_pickle(vectorizer, paths['vectorizer.joblib'])
+        dump_pickle(full_vectorizer, paths['vectorizer_full.joblib'])
+        save_split(paths['delta.feather'], delta['content'], delta['label'])
+        with open(paths['metrics.json'], 'w') as f:
+            json.dump(summary, f, indent=2)
+        version, created = registry.publish(
+            paths['model.joblib'], paths['vectorizer.joblib'], paths['metrics.json'],
+            source={"stage": "incremental_update", "parent": parent['version']},
+            extra_files={'delta': paths['delta.feather'], 'vectorizer_full': paths['vectorizer_full.joblib']},
+            lineage=lineage
+        )
+    activated = inc_params.get('activate', True) and registry.activate(version)
+    removed = registry.prune(params['registry']['keep_versions'])
+
+    with open('metrics/incremental_update.json', 'w') as f:
+        json.dump(dict(summary, status="updated", version=version, created=created, activated=bool(activated),
+                       pruned=removed), f, indent=2)
+    perf.finish()
+
+    logger.info(f"Published {version} to {registry.root}{', activated' if activated else ''} "
+                f"({lineage['mode']}, {lineage['delta_rows']} delta rows). "
+                f"Accuracy: {accuracy_before:.4f} -> {accuracy:.4f}")
+
+if __name__ == "__main__":
+    update_model()
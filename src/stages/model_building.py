@@ -1,67 +1,117 @@
-import joblib
 import yaml
 import json
+import os
+import time
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, classification_report
 import logging
 
+from src.data.dedup import NearDuplicateIndex
+from src.evaluation.metrics import predict_counts
+from src.pipeline.artifacts import Artifacts
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.training.sgd_streaming import StreamingSGDTrainer, content_digests
+from src.utils.instrumentation import StageMonitor
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def train_model():
+def train_streaming(params, artifacts, perf):
+    """Out-of-core SGD over the entire raw corpus, excluding the test split's rows and their near-duplicates"""
+    sgd_params = params['model_building']['sgd']
+    raw_paths = ['data/raw/Fake.csv', 'data/raw/True.csv']
+    
+    # Batches go through the fitted vectorizer with the same preprocessing as feature_engineering
+    vectorizer = artifacts.load('data/processed/vectorizer.joblib')
+    normalizer = TextNormalizer(strip_datelines=True)
+    X_test = artifacts.texts('data/processed/test_data.feather')
+    test_digests = content_digests(X_test.tolist())
+    # The ingestion dedup index, narrowed to the test rows (row ids of the corpus)
+    near_duplicates = NearDuplicateIndex.load('data/processed/dedup_index.npz').subset(X_test.index.to_numpy())
+    fingerprint = artifacts.hash('data/processed/vectorizer.joblib') + artifacts.hash('data/processed/test_data.feather')
+    fingerprint += artifacts.hash('data/processed/dedup_index.npz')
+    fingerprint += ''.join(artifacts.hash(path) for path in raw_paths)
+    
+    trainer = StreamingSGDTrainer(vectorizer, normalizer, sgd_params, exclude=test_digests,
+                                  near_duplicates=near_duplicates, fingerprint=fingerprint)
+    model, stats = trainer.train(*raw_paths, monitor=perf)
+    logger.info(f"Streaming training finished: {stats}")
+    return model, stats
+
+def train_model(params=None, artifacts=None):
     """Train and evaluate the model"""
-    # Load parameters
-    with open('params.yaml', 'r') as f:
-        params = yaml.safe_load(f)
+    # Load parameters (the in-process pipeline executor passes them in)
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    artifacts = artifacts or Artifacts()
     
+    perf = StageMonitor.start('model_building', params)
     model_name = params['model_building']['model_name']
     solver = params['model_building']['solver']
     max_iter = params['model_building']['max_iter']
     
     logger.info(f"Training model: {model_name} with solver={solver}, max_iter={max_iter}")
     
-    # Load features
-    X_train_tfidf = joblib.load('data/processed/X_train_tfidf.joblib')
-    X_test_tfidf = joblib.load('data/processed/X_test_tfidf.joblib')
-    train_data = joblib.load('data/processed/train_data.joblib')
-    test_data = joblib.load('data/processed/test_data.joblib')
-    
-    y_train = train_data['y_train']
-    y_test = test_data['y_test']
+    # Map features (fails fast if they do not belong to the current vectorizer)
+    with perf.span('load'):
+        X_train_tfidf = artifacts.features('data/processed/X_train_tfidf', 'data/processed/vectorizer.joblib')
+        X_test_tfidf = artifacts.features('data/processed/X_test_tfidf', 'data/processed/vectorizer.joblib')
+        y_train = artifacts.labels('data/processed/train_data.feather')
+        y_test = artifacts.labels('data/processed/test_data.feather')
+    perf.matrix('X_train_tfidf', X_train_tfidf)
     
     # Train model
+    training_stats = {}
+    train_start = time.perf_counter()
     if model_name == "logistic_regression":
         model = LogisticRegression(
             solver=solver,
             max_iter=max_iter,
             random_state=42
         )
+        with perf.span('fit'):
+            model.fit(X_train_tfidf, y_train)
+    elif model_name == "sgd_streaming":
+        model, training_stats = train_streaming(params, artifacts, perf)
     else:
         raise ValueError(f"Unsupported model: {model_name}")
+    train_time_s = time.perf_counter() - train_start
     
-    model.fit(X_train_tfidf, y_train)
-    
-    # Evaluate model
-    y_pred = model.predict(X_test_tfidf)
-    accuracy = accuracy_score(y_test, y_pred)
+    # Evaluate model (the full evaluation is the evaluate_models stage)
+    with perf.span('predict'):
+        counts, predict_s = predict_counts(model, X_test_tfidf, y_test)
+    quality = counts.metrics()
     
     # Save metrics
     metrics = {
-        "accuracy": accuracy,
+        **quality,
+        "confusion_matrix": counts.counts.tolist(),
         "model": model_name,
         "parameters": {
             "solver": solver,
             "max_iter": max_iter
         }
     }
+    if model_name == "sgd_streaming":
+        sgd_params = params['model_building']['sgd']
+        metrics["parameters"] = {key: sgd_params[key] for key in ('loss', 'alpha', 'penalty', 'batch_size', 'epochs')}
+        metrics["training"] = training_stats
     
     with open('model/metrics.json', 'w') as f:
         json.dump(metrics, f, indent=2)
     
     # Save model
-    joblib.dump(model, 'model/lr_fake_news_model.joblib')
+    with perf.span('dump'):
+        artifacts.dump('model/lr_fake_news_model.joblib', model)
+    perf.log_metrics({
+        **quality,
+        "train_time_s": train_time_s,
+        "throughput_docs_s": len(y_test) / predict_s if predict_s else None,
+        "model_mb": os.path.getsize('model/lr_fake_news_model.joblib') / 1e6
+    })
+    perf.finish()
     
-    logger.info(f"Model training complete. Accuracy: {accuracy:.4f}")
+    logger.info(f"Model training complete. Accuracy: {quality['accuracy']:.4f}")
 
 if __name__ == "__main__":
     train_model()
\ No newline at end of file
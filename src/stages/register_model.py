@@ -0,0 +1,47 @@
+import json
+import yaml
+import logging
+
+from src.serving.registry import ModelRegistry
+from src.utils.instrumentation import StageMonitor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def register_model(params=None, artifacts=None):
+    """Publish the trained LR model and vectorizer as a registry version"""
+    # Publishing copies files, so there is nothing to take from artifacts
+    if params is None:
+        with open('params.yaml', 'r') as f:
+            params = yaml.safe_load(f)
+    
+    perf = StageMonitor.start('register_model', params)
+    registry_params = params['registry']
+    registry = ModelRegistry.from_params(registry_params)
+    
+    with perf.span('publish'):
+        version, created = registry.publish(
+            'model/lr_fake_news_model.joblib',
+            'data/processed/vectorizer.joblib',
+            'model/metrics.json'
+        )
+    # Serving processes watching the registry hot-swap to the new CURRENT
+    activated = registry_params.get('activate', True) and registry.activate(version)
+    removed = registry.prune(registry_params['keep_versions'])
+    
+    manifest = registry.manifest(version)
+    with open('model/registry.json', 'w') as f:
+        json.dump({
+            "version": version,
+            "fingerprint": manifest['fingerprint'],
+            "created": created,
+            "current": registry.current(),
+            "pruned": removed
+        }, f, indent=2)
+    perf.finish()
+    
+    status = "published" if created else "already registered"
+    logger.info(f"Model version {version} {status}{', activated' if activated else ''} in {registry.root}")
+
+if __name__ == "__main__":
+    register_model()
@@ -1,45 +1,49 @@
 #!/usr/bin/env python3
-import pandas as pd
-import joblib
 import argparse
+import json
 import sys
 import os
 import yaml
 from sklearn.model_selection import train_test_split
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Data ingestion for Random Forest')
-    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+from src.data.dedup import deduplicate
+from src.data.ingestion import CORPUS_PARAMS, load_labelled_corpus
+from src.pipeline.artifacts import Artifacts
+from src.utils.instrumentation import StageMonitor
+
+def ingest_rf_data(params, artifacts=None):
+    """Sample, deduplicate and split the raw corpus for the RF experiment"""
+    artifacts = artifacts or Artifacts()
+    rf_params = params['rf']
+    perf = StageMonitor.start('data_ingestion_rf', params)
     
-    args = parser.parse_args()
+    print("Loading data for Random Forest experiment...")
     
-    try:
-        # Load parameters
-        with open(args.params, 'r') as f:
-            params = yaml.safe_load(f)
-        
-        rf_params = params['rf']
-        
-        print("Loading data for Random Forest experiment...")
-        
-        # Load data with sampling
-        sample_size = rf_params['data']['sample_size_per_class']
-        df_fake = pd.read_csv('data/raw/Fake.csv').head(sample_size)
-        df_true = pd.read_csv('data/raw/True.csv').head(sample_size)
-        
-        # Add labels
-        df_fake['label'] = 0
-        df_true['label'] = 1
-        
-        # Combine and shuffle
-        df = pd.concat([df_fake, df_true], ignore_index=True)
-        df = df.sample(frac=1, random_state=rf_params['data']['random_state']).reset_index(drop=True)
-        
-        # Drop metadata to prevent leakage
-        df = df.drop(columns=['subject', 'date'], errors='ignore')
-        
-        # Combine title and text
-        df['content'] = df['title'] + ' ' + df['text']
+    # Load data with sampling. Only title/text are read, so the
+    # subject/date metadata never reaches the features (no leakage).
+    # Shared with the LR branch under the pipeline executor when the params match.
+    corpus_key = {key: rf_params['data'].get(key) for key in CORPUS_PARAMS}
+    with perf.span('load'):
+        df = artifacts.shared('corpus', corpus_key, lambda: load_labelled_corpus(rf_params['data']))
+    
+    # Collapse near-duplicate clusters before the split (no train/test leakage)
+    os.makedirs('data/processed/rf', exist_ok=True)
+    os.makedirs('metrics/rf', exist_ok=True)
+    with perf.span('dedup'):
+        keep, index, dedup_stats = artifacts.shared(
+            'dedup', [corpus_key, rf_params['data']['dedup']],
+            lambda: deduplicate(df['content'], df['label'], rf_params['data']['dedup'], row_ids=df.index)
+        )
+        df = df[keep]
+        index.save('data/processed/rf/dedup_index.npz')
+    with open('metrics/rf/dedup.json', 'w') as f:
+        json.dump(dedup_stats, f, indent=2)
+    perf.gauge('dedup_removed', dedup_stats['removed'])
+    print(f"Removed {dedup_stats['removed']} near-duplicates in {dedup_stats['duplicate_clusters']} clusters")
+    
+    with perf.span('split'):
+        # Shuffle, keeping the corpus row ids the dedup index refers to
+        df = df.sample(frac=1, random_state=rf_params['data']['random_state'])
         
         # Split data
         X = df['content']
@@ -51,27 +55,32 @@ if __name__ == "__main__":
             random_state=rf_params['data']['random_state'], 
             stratify=y
         )
+    
+    # Save train and test data
+    with perf.span('dump'):
+        artifacts.save_split('data/processed/rf/train_data.feather', X_train, y_train)
+        artifacts.save_split('data/processed/rf/test_data.feather', X_test, y_test)
+    perf.gauge('train_rows', len(X_train))
+    perf.gauge('test_rows', len(X_test))
+    perf.finish()
+    
+    print("RF Data ingestion completed!")
+    print(f"Training samples: {len(X_train)}")
+    print(f"Test samples: {len(X_test)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Data ingestion for Random Forest')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+    
+    args = parser.parse_args()
+    
+    try:
+        # Load parameters
+        with open(args.params, 'r') as f:
+            params = yaml.safe_load(f)
         
-        # Save train and test data
-        os.makedirs('data/processed/rf', exist_ok=True)
-        
-        train_data = {
-            'X_train': X_train,
-            'y_train': y_train
-        }
-        
-        test_data = {
-            'X_test': X_test,
-            'y_test': y_test
-        }
-        
-        joblib.dump(train_data, 'data/processed/rf/train_data.joblib')
-        joblib.dump(test_data, 'data/processed/rf/test_data.joblib')
-        
-        print("RF Data ingestion completed!")
-        print(f"Training samples: {len(X_train)}")
-        print(f"Test samples: {len(X_test)}")
+        ingest_rf_data(params)
         
     except Exception as e:
         print(f"Error in RF data ingestion: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+import json
+import joblib
+import argparse
+import sys
+import os
+import time
+import yaml
+import numpy as np
+
+from src.pipeline.artifacts import Artifacts
+from src.serving.forest import FlatForest, export_forest
+from src.utils.instrumentation import StageMonitor
+
+def time_batches(predict_proba, X, batch_size):
+    """Median per-batch predict_proba latency in milliseconds"""
+    latencies = []
+    for start in range(0, X.shape[0], batch_size):
+        batch = X[start:start + batch_size]
+        begin = time.perf_counter()
+        predict_proba(batch)
+        latencies.append((time.perf_counter() - begin) * 1000)
+    return float(np.median(latencies))
+
+def export_rf_model(params, artifacts=None):
+    """Flatten the RF model into node arrays and check it against sklearn"""
+    artifacts = artifacts or Artifacts()
+    export_params = params['rf']['export']
+    perf = StageMonitor.start('export_rf_model', params)
+
+    model_path = 'models/rf/rf_fake_news_model.joblib'
+    forest_path = 'models/rf/rf_forest.npz'
+
+    # Always a real load from disk: its time is compared with the flat forest's
+    start = time.perf_counter()
+    rf_model = joblib.load(model_path)
+    sklearn_load_ms = (time.perf_counter() - start) * 1000
+    X_test_tfidf = artifacts.features('data/features/rf/X_test_tfidf', 'data/features/rf/vectorizer.joblib')
+
+    print("Flattening Random Forest...")
+    with perf.span('dump'):
+        n_columns = export_forest(rf_model, forest_path)
+
+    start = time.perf_counter()
+    forest = FlatForest(forest_path, rows_per_chunk=export_params['rows_per_chunk'])
+    flat_load_ms = (time.perf_counter() - start) * 1000
+
+    # The flat forest must reproduce sklearn's predictions exactly
+    with perf.span('predict'):
+        expected = rf_model.predict_proba(X_test_tfidf)
+        actual = forest.predict_proba(X_test_tfidf)
+    mismatches = int((rf_model.classes_.take(expected.argmax(axis=1)) != forest.classes_.take(actual.argmax(axis=1))).sum())
+    max_diff = float(np.abs(expected - actual).max()) if len(actual) else 0.0
+    if mismatches:
+        raise ValueError(f"Flat forest disagrees with sklearn on {mismatches} test rows")
+
+    batch_size = export_params['batch_size']
+    metrics = {
+        "used_features": n_columns,
+        "total_features": int(rf_model.n_features_in_),
+        "nodes": forest.n_nodes,
+        "sklearn_model_mb": round(os.path.getsize(model_path) / 1e6, 3),
+        "flat_model_mb": round(os.path.getsize(forest_path) / 1e6, 3),
+        "sklearn_load_ms": round(sklearn_load_ms, 2),
+        "flat_load_ms": round(flat_load_ms, 2),
+        "sklearn_batch_ms": round(time_batches(rf_model.predict_proba, X_test_tfidf, batch_size), 3),
+        "flat_batch_ms": round(time_batches(forest.predict_proba, X_test_tfidf, batch_size), 3),
+        "batch_size": batch_size,
+        "prediction_mismatches": mismatches,
+        "max_proba_diff": max_diff
+    }
+
+    os.makedirs('metrics/rf', exist_ok=True)
+    with open('metrics/rf/export_metrics.json', 'w') as f:
+        json.dump(metrics, f, indent=2)
+    perf.log_metrics({name: metrics[name] for name in ('flat_model_mb', 'flat_load_ms', 'flat_batch_ms', 'sklearn_batch_ms')})
+    perf.finish()
+
+    print("RF Model export completed!")
+    print(f"Features used by the trees: {n_columns}/{metrics['total_features']}")
+    print(f"Model size: {metrics['sklearn_model_mb']} MB -> {metrics['flat_model_mb']} MB")
+    print(f"Load time: {metrics['sklearn_load_ms']} ms -> {metrics['flat_load_ms']} ms")
+    print(f"Batch latency ({batch_size} rows): {metrics['sklearn_batch_ms']} ms -> {metrics['flat_batch_ms']} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export Random Forest as flat node arrays')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+
+    args = parser.parse_args()
+
+    try:
+        # Load parameters
+        with open(args.params, 'r') as f:
+            params = yaml.safe_load(f)
+
+        export_rf_model(params)
+
+    except Exception as e:
+        print(f"Error in RF model export: {e}")
+        sys.exit(1)
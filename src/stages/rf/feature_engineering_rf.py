@@ -1,24 +1,77 @@
 #!/usr/bin/env python3
-import pandas as pd
-import re
-import nltk
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
-import joblib
 import argparse
 import sys
 import os
 import yaml
 
-def preprocess_text(text, stop_words):
-    """Clean the text: remove non-alphanumeric, lowercase, and remove stopwords."""
-    if isinstance(text, str):
-        # Remove non-alphanumeric characters (keep spaces)
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        text = text.lower()
-        # Remove stopwords and join
-        text = ' '.join([word for word in text.split() if word not in stop_words])
-    return text
+from src.features.feature_cache import FeatureCache
+from src.features.vectorizers import build_vectorizer
+from src.pipeline.artifacts import Artifacts
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.utils.instrumentation import StageMonitor
+
+def engineer_rf_features(params, artifacts=None):
+    """Fit the RF TF-IDF vectorizer on the train split and featurize both splits"""
+    artifacts = artifacts or Artifacts()
+    rf_params = params['rf']
+    perf = StageMonitor.start('feature_engineering_rf', params)
+    
+    # RF variant: no dateline stripping
+    normalizer = TextNormalizer(
+        strip_datelines=False,
+        language=rf_params['featurize']['stop_words']
+    )
+    
+    # Identical inputs + featurization params: reuse a previous run's outputs
+    split_paths = ['data/processed/rf/train_data.feather', 'data/processed/rf/test_data.feather']
+    outputs = {
+        'vectorizer.joblib': 'data/features/rf/vectorizer_full.joblib',
+        'X_train_tfidf': 'data/features/rf/X_train_full',
+        'X_test_tfidf': 'data/features/rf/X_test_full'
+    }
+    cache = FeatureCache.from_params(params.get('feature_cache'))
+    if cache:
+        cache_key = cache.make_key(split_paths, 'rf', rf_params['featurize'])
+        with perf.span('cache_restore'):
+            hit = cache.restore(cache_key, outputs)
+        if hit:
+            perf.gauge('cache_hit', 1)
+            perf.finish()
+            print("RF Feature engineering completed (restored from feature cache)!")
+            return
+    
+    # Load train and test text
+    with perf.span('load'):
+        X_train = artifacts.texts('data/processed/rf/train_data.feather')
+        X_test = artifacts.texts('data/processed/rf/test_data.feather')
+    
+    # Create TF-IDF features (text is normalized in the vectorizer's workers)
+    print("Creating TF-IDF features for RF...")
+    vectorizer = build_vectorizer(rf_params['featurize'])
+    
+    with perf.span('fit'):
+        X_train_tfidf = vectorizer.fit_transform(X_train, normalizer=normalizer)
+    with perf.span('transform'):
+        X_test_tfidf = vectorizer.transform(X_test, normalizer=normalizer)
+    perf.matrix('X_train_tfidf', X_train_tfidf)
+    perf.matrix('X_test_tfidf', X_test_tfidf)
+    
+    # Save features and vectorizer
+    os.makedirs('data/features/rf', exist_ok=True)
+    
+    with perf.span('dump'):
+        artifacts.dump('data/features/rf/vectorizer_full.joblib', vectorizer)
+        artifacts.save_features('data/features/rf/X_train_full', X_train_tfidf, 'data/features/rf/vectorizer_full.joblib')
+        artifacts.save_features('data/features/rf/X_test_full', X_test_tfidf, 'data/features/rf/vectorizer_full.joblib')
+    if cache:
+        with perf.span('cache_store'):
+            cache.store(cache_key, outputs)
+    perf.gauge('cache_hit', 0)
+    perf.finish()
+    
+    print("RF Feature engineering completed!")
+    print(f"Training features shape: {X_train_tfidf.shape}")
+    print(f"Test features shape: {X_test_tfidf.shape}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Feature engineering for Random Forest')
@@ -31,50 +84,8 @@ if __name__ == "__main__":
         with open(args.params, 'r') as f:
             params = yaml.safe_load(f)
         
-        rf_params = params['rf']
-        
-        # Download stopwords if needed
-        try:
-            stop_words = set(stopwords.words(rf_params['featurize']['stop_words']))
-        except LookupError:
-            nltk.download('stopwords')
-            stop_words = set(stopwords.words(rf_params['featurize']['stop_words']))
-        
-        # Load train and test data
-        train_data = joblib.load('data/processed/rf/train_data.joblib')
-        test_data = joblib.load('data/processed/rf/test_data.joblib')
-        
-        X_train = train_data['X_train']
-        y_train = train_data['y_train']
-        X_test = test_data['X_test']
-        y_test = test_data['y_test']
-        
-        # Preprocess text
-        print("Preprocessing text for RF...")
-        X_train_processed = X_train.apply(lambda x: preprocess_text(x, stop_words))
-        X_test_processed = X_test.apply(lambda x: preprocess_text(x, stop_words))
-        
-        # Create TF-IDF features
-        print("Creating TF-IDF features for RF...")
-        vectorizer = TfidfVectorizer(
-            max_features=rf_params['featurize']['max_features'],
-            ngram_range=tuple(rf_params['featurize']['ngram_range'])
-        )
-        
-        X_train_tfidf = vectorizer.fit_transform(X_train_processed)
-        X_test_tfidf = vectorizer.transform(X_test_processed)
-        
-        # Save features and vectorizer
-        os.makedirs('data/features/rf', exist_ok=True)
-        
-        joblib.dump(X_train_tfidf, 'data/features/rf/X_train_tfidf.joblib')
-        joblib.dump(X_test_tfidf, 'data/features/rf/X_test_tfidf.joblib')
-        joblib.dump(vectorizer, 'data/features/rf/vectorizer.joblib')
-        
-        print("RF Feature engineering completed!")
-        print(f"Training features shape: {X_train_tfidf.shape}")
-        print(f"Test features shape: {X_test_tfidf.shape}")
+        engineer_rf_features(params)
         
     except Exception as e:
         print(f"Error in RF feature engineering: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import yaml
+
+from src.features.selection import select_features
+from src.pipeline.artifacts import Artifacts
+from src.utils.instrumentation import StageMonitor
+
+def select_rf_features(params, artifacts=None):
+    """Keep the top-k RF features and prune the vectorizer to them"""
+    artifacts = artifacts or Artifacts()
+    select_params = params['rf'].get('select') or {}
+    perf = StageMonitor.start('feature_selection_rf', params)
+    
+    # Load the full feature matrices
+    with perf.span('load'):
+        vectorizer = artifacts.load('data/features/rf/vectorizer_full.joblib')
+        X_train = artifacts.features('data/features/rf/X_train_full', 'data/features/rf/vectorizer_full.joblib')
+        X_test = artifacts.features('data/features/rf/X_test_full', 'data/features/rf/vectorizer_full.joblib')
+        y_train = artifacts.labels('data/processed/rf/train_data.feather')
+    n_features = X_train.shape[1]
+    
+    # Rank features and prune the vectorizer to the top k
+    print(f"Selecting RF features ({select_params.get('method') or 'none'}, k={select_params.get('k')})...")
+    with perf.span('select'):
+        vectorizer, X_train, (X_test,), columns = select_features(
+            vectorizer, X_train, y_train, select_params, [X_test]
+        )
+    perf.matrix('X_train_tfidf', X_train)
+    perf.matrix('X_test_tfidf', X_test)
+    perf.gauge('n_features', X_train.shape[1])
+    
+    # Save the selected features and the pruned vectorizer
+    with perf.span('dump'):
+        artifacts.dump('data/features/rf/vectorizer.joblib', vectorizer)
+        artifacts.save_features('data/features/rf/X_train_tfidf', X_train, 'data/features/rf/vectorizer.joblib')
+        artifacts.save_features('data/features/rf/X_test_tfidf', X_test, 'data/features/rf/vectorizer.joblib')
+    perf.finish()
+    
+    print("RF Feature selection completed!")
+    print(f"Kept {X_train.shape[1]}/{n_features} features")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Select the top-k RF features')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+    
+    args = parser.parse_args()
+    
+    try:
+        # Load parameters
+        with open(args.params, 'r') as f:
+            params = yaml.safe_load(f)
+        
+        select_rf_features(params)
+        
+    except Exception as e:
+        print(f"Error in RF feature selection: {e}")
+        sys.exit(1)
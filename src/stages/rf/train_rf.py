@@ -1,11 +1,56 @@
 #!/usr/bin/env python3
 from sklearn.ensemble import RandomForestClassifier
-import joblib
 import argparse
 import sys
 import os
+import time
 import yaml
 
+from src.pipeline.artifacts import Artifacts
+from src.utils.instrumentation import StageMonitor
+
+def train_rf_model(params, artifacts=None):
+    """Train the Random Forest on the selected RF features"""
+    artifacts = artifacts or Artifacts()
+    rf_params = params['rf']
+    perf = StageMonitor.start('train_rf_model', params)
+    
+    # Load training features
+    with perf.span('load'):
+        X_train_tfidf = artifacts.features('data/features/rf/X_train_tfidf', 'data/features/rf/vectorizer.joblib')
+        y_train = artifacts.labels('data/processed/rf/train_data.feather')
+    perf.matrix('X_train_tfidf', X_train_tfidf)
+    
+    # Train Random Forest model
+    print("Training Random Forest model...")
+    rf_model = RandomForestClassifier(
+        n_estimators=rf_params['train']['n_estimators'],
+        max_depth=rf_params['train']['max_depth'],
+        min_samples_split=rf_params['train']['min_samples_split'],
+        min_samples_leaf=rf_params['train']['min_samples_leaf'],
+        random_state=rf_params['train']['random_state'],
+        n_jobs=rf_params['train']['n_jobs']
+    )
+    
+    start = time.perf_counter()
+    with perf.span('fit'):
+        rf_model.fit(X_train_tfidf, y_train)
+    train_time_s = time.perf_counter() - start
+    
+    # Save model
+    os.makedirs('models/rf', exist_ok=True)
+    with perf.span('dump'):
+        artifacts.dump('models/rf/rf_fake_news_model.joblib', rf_model)
+    perf.gauge('total_nodes', int(sum(tree.tree_.node_count for tree in rf_model.estimators_)))
+    perf.log_metrics({
+        "train_time_s": train_time_s,
+        "model_mb": os.path.getsize('models/rf/rf_fake_news_model.joblib') / 1e6
+    })
+    perf.finish()
+    
+    print("RF Model training completed!")
+    print(f"Model saved to: models/rf/rf_fake_news_model.joblib")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Train Random Forest model')
     parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
@@ -17,33 +62,8 @@ if __name__ == "__main__":
         with open(args.params, 'r') as f:
             params = yaml.safe_load(f)
         
-        rf_params = params['rf']
-        
-        # Load training features
-        X_train_tfidf = joblib.load('data/features/rf/X_train_tfidf.joblib')
-        train_data = joblib.load('data/processed/rf/train_data.joblib')
-        y_train = train_data['y_train']
-        
-        # Train Random Forest model
-        print("Training Random Forest model...")
-        rf_model = RandomForestClassifier(
-            n_estimators=rf_params['train']['n_estimators'],
-            max_depth=rf_params['train']['max_depth'],
-            min_samples_split=rf_params['train']['min_samples_split'],
-            min_samples_leaf=rf_params['train']['min_samples_leaf'],
-            random_state=rf_params['train']['random_state'],
-            n_jobs=rf_params['train']['n_jobs']
-        )
-        
-        rf_model.fit(X_train_tfidf, y_train)
-        
-        # Save model
-        os.makedirs('models/rf', exist_ok=True)
-        joblib.dump(rf_model, 'models/rf/rf_fake_news_model.joblib')
-        
-        print("RF Model training completed!")
-        print(f"Model saved to: models/rf/rf_fake_news_model.joblib")
+        train_rf_model(params)
         
     except Exception as e:
         print(f"Error in RF model training: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,279 @@
+import logging
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import joblib
+import pandas as pd
+
+from src.data.split_store import load_labels, load_texts
+from src.features.feature_cache import featurization_key
+from src.features.feature_store import load_features, save_features
+from src.features.selection import select_features
+from src.features.vectorizers import build_vectorizer
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.sweep.space import FAMILIES, apply_overrides, expand, get_path, trial_id, validate_space
+from src.tracking.metrics_store import family_params, model_name
+from src.utils.hashing import artifact_hash
+from src.utils.parallel import resolve_n_jobs
+
+logger = logging.getLogger(__name__)
+
+# Existing train/test splits per family (written by the DVC ingestion stages)
+SPLITS = {
+    'lr': ('data/processed/train_data.feather', 'data/processed/test_data.feather'),
+    'rf': ('data/processed/rf/train_data.feather', 'data/processed/rf/test_data.feather')
+}
+# Feature cache variants, as used by the two feature engineering stages
+VARIANTS = {'lr': 'lr-english', 'rf': 'rf'}
+METRIC_COLUMNS = ['accuracy', 'precision_fake', 'recall_fake', 'f1_fake', 'precision_true', 'recall_true', 'f1_true']
+
+
+def build_normalizer(family, featurize_params):
+    if family == 'lr':
+        return TextNormalizer(strip_datelines=True)
+    return TextNormalizer(strip_datelines=False, language=featurize_params['stop_words'])
+
+
+def build_model(family, train_params, n_jobs=1):
+    """Unfitted classifier for a trial, configured like model_building / train_rf"""
+    if family == 'lr':
+        model_name = train_params.get('model_name', 'logistic_regression')
+        if model_name != 'logistic_regression':
+            # sgd_streaming trains on the raw corpus, not on shared feature matrices
+            raise ValueError(f"Sweeps support model_name 'logistic_regression' only, got {model_name!r}")
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(solver=train_params['solver'], max_iter=train_params['max_iter'], random_state=42)
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(
+        n_estimators=train_params['n_estimators'],
+        max_depth=train_params['max_depth'],
+        min_samples_split=train_params['min_samples_split'],
+        min_samples_leaf=train_params['min_samples_leaf'],
+        random_state=train_params['random_state'],
+        n_jobs=n_jobs
+    )
+
+
+def features_key(family, featurize_params, select_params=None):
+    """Feature cache key of a featurize config, plus the feature selection applied to it"""
+    if select_params and select_params.get('method') and select_params.get('k'):
+        featurize_params = dict(featurize_params, select=select_params)
+    return featurization_key(SPLITS[family], VARIANTS[family], featurize_params)
+
+
+class SharedFeatures:
+    """Featurizes each unique featurize config once into work_dir/features/<key>.
+
+    Matrices are written with save_features, so trainer processes memory-map
+    them instead of receiving copies. Directories are keyed on the feature
+    cache key and reused by later sweeps over the same splits and code.
+    Selected features get their own directory, derived from the full one, so
+    sweeping the selection does not repeat the featurization.
+    """
+
+    def __init__(self, work_dir):
+        self.root = os.path.join(work_dir, 'features')
+        self._normalized = {}
+
+    def _normalize(self, family, featurize_params):
+        # Featurize configs of a family share normalized text unless the stop words differ
+        normalizer = build_normalizer(family, featurize_params)
+        cache_key = (family, normalizer.strip_datelines, normalizer.stop_words)
+        if cache_key not in self._normalized:
+            n_jobs = featurize_params.get('n_jobs', 1)
+            self._normalized[cache_key] = [
+                normalizer.normalize_many(load_texts(path), n_jobs=n_jobs) for path in SPLITS[family]
+            ]
+        return self._normalized[cache_key]
+
+    def get(self, family, featurize_params, select_params=None):
+        """Directory holding vectorizer.joblib, X_train_tfidf and X_test_tfidf; returns (key, dir, seconds)"""
+        start = time.perf_counter()
+        key, directory = self._featurize(family, featurize_params)
+        selected_key = features_key(family, featurize_params, select_params)
+        if selected_key != key:
+            selected_dir = os.path.join(self.root, selected_key[:16])
+            if not os.path.exists(os.path.join(selected_dir, 'X_test_tfidf')):
+                vectorizer_hash = artifact_hash(os.path.join(directory, 'vectorizer.joblib'))
+                vectorizer, X_train, (X_test,), columns = select_features(
+                    joblib.load(os.path.join(directory, 'vectorizer.joblib')),
+                    load_features(os.path.join(directory, 'X_train_tfidf'), vectorizer_hash),
+                    load_labels(SPLITS[family][0]),
+                    select_params,
+                    [load_features(os.path.join(directory, 'X_test_tfidf'), vectorizer_hash)]
+                )
+                if columns is None:
+                    # k covers every column: the full features are the selected ones
+                    return key, directory, time.perf_counter() - start
+                self._write(selected_dir, vectorizer, X_train, X_test)
+            key, directory = selected_key, selected_dir
+        return key, directory, time.perf_counter() - start
+
+    def _featurize(self, family, featurize_params):
+        key = featurization_key(SPLITS[family], VARIANTS[family], featurize_params)
+        directory = os.path.join(self.root, key[:16])
+        if not os.path.exists(os.path.join(directory, 'X_test_tfidf')):
+            train_docs, test_docs = self._normalize(family, featurize_params)
+            vectorizer = build_vectorizer(featurize_params)
+            X_train = vectorizer.fit_transform(train_docs)
+            X_test = vectorizer.transform(test_docs)
+            self._write(directory, vectorizer, X_train, X_test)
+        return key, directory
+
+    def _write(self, directory, vectorizer, X_train, X_test):
+        # Written to a temp dir and renamed, so an interrupted sweep leaves no partial entry
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = os.path.join(self.root, f'.tmp-{uuid.uuid4().hex}')
+        try:
+            os.makedirs(tmp_dir)
+            joblib.dump(vectorizer, os.path.join(tmp_dir, 'vectorizer.joblib'))
+            vectorizer_hash = artifact_hash(os.path.join(tmp_dir, 'vectorizer.joblib'))
+            save_features(os.path.join(tmp_dir, 'X_train_tfidf'), X_train, vectorizer_hash)
+            save_features(os.path.join(tmp_dir, 'X_test_tfidf'), X_test, vectorizer_hash)
+            os.rename(tmp_dir, directory)
+        except OSError:
+            # A concurrent sweep may have published the same features first
+            if not os.path.exists(directory):
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def run_trial(task):
+    """Fit and evaluate one trial on memory-mapped shared features (runs in a worker process)"""
+    from src.evaluation.metrics import classification_metrics
+
+    row = {"trial": task['trial'], "model": task['family'], "status": "ok"}
+    try:
+        features_dir = task['features_dir']
+        vectorizer_hash = artifact_hash(os.path.join(features_dir, 'vectorizer.joblib'))
+        X_train = load_features(os.path.join(features_dir, 'X_train_tfidf'), vectorizer_hash)
+        X_test = load_features(os.path.join(features_dir, 'X_test_tfidf'), vectorizer_hash)
+        train_split, test_split = SPLITS[task['family']]
+        y_train = load_labels(train_split)
+        y_test = load_labels(test_split)
+
+        model = build_model(task['family'], task['train_params'], task['n_jobs'])
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        row['fit_s'] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        row['predict_s'] = round(time.perf_counter() - start, 3)
+
+        row.update(classification_metrics(y_test, y_pred, task['target_names']))
+        row['n_features'] = int(X_train.shape[1])
+        row['train_rows'] = int(X_train.shape[0])
+        row['test_rows'] = int(X_test.shape[0])
+    except Exception as e:
+        row['status'] = 'failed'
+        row['error'] = f'{type(e).__name__}: {e}'
+    return row
+
+
+def plan_trials(params):
+    """All trials of the sweep, as dicts with family, overrides and merged params"""
+    sweep_params = params['sweep']
+    trials = []
+    for family, space in (sweep_params.get('space') or {}).items():
+        space = space or {}
+        validate_space(family, space)
+        for overrides in expand(space, sweep_params.get('strategy', 'grid'), sweep_params.get('n_trials'),
+                                sweep_params.get('seed', 42)):
+            trial_params = apply_overrides(params, overrides)
+            trials.append({
+                "trial": trial_id(family, overrides),
+                "family": family,
+                "overrides": overrides,
+                "params": trial_params,
+                "featurize_params": get_path(trial_params, FAMILIES[family]['featurize']),
+                "select_params": get_path(trial_params, FAMILIES[family]['select']),
+                "train_params": get_path(trial_params, FAMILIES[family]['train'])
+            })
+    return trials
+
+
+def record_trial(store, trial, row):
+    """Append a finished trial to the metrics store as experiment sweep-<trial id>"""
+    family = trial['family']
+    metrics = {name: row[name] for name in METRIC_COLUMNS}
+    metrics['train_time_s'] = row['fit_s']
+    metrics['throughput_docs_s'] = row['test_rows'] / row['predict_s'] if row['predict_s'] else None
+    try:
+        store.record('sweep', model_name(family, trial['params']), family_params(family, trial['params']), metrics,
+                     experiment=f"sweep-{trial['trial']}")
+    except Exception as e:
+        logger.warning(f"Could not record trial {trial['trial']} in the metrics store: {e}")
+
+
+def run_sweep(params, work_dir=None, n_jobs=None, store=None):
+    """Run every trial of params['sweep']; returns the results table (best accuracy first).
+
+    Successful trials are also appended to store (a MetricsStore), if given.
+    """
+    sweep_params = params['sweep']
+    work_dir = work_dir or sweep_params.get('work_dir', 'sweeps')
+    workers = resolve_n_jobs(n_jobs if n_jobs is not None else sweep_params.get('n_jobs', -1))
+    target_names = params['rf']['evaluate']['target_names']
+    for family in sweep_params.get('space') or {}:
+        missing = [path for path in SPLITS.get(family, ()) if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Missing {', '.join(missing)}; run the {family} ingestion stage first")
+
+    # Group trials by featurization so each matrix is built once, then hand the
+    # group to the trainer pool while the next featurization runs
+    trials = plan_trials(params)
+    groups = {}
+    for trial in trials:
+        key = features_key(trial['family'], trial['featurize_params'], trial['select_params'])
+        groups.setdefault(key, []).append(trial)
+    logger.info(f"Sweep: {len(trials)} trials, {len(groups)} featurizations, {workers} trainer processes")
+
+    features = SharedFeatures(work_dir)
+    rows, futures = [], {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for group in groups.values():
+            family = group[0]['family']
+            key, features_dir, featurize_s = features.get(family, group[0]['featurize_params'],
+                                                          group[0]['select_params'])
+            logger.info(f"Features {key[:12]} ({family}) ready in {featurize_s:.1f}s: {len(group)} trials")
+            for trial in group:
+                task = {
+                    "trial": trial['trial'],
+                    "family": family,
+                    "train_params": trial['train_params'],
+                    "features_dir": features_dir,
+                    "n_jobs": sweep_params.get('trial_n_jobs', 1),
+                    "target_names": target_names
+                }
+                futures[executor.submit(run_trial, task)] = (trial, key, featurize_s)
+                # Only the first trial of a group is charged the featurization
+                featurize_s = 0.0
+
+        for future in as_completed(futures):
+            trial, key, featurize_s = futures[future]
+            row = future.result()
+            row['featurize_key'] = key[:12]
+            row['featurize_s'] = round(featurize_s, 3)
+            row.update(trial['overrides'])
+            rows.append(row)
+            if store is not None and row['status'] == 'ok':
+                record_trial(store, trial, row)
+            logger.info(f"Trial {row['trial']} ({row['model']}) {row['status']}: accuracy={row.get('accuracy')}")
+
+    return results_table(rows)
+
+
+def results_table(rows):
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    for column in METRIC_COLUMNS + ['fit_s', 'predict_s']:
+        if column not in table:
+            table[column] = float('nan')
+    # Lists (e.g. ngram_range) are stored as text so the table round-trips through CSV
+    for column in table.columns:
+        table[column] = table[column].map(lambda value: str(value) if isinstance(value, (list, tuple)) else value)
+    return table.sort_values(['accuracy', 'trial'], ascending=[False, True], na_position='last').reset_index(drop=True)
@@ -0,0 +1,87 @@
+import copy
+import hashlib
+import itertools
+import json
+import numpy as np
+
+# A search space maps a model family to {dotted param path: [candidate values]}.
+# Featurization (and feature selection) params are part of the space, so
+# trials that only differ in model params share one feature matrix.
+FAMILIES = {
+    'lr': {
+        'featurize': 'feature_engineering',
+        'select': 'feature_selection',
+        'train': 'model_building'
+    },
+    'rf': {
+        'featurize': 'rf.featurize',
+        'select': 'rf.select',
+        'train': 'rf.train'
+    }
+}
+
+
+def get_path(params, path):
+    node = params
+    for key in path.split('.'):
+        node = node[key]
+    return node
+
+
+def set_path(params, path, value):
+    *parents, last = path.split('.')
+    node = params
+    for key in parents:
+        node = node.setdefault(key, {})
+    node[last] = value
+
+
+def validate_space(family, space):
+    """Raise ValueError for unknown families or paths outside the family's featurize/select/train blocks"""
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown model family {family!r}; expected one of {sorted(FAMILIES)}")
+    prefixes = tuple(f'{block}.' for block in FAMILIES[family].values())
+    for path, values in space.items():
+        if not path.startswith(prefixes):
+            raise ValueError(f"Sweep param {path!r} is outside {', '.join(p.rstrip('.') for p in prefixes)}")
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Sweep param {path!r} needs a non-empty list of values")
+
+
+def grid_size(space):
+    return int(np.prod([len(values) for values in space.values()])) if space else 1
+
+
+def expand(space, strategy='grid', n_trials=None, seed=42):
+    """Override dicts for a search space: every combination, or n_trials distinct random ones"""
+    paths = sorted(space)
+    size = grid_size(space)
+    if strategy == 'grid' or n_trials is None or n_trials >= size:
+        combos = itertools.product(*(space[path] for path in paths))
+        return [dict(zip(paths, combo)) for combo in combos]
+    if strategy != 'random':
+        raise ValueError(f"Unknown sweep strategy {strategy!r}; expected 'grid' or 'random'")
+
+    # Sample combination numbers without replacement, then decode them digit by digit
+    rng = np.random.default_rng(seed)
+    overrides = []
+    for number in sorted(rng.choice(size, n_trials, replace=False)):
+        number = int(number)
+        combo = {}
+        for path in reversed(paths):
+            number, digit = divmod(number, len(space[path]))
+            combo[path] = space[path][digit]
+        overrides.append({path: combo[path] for path in paths})
+    return overrides
+
+
+def apply_overrides(params, overrides):
+    params = copy.deepcopy(params)
+    for path, value in overrides.items():
+        set_path(params, path, value)
+    return params
+
+
+def trial_id(family, overrides):
+    payload = json.dumps([family, overrides], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:10]
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+# Append-only experiment metrics store in one SQLite file. Every stage run
+# (and every sweep trial) adds a row to `runs` and its metrics to `metrics`;
+# rows are never updated. Runs are indexed by experiment id, model, params
+# hash and time, so leaderboards over hundreds of runs are single queries.
+DEFAULT_PATH = '~/.cache/fake_news_mlops/experiments.sqlite'
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    experiment TEXT NOT NULL,
+    model TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    git_rev TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_experiment ON runs (experiment);
+CREATE INDEX IF NOT EXISTS runs_model ON runs (model);
+CREATE INDEX IF NOT EXISTS runs_params_hash ON runs (params_hash);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_name ON metrics (name, value);
+"""
+
+# Params blocks that define each model family's results
+FAMILY_PARAMS = {
+    'lr': ('data_ingestion', 'feature_engineering', 'feature_selection', 'model_building'),
+    'rf': ('rf',),
+    'cascade': ('data_ingestion', 'feature_engineering', 'feature_selection', 'model_building', 'rf', 'cascade')
+}
+STAGE_FAMILIES = {
+    'data_ingestion': 'lr',
+    'feature_engineering': 'lr',
+    'feature_selection': 'lr',
+    'model_building': 'lr',
+    'export_bundle': 'lr',
+    'incremental_update': 'lr',
+    'register_model': 'lr',
+    'data_ingestion_rf': 'rf',
+    'feature_engineering_rf': 'rf',
+    'feature_selection_rf': 'rf',
+    'train_rf_model': 'rf',
+    'evaluate_rf_model': 'rf',
+    'export_rf_model': 'rf',
+    'calibrate_cascade': 'cascade'
+}
+# Params that change how work is scheduled, not its results
+SCHEDULING_PARAMS = {'n_jobs', 'chunk_size'}
+
+
+def experiment_id(configured=None):
+    """Configured id, else the DVC experiment name, else "workspace" """
+    return configured or os.environ.get('DVC_EXP_NAME') or 'workspace'
+
+
+def model_name(family, params):
+    if family == 'lr':
+        return params['model_building']['model_name']
+    if family == 'rf':
+        return 'random_forest'
+    if family == 'cascade':
+        return 'lr_rf_cascade'
+    return 'pipeline'
+
+
+def _without_scheduling(value):
+    if isinstance(value, dict):
+        return {k: _without_scheduling(v) for k, v in value.items() if k not in SCHEDULING_PARAMS}
+    return value
+
+
+def family_params(family, params):
+    """The params blocks of a family (all params for unknown families)"""
+    blocks = FAMILY_PARAMS.get(family)
+    selected = {block: params.get(block) for block in blocks} if blocks else params
+    return _without_scheduling(selected)
+
+
+def params_hash(params):
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class MetricsStore:
+    """SQLite-backed, append-only store of experiment runs and their metrics"""
+
+    def __init__(self, path=DEFAULT_PATH, experiment=None):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.experiment = experiment_id(experiment)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+            db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    @classmethod
+    def from_params(cls, store_params):
+        """Build the store from the metrics_store params block, or None if disabled"""
+        if not store_params or not store_params.get('enabled', False):
+            return None
+        return cls(store_params.get('path', DEFAULT_PATH), store_params.get('experiment'))
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits on success, rolls back on error and is always closed"""
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            # WAL lets parallel experiment workers append while a leaderboard reads
+            db.execute('PRAGMA journal_mode=WAL')
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record(self, stage, model, params, metrics, experiment=None):
+        """Append one run; params are the (family) params it ran with. Returns the run id"""
+        run_id = uuid.uuid4().hex
+        rows = [
+            (run_id, name, float(value)) for name, value in metrics.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        with self._connect() as db:
+            db.execute(
+                'INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (run_id, experiment or self.experiment, model, stage, params_hash(params),
+                 json.dumps(params, sort_keys=True, default=str), os.environ.get('DVC_EXP_BASELINE_REV'), time.time())
+            )
+            db.executemany('INSERT INTO metrics VALUES (?, ?, ?)', rows)
+        return run_id
+
+    def record_stage(self, stage, params, metrics):
+        """Append a pipeline stage run, filed under its model family's params"""
+        family = STAGE_FAMILIES.get(stage)
+        selected = family_params(family, params)
+        return self.record(stage, model_name(family, params), selected, metrics)
+
+    def latest_metrics(self, names=None, model=None, experiment=None, since=None):
+        """Latest value of each metric per (experiment, model, params_hash), as rows of dicts"""
+        where, args = [], []
+        if names:
+            where.append(f"m.name IN ({', '.join('?' * len(names))})")
+            args.extend(names)
+        for column, value in (('r.model', model), ('r.experiment', experiment)):
+            if value is not None:
+                where.append(f'{column} = ?')
+                args.append(value)
+        if since is not None:
+            where.append('r.created >= ?')
+            args.append(since)
+        # SQLite returns the bare columns of the row holding MAX(created)
+        query = f"""
+            SELECT r.experiment, r.model, r.params_hash, m.name, m.value, MAX(r.created)
+            FROM runs r JOIN metrics m ON m.run_id = r.run_id
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            GROUP BY r.experiment, r.model, r.params_hash, m.name
+        """
+        with self._connect() as db:
+            rows = db.execute(query, args).fetchall()
+        entries = {}
+        for experiment_name, model_type, hash_, name, value, created in rows:
+            entry = entries.setdefault((experiment_name, model_type, hash_), {
+                "experiment": experiment_name, "model": model_type, "params_hash": hash_, "updated": created
+            })
+            entry[name] = value
+            entry["updated"] = max(entry["updated"], created)
+        return list(entries.values())
+
+    def params_for(self, hashes):
+        """Params JSON per params hash"""
+        if not hashes:
+            return {}
+        hashes = list(hashes)
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT params_hash, params FROM runs WHERE params_hash IN ({', '.join('?' * len(hashes))}) "
+                "GROUP BY params_hash", hashes
+            ).fetchall()
+        return {hash_: json.loads(params) for hash_, params in rows}
+
+    def count_runs(self):
+        with self._connect() as db:
+            return db.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
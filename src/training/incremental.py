@@ -0,0 +1,149 @@
+import copy
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import clone
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import normalize
+
+from src.features.selection import select_features
+from src.features.vectorizers import HashingTfidfVectorizer
+
+# Incremental refresh of a fitted vectorizer + linear model from a delta of
+# new labelled documents. Document frequencies are updated exactly, so the IDF
+# after an update equals the IDF of a fit on history + delta (over the
+# existing vocabulary). The model then takes a few SGD passes over the delta
+# plus a replay sample of the history, so an update costs time proportional
+# to the delta, not to the history (see continue_training).
+
+
+def document_frequencies(vectorizer, n_docs):
+    """Per-feature document frequencies of a fitted vectorizer.
+
+    HashingTfidfVectorizer keeps them; for TfidfVectorizer they are recovered
+    from the smoothed IDF, idf = ln((1 + n) / (1 + df)) + 1, given the number
+    of documents it was fitted on.
+    """
+    if isinstance(vectorizer, HashingTfidfVectorizer):
+        return vectorizer.df_.copy()
+    if not (vectorizer.smooth_idf and vectorizer.use_idf):
+        raise ValueError("Incremental updates need a TfidfVectorizer with smooth_idf=True and use_idf=True")
+    df = (1 + n_docs) / np.exp(np.asarray(vectorizer.idf_, dtype=np.float64) - 1) - 1
+    return np.rint(df).astype(np.int64)
+
+
+def _vocabulary_counter(vectorizer, binary):
+    return CountVectorizer(
+        vocabulary=vectorizer.vocabulary_,
+        ngram_range=vectorizer.ngram_range,
+        token_pattern=vectorizer.token_pattern,
+        lowercase=False,
+        binary=binary
+    )
+
+
+def _ngram_counts(vectorizer, docs):
+    """Total n-gram occurrences per document, known or not"""
+    analyzer = CountVectorizer(
+        ngram_range=vectorizer.ngram_range, token_pattern=getattr(vectorizer, 'token_pattern', r"(?u)\b\w\w+\b"),
+        lowercase=False
+    ).build_analyzer()
+    return sum(len(analyzer(doc)) for doc in docs)
+
+
+def known_coverage(vectorizer, docs, df):
+    """Share of n-gram occurrences in docs that the vectorizer already knows.
+
+    For a vocabulary vectorizer that is the share inside the vocabulary; for a
+    hashing vectorizer, the share landing in columns seen during fitting.
+    """
+    if isinstance(vectorizer, HashingTfidfVectorizer):
+        counts = vectorizer._hasher().transform(docs)
+        total = counts.sum()
+        known = counts.data[df[counts.indices] > 0].sum()
+    else:
+        total = _ngram_counts(vectorizer, docs)
+        known = _vocabulary_counter(vectorizer, binary=False).transform(docs).sum()
+    return float(known / total) if total else 1.0
+
+
+def update_vectorizer(vectorizer, docs, df, n_docs):
+    """Return a copy of the vectorizer whose IDF also counts docs, and the new (df, n_docs)"""
+    vectorizer = copy.deepcopy(vectorizer)
+    if isinstance(vectorizer, HashingTfidfVectorizer):
+        vectorizer.partial_fit(docs)
+        return vectorizer, vectorizer.df_, vectorizer.n_docs_
+
+    delta_df = np.asarray(_vocabulary_counter(vectorizer, binary=True).transform(docs).sum(axis=0)).ravel()
+    df = df + delta_df
+    n_docs = n_docs + len(docs)
+    vectorizer.idf_ = np.log((1 + n_docs) / (1 + df)) + 1
+    return vectorizer, df, n_docs
+
+
+def same_columns(vectorizer, other):
+    """Whether two fitted vectorizers produce the same columns (IDF aside)"""
+    if hasattr(vectorizer, 'vocabulary_') and hasattr(other, 'vocabulary_'):
+        return vectorizer.vocabulary_ == other.vocabulary_
+    return (isinstance(vectorizer, HashingTfidfVectorizer) and isinstance(other, HashingTfidfVectorizer)
+            and vectorizer.n_features == other.n_features and vectorizer.ngram_range == other.ngram_range)
+
+
+def reweight(X, old_idf, new_idf, norm='l2'):
+    """Rows of normalize(tf * old_idf) turned into normalize(tf * new_idf) without re-counting.
+
+    Scaling each column by new_idf / old_idf gives tf * new_idf up to a
+    per-row constant, which the re-normalization removes.
+    """
+    scale = (np.asarray(new_idf, dtype=np.float64) / np.asarray(old_idf, dtype=np.float64)).astype(X.dtype)
+    return normalize(sp.csr_matrix(sp.csr_matrix(X).multiply(scale)), norm=norm, copy=False)
+
+
+def continue_training(model, X, y, n_docs, sgd_epochs=3, eta0=0.5, random_state=42):
+    """Update a fitted linear model with new labelled data X (the delta plus a replay sample).
+
+    SGDClassifier takes sgd_epochs partial_fit passes over X. A logistic
+    regression is not refit by its solver, which would need the whole
+    history: SGD with the same log loss and L2 penalty (alpha = 1 / (C * n_docs),
+    n_docs being history + delta) starts from its weights and takes sgd_epochs
+    passes with an adaptive step size from eta0. The result is still the
+    LogisticRegression, with its solver kept for full refits.
+    """
+    model = copy.deepcopy(model)
+    if isinstance(model, SGDClassifier):
+        rng = np.random.default_rng(random_state)
+        for _ in range(sgd_epochs):
+            order = rng.permutation(X.shape[0])
+            model.partial_fit(X[order], y[order])
+        return model
+    if isinstance(model, LogisticRegression):
+        l2 = model.penalty in ('l2', 'deprecated') and not getattr(model, 'l1_ratio', None)
+        if not l2 or len(model.classes_) != 2:
+            raise ValueError("Incremental updates need a binary logistic regression with an L2 penalty")
+        sgd = SGDClassifier(
+            loss='log_loss', alpha=1.0 / (model.C * n_docs), fit_intercept=model.fit_intercept,
+            learning_rate='adaptive', eta0=eta0, max_iter=sgd_epochs, tol=None, random_state=random_state
+        )
+        # fit() updates coef_init in place
+        sgd.fit(X, y, coef_init=model.coef_.copy(), intercept_init=model.intercept_.copy())
+        model.coef_, model.intercept_ = sgd.coef_, sgd.intercept_
+        return model
+    raise ValueError(f"Unsupported model for incremental updates: {type(model).__name__}")
+
+
+def refit(model, vectorizer_factory, docs, y, select_params=None):
+    """Full refit on all docs, like the pipeline: a fresh vectorizer, feature
+    selection (a feature_selection params block), then an unfitted clone of the model.
+
+    Returns (model, pruned vectorizer, full vectorizer).
+    """
+    full_vectorizer = vectorizer_factory()
+    X = full_vectorizer.fit_transform(docs)
+    vectorizer, X, _, _ = select_features(full_vectorizer, X, y, select_params)
+    model = clone(model)
+    model.fit(X, y)
+    return model, vectorizer, full_vectorizer
+
+
+def stack(parts):
+    return sp.vstack(parts, format='csr') if len(parts) > 1 else parts[0]
@@ -0,0 +1,207 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+from contextlib import nullcontext
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import log_loss
+
+from src.data.ingestion import iter_labelled_chunks
+
+logger = logging.getLogger(__name__)
+
+CLASSES = np.array([0, 1])
+HOLDOUT_BUCKETS = 10000
+# Losses for which SGDClassifier provides predict_proba
+PROBABILISTIC_LOSSES = ('log_loss', 'modified_huber')
+# sgd params that change the trained model (the rest only affect bookkeeping)
+MODEL_PARAMS = ('loss', 'alpha', 'penalty', 'batch_size', 'holdout_fraction', 'holdout_max_rows', 'random_state')
+
+
+def content_digests(texts):
+    """64-bit content hashes, used to recognise test rows and to pick holdout rows"""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little') for text in texts),
+        dtype=np.uint64, count=len(texts)
+    )
+
+
+class StreamingSGDTrainer:
+    """Out-of-core linear classifier trained with SGDClassifier.partial_fit.
+
+    Each epoch streams the whole raw corpus in mini-batches through an
+    already fitted vectorizer, so memory depends on batch_size rather than on
+    the corpus size. Rows matching the test split are skipped (and, given a
+    NearDuplicateIndex over it, near-duplicates of test rows); a fixed,
+    hash-selected fraction of the rest (capped at holdout_max_rows) is held
+    out for early stopping. Training state is checkpointed every
+    checkpoint_every batches and resumed when the configuration matches,
+    unless it comes from a run that already finished.
+    """
+
+    def __init__(self, vectorizer, normalizer, sgd_params, exclude=None, near_duplicates=None, fingerprint=''):
+        if sgd_params.get('loss', 'log_loss') not in PROBABILISTIC_LOSSES:
+            raise ValueError(f"sgd_streaming needs a probabilistic loss {PROBABILISTIC_LOSSES}, got {sgd_params['loss']!r}")
+        self.vectorizer = vectorizer
+        self.normalizer = normalizer
+        self.params = sgd_params
+        self.exclude = np.unique(np.asarray(exclude if exclude is not None else [], dtype=np.uint64))
+        self.near_duplicates = near_duplicates
+        self.batch_size = sgd_params.get('batch_size', 10000)
+        self.holdout_cutoff = int(sgd_params.get('holdout_fraction', 0.05) * HOLDOUT_BUCKETS)
+        self.holdout_max_rows = sgd_params.get('holdout_max_rows', 20000)
+        self.checkpoint_path = sgd_params.get('checkpoint_path')
+        self.checkpoint_every = sgd_params.get('checkpoint_every', 10)
+        # Checkpoints are only resumed for the same data, vectorizer and model params
+        relevant = {key: sgd_params.get(key) for key in MODEL_PARAMS}
+        self.fingerprint = hashlib.sha256((fingerprint + json.dumps(relevant, sort_keys=True)).encode()).hexdigest()
+
+    def _new_model(self):
+        return SGDClassifier(
+            loss=self.params.get('loss', 'log_loss'),
+            alpha=self.params.get('alpha', 1e-5),
+            penalty=self.params.get('penalty', 'l2'),
+            random_state=self.params.get('random_state', 42)
+        )
+
+    def _initial_state(self):
+        return {
+            "fingerprint": self.fingerprint,
+            "epoch": 0,
+            "batch": 0,
+            "model": self._new_model(),
+            "best_model": None,
+            "best_loss": None,
+            "stale_epochs": 0,
+            "holdout": [],
+            "holdout_rows": 0,
+            "holdout_digests": [],
+            "holdout_complete": False,
+            "near_duplicates": [],
+            "train_rows": 0,
+            "completed": False
+        }
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            state = joblib.load(self.checkpoint_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return None
+        if state.get('fingerprint') != self.fingerprint or set(state) != set(self._initial_state()):
+            logger.info("Ignoring checkpoint from a different configuration")
+            return None
+        if state.get('completed'):
+            logger.info("Ignoring checkpoint of a finished run")
+            return None
+        logger.info(f"Resuming from checkpoint at epoch {state['epoch'] + 1}, batch {state['batch']}")
+        return state
+
+    def _save_checkpoint(self, state):
+        if not self.checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _finish_checkpoint(self, state):
+        """Mark the checkpoint of a finished run, which is never resumed
+        (epochs, patience and tol are not part of the fingerprint)"""
+        state['completed'] = True
+        self._save_checkpoint(state)
+
+    def _featurize(self, texts):
+        return self.vectorizer.transform(self.normalizer.normalize_many(texts))
+
+    def _holdout_loss(self, model, state):
+        if not state['holdout']:
+            return None
+        X = sp.vstack([X for X, _ in state['holdout']], format='csr')
+        y = np.concatenate([y for _, y in state['holdout']])
+        return log_loss(y, model.predict_proba(X), labels=CLASSES)
+
+    def _train_batch(self, state, df, epoch, batch):
+        texts = df['content'].tolist()
+        labels = df['label'].to_numpy()
+        digests = content_digests(texts)
+        keep = ~np.isin(digests, self.exclude)
+        # Near-duplicates are looked up during the first pass and skipped by digest afterwards
+        if self.near_duplicates is not None and epoch == 0 and keep.any():
+            rows = np.flatnonzero(keep)
+            matches, _, _ = self.near_duplicates.query([texts[i] for i in rows])
+            state['near_duplicates'].extend(int(digest) for digest in digests[rows[matches >= 0]])
+        if state['near_duplicates']:
+            keep &= ~np.isin(digests, np.asarray(state['near_duplicates'], dtype=np.uint64))
+        bucket = keep & (digests % HOLDOUT_BUCKETS < self.holdout_cutoff)
+
+        # Holdout rows are collected during the first pass and recognised by
+        # digest afterwards; bucket rows past holdout_max_rows are trained on
+        if not state['holdout_complete'] and bucket.any():
+            room = self.holdout_max_rows - state['holdout_rows']
+            rows = np.flatnonzero(bucket)[:max(room, 0)]
+            if len(rows):
+                state['holdout'].append((self._featurize([texts[i] for i in rows]), labels[rows]))
+                state['holdout_rows'] += len(rows)
+                state['holdout_digests'].extend(int(digest) for digest in digests[rows])
+        train = keep & ~np.isin(digests, np.asarray(state['holdout_digests'], dtype=np.uint64))
+
+        rows = np.flatnonzero(train)
+        if not len(rows):
+            return
+        # Shuffle inside the batch: the raw files are grouped by class
+        rng = np.random.default_rng([self.params.get('random_state', 42), epoch, batch])
+        rows = rng.permutation(rows)
+        state['model'].partial_fit(self._featurize([texts[i] for i in rows]), labels[rows], classes=CLASSES)
+        if epoch == 0:
+            state['train_rows'] += len(rows)
+
+    def train(self, fake_path='data/raw/Fake.csv', true_path='data/raw/True.csv', monitor=None):
+        """Run up to `epochs` passes with early stopping; returns (best model, training stats)"""
+        epochs = self.params.get('epochs', 5)
+        patience = self.params.get('patience', 2)
+        tol = self.params.get('tol', 1e-4)
+        state = self._load_checkpoint() or self._initial_state()
+
+        while state['epoch'] < epochs and state['stale_epochs'] < patience:
+            epoch = state['epoch']
+            for batch, df in enumerate(iter_labelled_chunks(fake_path, true_path, self.batch_size)):
+                if batch < state['batch']:
+                    continue
+                with monitor.span('partial_fit') if monitor is not None else nullcontext():
+                    self._train_batch(state, df, epoch, batch)
+                state['batch'] = batch + 1
+                if self.checkpoint_every and state['batch'] % self.checkpoint_every == 0:
+                    self._save_checkpoint(state)
+
+            state['holdout_complete'] = True
+            loss = self._holdout_loss(state['model'], state)
+            logger.info(f"Epoch {epoch + 1}/{epochs}: holdout log loss = {loss if loss is None else round(loss, 5)}")
+            if loss is None or state['best_loss'] is None or loss < state['best_loss'] - tol:
+                state['best_loss'] = loss
+                state['best_model'] = copy.deepcopy(state['model'])
+                state['stale_epochs'] = 0
+            else:
+                state['stale_epochs'] += 1
+            state['epoch'] = epoch + 1
+            state['batch'] = 0
+            self._save_checkpoint(state)
+            if state['stale_epochs'] >= patience:
+                logger.info(f"Early stopping after epoch {epoch + 1}: no improvement for {patience} epochs")
+        self._finish_checkpoint(state)
+
+        stats = {
+            "epochs_run": state['epoch'],
+            "stopped_early": state['stale_epochs'] >= patience,
+            "train_rows_per_epoch": state['train_rows'],
+            "holdout_rows": state['holdout_rows'],
+            "near_duplicates_skipped": len(state['near_duplicates']),
+            "best_holdout_log_loss": state['best_loss']
+        }
+        return state['best_model'] or state['model'], stats
@@ -0,0 +1,10 @@
+import hashlib
+
+
+def artifact_hash(path, block_size=1 << 20):
+    """SHA-256 of a file's contents, used to tie features to the vectorizer that made them"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
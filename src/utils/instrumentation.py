@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+PERF_DIR = 'metrics/perf'
+PROFILE_DIR = 'profiles'
+PROFILERS = (None, 'cprofile', 'pyinstrument')
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (None where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _round(value, digits=4):
+    return round(value, digits) if value is not None else None
+
+
+class Instrumentation:
+    """Named timing spans and gauges, cheap enough to leave on in hot paths.
+
+    Repeated spans accumulate (calls, total and max seconds). With
+    track_memory=True each span also records the process RSS when it ended.
+    """
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.spans = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        rss = current_rss_mb() if self.track_memory else None
+        with self._lock:
+            span = self.spans.setdefault(name, {"calls": 0, "total_s": 0.0, "max_s": 0.0})
+            span["calls"] += 1
+            span["total_s"] += seconds
+            span["max_s"] = max(span["max_s"], seconds)
+            if rss is not None:
+                span["rss_mb"] = round(rss, 1)
+
+    def gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def matrix(self, name, matrix):
+        """Record shape, nnz and density of a (sparse or dense) feature matrix"""
+        rows, cols = matrix.shape
+        nnz = int(matrix.nnz) if hasattr(matrix, 'nnz') else int(matrix.size)
+        self.gauge(f"{name}.rows", int(rows))
+        self.gauge(f"{name}.cols", int(cols))
+        self.gauge(f"{name}.nnz", nnz)
+        self.gauge(f"{name}.density", nnz / (rows * cols) if rows and cols else 0.0)
+
+    def summary(self):
+        with self._lock:
+            spans = {
+                name: {key: _round(value) if isinstance(value, float) else value for key, value in span.items()}
+                for name, span in self.spans.items()
+            }
+            return {"spans": spans, "gauges": dict(self.gauges)}
+
+
+class StageMonitor(Instrumentation):
+    """Instrumentation for one pipeline stage run.
+
+    finish() writes <perf_dir>/<stage>_perf.json (tracked by DVC as metrics)
+    and, when a profiler is configured, a profile dump to profile_dir. With a
+    metrics store, the stage's perf numbers and any metrics passed to
+    log_metrics() are also appended to it as one run.
+
+    Memory is per process: a stage started off the main thread (the
+    in-process pipeline executor) shares it with other stages, so it records
+    no peak or per-span RSS.
+    """
+
+    def __init__(self, stage, perf_dir=PERF_DIR, profiler=None, profile_dir=PROFILE_DIR):
+        self.shared_process = threading.current_thread() is not threading.main_thread()
+        super().__init__(track_memory=not self.shared_process)
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {profiler!r} (expected one of {PROFILERS})")
+        self.stage = stage
+        self.perf_dir = perf_dir
+        self.profile_dir = profile_dir
+        self.profiler_name = profiler
+        self._profiler = None
+        self._start = time.perf_counter()
+        self.params = None
+        self.store = None
+        self.metrics = {}
+
+    @classmethod
+    def start(cls, stage, params):
+        """Create the monitor from the instrumentation params block and start profiling"""
+        settings = params.get('instrumentation') or {}
+        monitor = cls(
+            stage,
+            perf_dir=settings.get('perf_dir', PERF_DIR),
+            profiler=settings.get('profiler'),
+            profile_dir=settings.get('profile_dir', PROFILE_DIR)
+        )
+        if (params.get('metrics_store') or {}).get('enabled', False):
+            from src.tracking.metrics_store import MetricsStore
+            monitor.store = MetricsStore.from_params(params['metrics_store'])
+            monitor.params = params
+        monitor._start_profiler()
+        return monitor
+
+    def log_metrics(self, metrics):
+        """Quality/size/throughput metrics of this run, for the metrics store"""
+        self.metrics.update(metrics)
+
+    def _start_profiler(self):
+        if self.profiler_name == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profiler_name == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError as e:
+                raise ImportError("profiler 'pyinstrument' requires the pyinstrument package") from e
+            self._profiler = Profiler()
+            self._profiler.start()
+        self._start = time.perf_counter()
+
+    def _dump_profile(self):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if self.profiler_name == 'cprofile':
+            self._profiler.disable()
+            path = os.path.join(self.profile_dir, f'{self.stage}.prof')
+            self._profiler.dump_stats(path)
+        else:
+            self._profiler.stop()
+            path = os.path.join(self.profile_dir, f'{self.stage}.html')
+            with open(path, 'w') as f:
+                f.write(self._profiler.output_html())
+        self._profiler = None
+        return path
+
+    def finish(self):
+        """Stop profiling and write the stage's perf metrics; returns the metrics path"""
+        wall_s = time.perf_counter() - self._start
+        profile_path = self._dump_profile() if self._profiler is not None else None
+
+        report = {
+            "stage": self.stage,
+            "wall_s": _round(wall_s),
+            "peak_rss_mb": None if self.shared_process else _round(peak_rss_mb(), 1),
+            **self.summary()
+        }
+        if profile_path:
+            report["profile"] = profile_path
+
+        os.makedirs(self.perf_dir, exist_ok=True)
+        path = os.path.join(self.perf_dir, f'{self.stage}_perf.json')
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        if self.store is not None:
+            self._record_run(report)
+        return path
+
+    def _record_run(self, report):
+        # Stage perf numbers are prefixed with the stage, logged metrics are not
+        metrics = dict(self.metrics)
+        metrics[f"{self.stage}.wall_s"] = report["wall_s"]
+        metrics[f"{self.stage}.peak_rss_mb"] = report["peak_rss_mb"]
+        for name, span in report["spans"].items():
+            metrics[f"{self.stage}.{name}_s"] = span["total_s"]
+        for name, value in report["gauges"].items():
+            metrics[f"{self.stage}.{name}"] = value
+        try:
+            self.store.record_stage(self.stage, self.params, metrics)
+        except Exception as e:
+            # Tracking is best effort: a locked or broken store must not fail the stage
+            logger.warning(f"Could not record {self.stage} in the metrics store: {e}")
@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_n_jobs(n_jobs):
+    """Translate a joblib-style n_jobs value (-1 = all cores) into a worker count"""
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, cpu_count + 1 + n_jobs)
+    return n_jobs
+
+
+def chunked(values, chunk_size):
+    """Split a sequence into consecutive slices of at most chunk_size items"""
+    return [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+
+def map_chunks(func, chunks, n_jobs=1, initializer=None, initargs=()):
+    """Apply func to every chunk, in order, across up to n_jobs worker processes.
+
+    With a single worker (or a single chunk) everything runs in-process, so
+    small inputs never pay the process start-up cost.
+    """
+    workers = min(resolve_n_jobs(n_jobs), len(chunks))
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(chunk) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                             initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, chunks))
+
+
+def _pool_context():
+    """Default start method, except forkserver while other threads run (e.g. the pipeline executor).
+
+    A child forked from a multi-threaded process can inherit a lock some other
+    thread was holding and deadlock on it.
+    """
+    if threading.active_count() > 1 and 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
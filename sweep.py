@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import os
+import sys
+import yaml
+
+from src.sweep.runner import METRIC_COLUMNS, run_sweep
+from src.tracking.metrics_store import MetricsStore
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Hyperparameter sweep over model_building.* and rf.train.* with shared features')
+    parser.add_argument('--params', type=str, default='params.yaml', help='Path to parameters YAML file')
+    parser.add_argument('--models', nargs='+', choices=['lr', 'rf'], default=None,
+                        help='Only sweep these model families (default: every family in sweep.space)')
+    parser.add_argument('--strategy', choices=['grid', 'random'], default=None, help='Override sweep.strategy')
+    parser.add_argument('--n-trials', type=int, default=None, help='Override sweep.n_trials (random search)')
+    parser.add_argument('--n-jobs', type=int, default=None, help='Trainer processes (default: sweep.n_jobs)')
+    parser.add_argument('--output', type=str, default=None, help='Results table (default: sweep.results)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.params, 'r') as f:
+        params = yaml.safe_load(f)
+    sweep_params = params['sweep']
+    if args.models:
+        sweep_params['space'] = {family: sweep_params['space'].get(family) for family in args.models}
+    if args.strategy:
+        sweep_params['strategy'] = args.strategy
+    if args.n_trials:
+        sweep_params['n_trials'] = args.n_trials
+    output = args.output or sweep_params['results']
+
+    try:
+        store = MetricsStore.from_params(params.get('metrics_store'))
+        results = run_sweep(params, n_jobs=args.n_jobs, store=store)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Sweep failed: {e}")
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    results.to_csv(output, index=False)
+    print(f"✅ {len(results)} trials saved to {output}")
+
+    failed = results[results['status'] != 'ok'] if len(results) else results
+    for _, row in failed.iterrows():
+        print(f"❌ Trial {row['trial']} ({row['model']}): {row['error']}")
+    if len(results):
+        print(results.head(10)[['trial', 'model', 'status', *METRIC_COLUMNS, 'fit_s']].to_string(index=False))
@@ -0,0 +1,78 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.serving.cascade import CascadePredictor, calibrate_band
+
+
+def escalate(band, p_real):
+    """CascadePredictor.escalate for a band, without loading any models"""
+    predictor = CascadePredictor.__new__(CascadePredictor)
+    predictor.band = tuple(band) if band is not None else None
+    return predictor.escalate(p_real)
+
+
+def cascade_correct(band, p_real, lr_correct, rf_correct):
+    return np.where(escalate(band, p_real), rf_correct, lr_correct).sum()
+
+
+def test_band_edges_are_inclusive():
+    # The RF only helps on the articles exactly at 0.4 and 0.6. With one grid
+    # point per article the candidate edges are the probabilities themselves
+    p_real = np.array([0.1, 0.2, 0.4, 0.4, 0.5, 0.6, 0.6, 0.8, 0.9])
+    lr_correct = np.array([1, 1, 0, 0, 1, 0, 0, 1, 1])
+    rf_correct = np.array([0, 0, 1, 1, 1, 1, 1, 0, 0])
+    result = calibrate_band(p_real, lr_correct, rf_correct, lr_ms=1.0, rf_ms=10.0, budget_ms=100.0,
+                            grid_size=len(p_real))
+
+    assert result["band"] == [0.4, 0.6]
+    assert result["accuracy"] == 1.0
+    mask = escalate(result["band"], p_real)
+    assert mask.sum() == 5
+    assert result["escalation_share"] == pytest.approx(5 / 9)
+    assert result["expected_ms_per_doc"] == pytest.approx(1.0 + 5 / 9 * 10.0)
+
+
+def test_a_single_value_band_escalates_its_ties():
+    p_real = np.array([0.2, 0.5, 0.5, 0.5, 0.7])
+    lr_correct = np.array([1, 0, 0, 1, 1])
+    rf_correct = np.array([0, 1, 1, 1, 0])
+    result = calibrate_band(p_real, lr_correct, rf_correct, lr_ms=1.0, rf_ms=1.0, budget_ms=10.0,
+                            grid_size=len(p_real))
+    assert result["band"] == [0.5, 0.5]
+    assert escalate(result["band"], p_real).sum() == 3
+    assert result["accuracy"] == 1.0
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_brute_force_over_the_grid(seed):
+    rng = np.random.default_rng(seed)
+    n, grid_size, lr_ms, rf_ms = 60, 11, 1.0, 8.0
+    p_real = np.round(rng.random(n), 1)
+    lr_correct = (rng.random(n) < 0.5 + np.abs(p_real - 0.5)).astype(int)
+    rf_correct = (rng.random(n) < 0.8).astype(int)
+    budget_ms = lr_ms + 0.5 * rf_ms
+    result = calibrate_band(p_real, lr_correct, rf_correct, lr_ms, rf_ms, budget_ms, grid_size=grid_size)
+
+    edges = np.unique(np.quantile(p_real, np.linspace(0, 1, grid_size)))
+    best = lr_correct.sum()
+    for low, high in itertools.combinations_with_replacement(edges, 2):
+        if lr_ms + escalate((low, high), p_real).mean() * rf_ms <= budget_ms:
+            best = max(best, cascade_correct((low, high), p_real, lr_correct, rf_correct))
+    assert result["accuracy"] * n == pytest.approx(best)
+    if result["band"] is not None:
+        assert cascade_correct(result["band"], p_real, lr_correct, rf_correct) == best
+        assert lr_ms + escalate(result["band"], p_real).mean() * rf_ms <= budget_ms
+
+
+def test_no_band_when_nothing_fits_or_helps():
+    p_real = np.array([0.1, 0.5, 0.9])
+    lr_correct = np.array([1, 0, 1])
+    rf_correct = np.array([1, 1, 1])
+    over_budget = calibrate_band(p_real, lr_correct, rf_correct, lr_ms=1.0, rf_ms=10.0, budget_ms=2.0)
+    assert over_budget["band"] is None and over_budget["escalation_share"] == 0.0
+    no_gain = calibrate_band(p_real, lr_correct, lr_correct, lr_ms=1.0, rf_ms=0.1, budget_ms=10.0)
+    assert no_gain["band"] is None
+    assert no_gain["accuracy"] == pytest.approx(2 / 3)
+    assert escalate(no_gain["band"], p_real).sum() == 0
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.pipeline.executor import PipelineExecutor, load_stages, plan
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Both branches up to their models: vectorizers, selection and models are pickled
+TARGETS = ['model_building', 'train_rf_model']
+FAKE_WORDS = "shocking secret truth hoax exposed miracle banned viral share watch".split()
+REAL_WORDS = "senate budget ministry officials report committee treaty election vote said".split()
+COMMON_WORDS = "the president new year people state government week country time".split()
+
+
+def stopwords_available():
+    import nltk
+    try:
+        nltk.data.find('corpora/stopwords')
+        return True
+    except LookupError:
+        return False
+
+
+def write_workspace(root):
+    """dvc.yaml, small-data params.yaml and a synthetic raw corpus"""
+    os.makedirs(os.path.join(root, 'data', 'raw'))
+    shutil.copy(os.path.join(REPO, 'dvc.yaml'), root)
+    with open(os.path.join(REPO, 'params.yaml')) as f:
+        params = yaml.safe_load(f)
+    params['data_ingestion']['sample_size_per_class'] = None
+    params['rf']['data']['sample_size_per_class'] = None
+    params['feature_engineering'].update(max_features=500, n_jobs=2, chunk_size=40)
+    params['rf']['featurize'].update(max_features=300, n_jobs=2, chunk_size=40)
+    # Selection re-pickles a vectorizer loaded from disk
+    params['feature_selection'].update(method='chi2', k=200)
+    params['rf']['select'].update(method='chi2', k=100)
+    params['rf']['train'].update(n_estimators=10)
+    params['feature_cache']['enabled'] = False
+    params['metrics_store']['enabled'] = False
+    with open(os.path.join(root, 'params.yaml'), 'w') as f:
+        yaml.safe_dump(params, f)
+
+    rng = np.random.default_rng(0)
+    for name, words in (('Fake.csv', FAKE_WORDS), ('True.csv', REAL_WORDS)):
+        vocabulary = words + COMMON_WORDS
+        texts = [' '.join(rng.choice(vocabulary, 40)) for _ in range(120)]
+        if name == 'True.csv':
+            texts = [f'WASHINGTON (Reuters) - {text}' for text in texts]
+        pd.DataFrame({
+            'title': [' '.join(rng.choice(vocabulary, 6)) for _ in texts],
+            'text': texts, 'subject': 'news', 'date': 'December 31, 2017'
+        }).to_csv(os.path.join(root, 'data', 'raw', name), index=False)
+    return params
+
+
+def digests(root, stages):
+    """sha256 of every non-metrics output (directories hashed file by file)"""
+    result = {}
+    for stage in stages:
+        for out in stage.outs:
+            path = os.path.join(root, out)
+            if out.startswith('metrics') or not os.path.exists(path):
+                continue
+            files = [path] if os.path.isfile(path) else sorted(
+                os.path.join(d, f) for d, _, names in os.walk(path) for f in names
+            )
+            h = hashlib.sha256()
+            for file in files:
+                h.update(os.path.relpath(file, root).encode())
+                with open(file, 'rb') as f:
+                    h.update(f.read())
+            result[out] = h.hexdigest()
+    return result
+
+
+@pytest.mark.skipif(not stopwords_available(), reason="needs the NLTK stopwords corpus")
+def test_in_process_pipeline_writes_the_same_outputs_as_separate_stages(tmp_path, monkeypatch):
+    separate, in_process = str(tmp_path / 'separate'), str(tmp_path / 'in_process')
+    write_workspace(separate)
+    params = write_workspace(in_process)
+    stages = plan(load_stages(os.path.join(separate, 'dvc.yaml')), TARGETS)
+    # dvc repro creates the parent directories of stage outputs
+    for root in (separate, in_process):
+        for out in (out for stage in stages for out in stage.outs):
+            os.makedirs(os.path.dirname(os.path.join(root, out)), exist_ok=True)
+
+    # One process per stage, like `dvc repro`
+    env = dict(os.environ, PYTHONPATH=REPO)
+    for stage in stages:
+        run = subprocess.run([sys.executable, '-m', stage.module], cwd=separate, env=env,
+                             capture_output=True, text=True)
+        assert run.returncode == 0, f"{stage.name} failed:\n{run.stderr[-2000:]}"
+
+    # This process has already loaded (and pickled) plenty of estimators
+    monkeypatch.chdir(in_process)
+    PipelineExecutor(stages, params, jobs=2).run()
+
+    expected = digests(separate, stages)
+    assert 'data/processed/vectorizer.joblib' in expected and 'models/rf/rf_fake_news_model.joblib' in expected
+    assert digests(in_process, stages) == expected
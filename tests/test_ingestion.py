@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.ingestion import load_class_sample, load_labelled_corpus, reservoir_sample
+
+N_ROWS = 23
+
+
+@pytest.fixture
+def raw_paths(tmp_path):
+    """Fake.csv / True.csv in the raw schema, with quoting, newlines and a missing title"""
+    paths = []
+    for name in ('Fake', 'True'):
+        df = pd.DataFrame({
+            'title': [f'{name} title {i}' for i in range(N_ROWS)],
+            'text': [f'{name} text {i}, with "quotes",\nand a second line' for i in range(N_ROWS)],
+            'subject': 'news',
+            'date': 'December 31, 2017'
+        })
+        df.loc[5, 'title'] = None
+        path = tmp_path / f'{name}.csv'
+        df.to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def old_corpus(fake_path, true_path, n):
+    """The original data_ingestion: read_csv().head(n) per class, then title + ' ' + text"""
+    df_fake = pd.read_csv(fake_path).head(n)
+    df_true = pd.read_csv(true_path).head(n)
+    df_fake['label'] = 0
+    df_true['label'] = 1
+    df = pd.concat([df_fake, df_true], ignore_index=True)
+    df['content'] = df['title'] + ' ' + df['text']
+    return df[['content', 'label']]
+
+
+@pytest.mark.parametrize("n", [1, 7, N_ROWS, 100])
+@pytest.mark.parametrize("chunk_size", [1, 4, 10000])
+def test_head_matches_read_csv_head(raw_paths, n, chunk_size):
+    params = {'sample_size_per_class': n, 'sampling': 'head', 'random_state': 42, 'chunk_size': chunk_size}
+    df = load_labelled_corpus(params, *raw_paths)
+    pd.testing.assert_frame_equal(df[['content', 'label']], old_corpus(*raw_paths, n), check_dtype=False)
+
+
+def test_no_sample_size_keeps_every_row(raw_paths):
+    for sampling in ('head', 'reservoir'):
+        params = {'sample_size_per_class': None, 'sampling': sampling, 'random_state': 42, 'chunk_size': 4}
+        assert len(load_labelled_corpus(params, *raw_paths)) == 2 * N_ROWS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 10000])
+def test_reservoir_returns_distinct_rows_in_file_order(raw_paths, chunk_size):
+    all_rows = load_class_sample(raw_paths[0], 0, None)['content'].tolist()
+    sample = reservoir_sample(raw_paths[0], 8, 7, chunk_size).tolist()
+    assert len(sample) == 8
+    positions = [all_rows.index(text) for text in sample if isinstance(text, str)]
+    assert len(set(positions)) == len(positions) == len([text for text in sample if isinstance(text, str)])
+    assert positions == sorted(positions)
+
+
+def test_reservoir_is_reproducible(raw_paths):
+    first = reservoir_sample(raw_paths[0], 8, 42, chunk_size=4)
+    pd.testing.assert_series_equal(first, reservoir_sample(raw_paths[0], 8, 42, chunk_size=4))
+    seeds = [reservoir_sample(raw_paths[0], 8, seed, chunk_size=4).tolist() for seed in range(5)]
+    assert len({tuple(map(str, sample)) for sample in seeds}) > 1
+
+
+def test_reservoir_larger_than_the_file(raw_paths):
+    sample = reservoir_sample(raw_paths[0], 100, 42, chunk_size=4)
+    pd.testing.assert_series_equal(sample, load_class_sample(raw_paths[0], 0, None)['content'],
+                                  check_names=False, check_dtype=False)
+
+
+def test_reservoir_is_roughly_uniform(raw_paths):
+    all_rows = load_class_sample(raw_paths[0], 0, None)['content'].astype(str).tolist()
+    counts = np.zeros(N_ROWS)
+    for seed in range(400):
+        for text in reservoir_sample(raw_paths[0], 5, seed, chunk_size=4).astype(str):
+            counts[all_rows.index(text)] += 1
+    expected = 400 * 5 / N_ROWS
+    assert counts.min() > 0.6 * expected and counts.max() < 1.4 * expected
+
+
+def test_reservoir_classes_use_different_streams(raw_paths):
+    params = {'sample_size_per_class': 8, 'sampling': 'reservoir', 'random_state': 42, 'chunk_size': 4}
+    df = load_labelled_corpus(params, *raw_paths)
+    assert (df['label'] == 0).sum() == (df['label'] == 1).sum() == 8
+    pd.testing.assert_frame_equal(df, load_labelled_corpus(params, *raw_paths))
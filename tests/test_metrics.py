@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import confusion_matrix
+
+from src.evaluation.metrics import ConfusionCounts, classification_metrics, predict_counts
+
+
+def chunked_counts(classes, y_true, y_pred, chunk_size):
+    counts = ConfusionCounts(classes)
+    for start in range(0, len(y_true), chunk_size):
+        part = ConfusionCounts(classes).update(y_true[start:start + chunk_size], y_pred[start:start + chunk_size])
+        counts.merge(part)
+    return counts
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_metrics_match_classification_metrics(seed, chunk_size):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, 2, 200)
+    y_pred = np.where(rng.random(200) < 0.8, y_true, 1 - y_true)
+    counts = chunked_counts([0, 1], y_true, y_pred, chunk_size)
+    assert counts.docs == 200
+    np.testing.assert_array_equal(counts.counts, confusion_matrix(y_true, y_pred))
+    assert counts.metrics() == classification_metrics(y_true, y_pred)
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.UndefinedMetricWarning")
+def test_undefined_precision_is_zero_like_sklearn():
+    # Nothing is predicted as class 1: its precision (and F1) are 0
+    y_true = np.array([0, 0, 1, 1, 1])
+    y_pred = np.zeros(5, dtype=int)
+    assert ConfusionCounts([0, 1]).update(y_true, y_pred).metrics() == classification_metrics(y_true, y_pred)
+
+
+def test_string_classes_and_target_names():
+    y_true = np.array(['fake', 'real', 'real', 'fake', 'real'])
+    y_pred = np.array(['fake', 'fake', 'real', 'fake', 'real'])
+    names = ('Fake', 'Real')
+    assert ConfusionCounts(['fake', 'real']).update(y_true, y_pred).metrics(names) == \
+        classification_metrics(y_true, y_pred, names)
+
+
+def test_unknown_labels_are_rejected():
+    with pytest.raises(ValueError):
+        ConfusionCounts([0, 1]).update([0, 2], [0, 1])
+
+
+def test_predict_counts_matches_predict():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=300) > 0).astype(int)
+    model = LogisticRegression().fit(X, y)
+    counts, seconds = predict_counts(model, X, y, chunk_size=64)
+    assert counts.metrics() == classification_metrics(y, model.predict(X))
+    assert seconds >= 0
@@ -0,0 +1,99 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.preprocessing.text_normalizer import TextNormalizer
+from src.serving.prediction_cache import PredictionCache
+from src.serving.predictor import Predictor
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = PredictionCache(max_entries=2, ttl_seconds=None)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1          # 'b' is now the least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_put_refreshes_an_existing_key():
+    cache = PredictionCache(max_entries=2, ttl_seconds=None)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.put('a', 10)
+    cache.put('c', 3)
+    assert cache.get('a') == 10 and cache.get('b') is None
+
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = PredictionCache(ttl_seconds=10, clock=clock)
+    cache.put('a', 1)
+    clock.now = 9.9
+    assert cache.get('a') == 1
+    clock.now = 10.0
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_bind_clears_only_on_a_new_fingerprint():
+    cache = PredictionCache()
+    cache.bind('model-1')
+    cache.put('a', 1)
+    cache.bind('model-1')
+    assert cache.get('a') == 1
+    cache.bind('model-2')
+    assert cache.get('a') is None and cache.fingerprint == 'model-2'
+
+
+def test_from_params():
+    assert PredictionCache.from_params(None) is None
+    assert PredictionCache.from_params({'enabled': False}) is None
+    cache = PredictionCache.from_params({'enabled': True, 'max_entries': 5, 'ttl_seconds': 60})
+    assert (cache.max_entries, cache.ttl_seconds) == (5, 60)
+    with pytest.raises(ValueError):
+        PredictionCache(max_entries=0)
+
+
+def fit_artifacts(tmp_path, flip=False):
+    docs = ['senate budget vote', 'officials report treaty', 'shocking secret hoax', 'miracle banned viral']
+    y = np.array([1, 1, 0, 0])
+    vectorizer = TfidfVectorizer().fit(docs)
+    model = LogisticRegression().fit(vectorizer.transform(docs), 1 - y if flip else y)
+    joblib.dump(model, tmp_path / 'model.joblib')
+    joblib.dump(vectorizer, tmp_path / 'vectorizer.joblib')
+
+
+def test_predictor_drops_cached_predictions_of_a_replaced_model(tmp_path):
+    fit_artifacts(tmp_path)
+    cache = PredictionCache()
+    predictor = Predictor(str(tmp_path / 'model.joblib'), str(tmp_path / 'vectorizer.joblib'),
+                          normalizer=TextNormalizer(stop_words=()), cache=cache)
+    first = predictor.predict('Shocking secret!')
+    assert predictor.predict('shocking   SECRET') == first    # same normalized text
+    assert cache.stats()["hits"] == 1
+
+    # Same artifacts: the cache survives a forced reload
+    assert predictor.reload(force=True)
+    assert len(cache) == 1
+
+    fit_artifacts(tmp_path, flip=True)
+    assert predictor.reload(force=True)
+    assert len(cache) == 0 and cache.fingerprint == predictor.fingerprint
+    assert predictor.predict('Shocking secret!')[0] != first[0]
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from src.serving.registry import ModelRegistry
+
+
+def publish(registry, tmp_path, name, **kwargs):
+    """Publish a version whose model/vectorizer files hold `name`"""
+    paths = {}
+    for artifact in ('model', 'vectorizer', 'metrics'):
+        path = tmp_path / f'{name}.{artifact}'
+        path.write_text(json.dumps({"accuracy": 0.9}) if artifact == 'metrics' else f'{artifact} {name}')
+        paths[artifact] = str(path)
+    return registry.publish(paths['model'], paths['vectorizer'], paths['metrics'], **kwargs)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / 'registry'))
+
+
+def test_publish_numbers_versions_and_skips_duplicates(registry, tmp_path):
+    assert publish(registry, tmp_path, 'a') == ('v0001', True)
+    assert publish(registry, tmp_path, 'b') == ('v0002', True)
+    assert publish(registry, tmp_path, 'a') == ('v0001', False)
+    assert registry.versions() == ['v0001', 'v0002']
+    assert registry.current() is None
+    assert registry.manifest('v0002')['metrics'] == {"accuracy": 0.9}
+
+
+def test_publish_stores_extra_files_and_lineage(registry, tmp_path):
+    delta = tmp_path / 'delta.feather'
+    delta.write_bytes(b'delta')
+    version, _ = publish(registry, tmp_path, 'a', extra_files={'delta': str(delta)}, lineage={"parent": None})
+    assert open(registry.paths(version)['delta'], 'rb').read() == b'delta'
+    assert registry.manifest(version)['lineage'] == {"parent": None}
+
+
+def test_activate_and_rollback(registry, tmp_path):
+    for name in 'abc':
+        registry.activate(publish(registry, tmp_path, name)[0])
+    assert registry.current() == 'v0003'
+    assert registry.activate('v0003') is False
+
+    assert registry.rollback() == 'v0002'
+    assert registry.current() == 'v0002'
+    assert registry.rollback() == 'v0001'
+    with pytest.raises(ValueError):
+        registry.rollback()
+    assert [entry['action'] for entry in registry.history()] == ['activate'] * 3 + ['rollback'] * 2
+
+
+def test_activate_rejects_unknown_and_tampered_versions(registry, tmp_path):
+    with pytest.raises(ValueError):
+        registry.activate('v0042')
+    version, _ = publish(registry, tmp_path, 'a')
+    with open(registry.paths(version)['model'], 'a') as f:
+        f.write('tampered')
+    with pytest.raises(ValueError):
+        registry.activate(version)
+    assert registry.current() is None
+
+
+def test_prune_keeps_current_and_rollback_target(registry, tmp_path):
+    for name in 'abcde':
+        publish(registry, tmp_path, name)
+    registry.activate('v0001')
+    registry.activate('v0002')
+
+    assert registry.prune(2) == ['v0003']
+    assert registry.versions() == ['v0001', 'v0002', 'v0004', 'v0005']
+    assert not os.path.exists(os.path.join(registry.versions_dir, 'v0003'))
+    assert registry.rollback() == 'v0001'
+
+
+def test_rollback_skips_pruned_versions(registry, tmp_path):
+    for name in 'abc':
+        registry.activate(publish(registry, tmp_path, name)[0])
+    for name in 'de':
+        publish(registry, tmp_path, name)
+    # v0001 is neither CURRENT nor the rollback target
+    assert registry.prune(1) == ['v0001', 'v0004']
+    assert registry.rollback() == 'v0002'
+    with pytest.raises(ValueError):
+        registry.rollback()
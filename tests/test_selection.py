@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import mutual_info_score
+
+from src.features.selection import (presence_mutual_info, select_columns, select_features, select_vectorizer,
+                                    top_k)
+from src.features.vectorizers import ShardedTfidfVectorizer
+
+DOCS = [
+    "the senate passed the bill on tuesday after a long debate",
+    "officials said the bill would cut taxes for most families",
+    "breaking shocking truth about the senate they do not want you to know",
+    "you will not believe what this senator said about taxes",
+    "the president signed the bill into law on friday",
+    "share this before it gets deleted the truth about taxes",
+    "lawmakers debate the budget as the deadline approaches",
+    "shocking video they do not want you to see share now",
+]
+LABELS = np.array([1, 1, 0, 0, 1, 0, 1, 0])
+UNSEEN = ["the senate debate about taxes", "share the shocking truth now", "zzz"]
+
+
+@pytest.mark.parametrize("vectorizer", [
+    TfidfVectorizer(lowercase=False, ngram_range=(1, 2)),
+    ShardedTfidfVectorizer(ngram_range=(1, 2), chunk_size=3)
+])
+def test_select_columns_equals_pruned_vectorizer(vectorizer):
+    X = vectorizer.fit_transform(DOCS)
+    columns = np.arange(0, X.shape[1], 3)
+    pruned = select_vectorizer(vectorizer, columns)
+    np.testing.assert_allclose(select_columns(X, columns).toarray(), pruned.transform(DOCS).toarray())
+    np.testing.assert_allclose(
+        select_columns(vectorizer.transform(UNSEEN), columns).toarray(), pruned.transform(UNSEEN).toarray()
+    )
+    # The original vectorizer is left alone
+    assert len(vectorizer.vocabulary_) == X.shape[1]
+
+
+@pytest.mark.parametrize("method", ["chi2", "mutual_info"])
+def test_select_features_matches_refeaturizing(method):
+    vectorizer = ShardedTfidfVectorizer(ngram_range=(1, 2), chunk_size=3)
+    X = vectorizer.fit_transform(DOCS)
+    X_unseen = vectorizer.transform(UNSEEN)
+    pruned, X_selected, [X_unseen_selected], columns = select_features(
+        vectorizer, X, LABELS, {"method": method, "k": 10}, extra=[X_unseen]
+    )
+    assert len(columns) == len(pruned.vocabulary_) == X_selected.shape[1] == 10
+    np.testing.assert_allclose(X_selected.toarray(), pruned.transform(DOCS).toarray())
+    np.testing.assert_allclose(X_unseen_selected.toarray(), pruned.transform(UNSEEN).toarray())
+
+
+@pytest.mark.parametrize("select_params", [None, {"method": None, "k": 10}, {"method": "chi2", "k": 10 ** 6}])
+def test_select_features_keeps_everything(select_params):
+    vectorizer = TfidfVectorizer(lowercase=False)
+    X = vectorizer.fit_transform(DOCS)
+    selected, X_selected, _, columns = select_features(vectorizer, X, LABELS, select_params)
+    assert selected is vectorizer and X_selected is X and columns is None
+
+
+def test_top_k_breaks_ties_by_column():
+    np.testing.assert_array_equal(top_k(np.array([1.0, 3.0, 3.0, 2.0, 3.0]), 2), [1, 2])
+
+
+def test_presence_mutual_info():
+    X = TfidfVectorizer(lowercase=False).fit_transform(DOCS)
+    present = X.toarray() > 0
+    expected = [mutual_info_score(LABELS, present[:, column]) for column in range(X.shape[1])]
+    np.testing.assert_allclose(presence_mutual_info(X, LABELS), expected, atol=1e-12)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from src.data.dedup import deduplicate
+from src.training.sgd_streaming import StreamingSGDTrainer, content_digests
+
+FAKE_WORDS = "shocking secret truth hoax exposed miracle banned viral".split()
+REAL_WORDS = "senate budget ministry officials report committee treaty election".split()
+DEDUP = {"threshold": 0.8, "num_perm": 64, "shingle_size": 2, "seed": 1}
+
+
+class Identity:
+    def normalize_many(self, texts):
+        return list(texts)
+
+
+class RecordingTrainer(StreamingSGDTrainer):
+    """Remembers every featurized text; crashes at (epoch, batch) = fail_at"""
+
+    def __init__(self, *args, fail_at=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.featurized = []
+        self.fail_at = fail_at
+
+    def _featurize(self, texts):
+        self.featurized.extend(texts)
+        return super()._featurize(texts)
+
+    def _train_batch(self, state, df, epoch, batch):
+        if (epoch, batch) == self.fail_at:
+            raise RuntimeError("interrupted")
+        return super()._train_batch(state, df, epoch, batch)
+
+
+def article(rng, words, i):
+    return ' '.join(rng.choice(words, 12)) + f' story{i}'
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = []
+    for name, words in (('Fake.csv', FAKE_WORDS), ('True.csv', REAL_WORDS)):
+        texts = [article(rng, words, i) for i in range(40)]
+        path = tmp_path / name
+        pd.DataFrame({'title': [f'title {i}' for i in range(40)], 'text': texts}).to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def trainer(tmp_path, cls=StreamingSGDTrainer, **params):
+    sgd_params = dict(batch_size=10, epochs=2, patience=10, tol=0.0, holdout_fraction=0.2, holdout_max_rows=1000,
+                      checkpoint_path=str(tmp_path / 'checkpoints' / 'sgd.joblib'), checkpoint_every=1)
+    sgd_params.update(params.pop('sgd', {}))
+    vectorizer = HashingVectorizer(n_features=2 ** 10, alternate_sign=False)
+    return cls(vectorizer, Identity(), sgd_params, **params)
+
+
+def raw_texts(paths):
+    return [f'{title} {text}' for path in paths for title, text in pd.read_csv(path)[['title', 'text']].values]
+
+
+def test_resume_matches_an_uninterrupted_run(tmp_path, corpus):
+    model, stats = trainer(tmp_path / 'a').train(*corpus)
+
+    interrupted = trainer(tmp_path / 'b', RecordingTrainer, fail_at=(1, 2))
+    with pytest.raises(RuntimeError):
+        interrupted.train(*corpus)
+    resumed = trainer(tmp_path / 'b', RecordingTrainer)
+    resumed_model, resumed_stats = resumed.train(*corpus)
+
+    # Only the rest of the second epoch was trained again
+    assert 0 < len(resumed.featurized) < len(raw_texts(corpus))
+    np.testing.assert_allclose(resumed_model.coef_, model.coef_)
+    assert resumed_stats == stats
+
+
+def test_finished_runs_are_not_resumed(tmp_path, corpus):
+    trainer(tmp_path).train(*corpus)
+    # Same fingerprint, more epochs: trains from scratch instead of returning the old model
+    again = trainer(tmp_path, RecordingTrainer, sgd={"epochs": 3})
+    _, stats = again.train(*corpus)
+    assert stats["epochs_run"] == 3
+    assert len(again.featurized) >= 3 * stats["train_rows_per_epoch"]
+
+
+def test_skips_test_rows_and_their_near_duplicates(tmp_path, corpus):
+    texts = raw_texts(corpus)
+    test_texts = [texts[3], texts[45]]
+    near_copy = texts[10]
+    _, index, _ = deduplicate(test_texts + [near_copy], [0, 1, 0], DEDUP)
+    # The corpus row is a near-duplicate of an indexed "test" article
+    df = pd.read_csv(corpus[0])
+    df.loc[10, 'text'] += ' update'
+    df.to_csv(corpus[0], index=False)
+
+    run = trainer(tmp_path, RecordingTrainer, sgd={"holdout_fraction": 0.0, "epochs": 1},
+                  exclude=content_digests(test_texts), near_duplicates=index.subset([2]))
+    _, stats = run.train(*corpus)
+    trained = set(run.featurized)
+    assert not trained & set(test_texts)
+    assert near_copy + ' update' not in trained
+    assert stats["near_duplicates_skipped"] == 1
+    assert stats["train_rows_per_epoch"] == len(texts) - 3
+
+
+def test_holdout_cap_keeps_the_remaining_bucket_rows_in_training(tmp_path, corpus):
+    n = len(raw_texts(corpus))
+    _, full = trainer(tmp_path / 'a', sgd={"holdout_fraction": 0.5, "epochs": 1}).train(*corpus)
+    _, capped = trainer(tmp_path / 'b', sgd={"holdout_fraction": 0.5, "holdout_max_rows": 5, "epochs": 1}).train(*corpus)
+    assert full["holdout_rows"] > 5
+    assert full["train_rows_per_epoch"] == n - full["holdout_rows"]
+    assert capped["holdout_rows"] == 5
+    assert capped["train_rows_per_epoch"] == n - 5
@@ -0,0 +1,75 @@
+import re
+
+import pandas as pd
+import pytest
+
+from src.preprocessing.text_normalizer import TextNormalizer
+
+STOP_WORDS = frozenset(['the', 'a', 'of', 'to', 'in', 'and', 'is', 'on'])
+
+SAMPLES = [
+    "WASHINGTON (Reuters) - The Senate passed the bill on Tuesday.",
+    "LONDON (Reuters) – Prime Minister's office said 3 times: \"No!\"",
+    "NEW YORK (AP) - first dateline - WASHINGTON (Reuters) - second one",
+    "Not a dateline (Reuters) - lowercase words first",
+    "BREAKING!!! You won't BELIEVE this... #fakenews @someone http://t.co/x1",
+    "Tabs\tand\nnewlines\r\nand\x0bvertical\x0cfeeds\x1cand\x1fseparators",
+    "Café déjà vu – naïve façade “quoted” ‘text’ and emoji 🙂 ok",
+    "Straße İstanbul ΑΘΗΝΑ МОСКВА digits 12345 and under_scores",
+    "",
+    "   ",
+    "a the of",
+]
+
+
+def old_lr_preprocess(text, stop_words):
+    """TextPreprocessor.preprocess_text from the original LR feature_engineering stage"""
+    if isinstance(text, str):
+        text = re.sub(r'^[A-Z\s]+ \([A-Z\s]+\) - ', '', text)
+        text = re.sub(r'^[A-Z\s]+\s\([A-Z\s]+\) – ', '', text)
+        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = text.lower()
+        text = ' '.join([word for word in text.split() if word not in stop_words])
+    return text
+
+
+def old_rf_preprocess(text, stop_words):
+    """preprocess_text from the original RF feature_engineering stage"""
+    if isinstance(text, str):
+        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = text.lower()
+        text = ' '.join([word for word in text.split() if word not in stop_words])
+    return text
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_lr_normalization_matches_the_old_preprocess_text(text):
+    normalizer = TextNormalizer(STOP_WORDS, strip_datelines=True)
+    assert normalizer.normalize(text) == old_lr_preprocess(text, STOP_WORDS)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_rf_normalization_matches_the_old_preprocess_text(text):
+    normalizer = TextNormalizer(STOP_WORDS, strip_datelines=False)
+    assert normalizer.normalize(text) == old_rf_preprocess(text, STOP_WORDS)
+
+
+def test_every_ascii_character():
+    text = ''.join(chr(c) for c in range(128)) * 2
+    assert TextNormalizer(STOP_WORDS).normalize(text) == old_lr_preprocess(text, STOP_WORDS)
+
+
+def test_non_strings_pass_through():
+    normalizer = TextNormalizer(STOP_WORDS)
+    assert normalizer.normalize(None) is None
+    assert normalizer.normalize(3.5) == 3.5
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_normalize_many_keeps_series_index_and_order(n_jobs):
+    texts = pd.Series(SAMPLES * 3, index=range(100, 100 + 3 * len(SAMPLES)), name='content')
+    normalizer = TextNormalizer(STOP_WORDS)
+    result = normalizer.normalize_many(texts, n_jobs=n_jobs, chunk_size=4)
+    assert result.index.equals(texts.index) and result.name == 'content'
+    assert result.tolist() == [old_lr_preprocess(text, STOP_WORDS) for text in texts]
+    assert normalizer.normalize_many(SAMPLES, n_jobs=n_jobs, chunk_size=4) == result.tolist()[:len(SAMPLES)]
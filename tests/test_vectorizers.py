@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.features.vectorizers import ShardedTfidfVectorizer
+
+DOCS = [
+    "the senate passed the bill on tuesday after a long debate",
+    "officials said the bill would cut taxes for most families",
+    "breaking shocking truth about the senate they do not want you to know",
+    "you will not believe what this senator said about taxes",
+    "the president signed the bill into law on friday",
+    "share this before it gets deleted the truth about taxes",
+    "lawmakers debate the budget as the deadline approaches",
+    "a long debate in the house ended without a vote on friday",
+]
+UNSEEN = ["the senate debate about taxes", "nothing in the vocabulary here zzz", ""]
+
+
+def assert_same_fit(sharded, reference, docs):
+    X = sharded.fit_transform(docs)
+    X_ref = reference.fit_transform(docs)
+    assert sharded.vocabulary_ == reference.vocabulary_
+    np.testing.assert_allclose(sharded.idf_, reference.idf_)
+    np.testing.assert_allclose(X.toarray(), X_ref.toarray())
+    np.testing.assert_allclose(sharded.transform(UNSEEN).toarray(), reference.transform(UNSEEN).toarray())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+@pytest.mark.parametrize("ngram_range", [(1, 1), (1, 3)])
+def test_matches_tfidf_vectorizer(chunk_size, ngram_range):
+    assert_same_fit(
+        ShardedTfidfVectorizer(ngram_range=ngram_range, chunk_size=chunk_size),
+        TfidfVectorizer(lowercase=False, ngram_range=ngram_range),
+        DOCS
+    )
+
+
+@pytest.mark.parametrize("max_features", [1, 5, 20, 1000])
+def test_max_features_picks_the_same_terms(max_features):
+    assert_same_fit(
+        ShardedTfidfVectorizer(max_features=max_features, ngram_range=(1, 2), chunk_size=3),
+        TfidfVectorizer(lowercase=False, max_features=max_features, ngram_range=(1, 2)),
+        DOCS
+    )
+
+
+def test_worker_processes_match_a_single_process():
+    single = ShardedTfidfVectorizer(max_features=30, ngram_range=(1, 2), chunk_size=2)
+    sharded = ShardedTfidfVectorizer(max_features=30, ngram_range=(1, 2), chunk_size=2, n_jobs=2)
+    X = single.fit_transform(DOCS)
+    X_sharded = sharded.fit_transform(DOCS)
+    assert sharded.vocabulary_ == single.vocabulary_
+    np.testing.assert_allclose(X_sharded.toarray(), X.toarray())
+
+
+def test_dtype_is_kept():
+    X = ShardedTfidfVectorizer(chunk_size=3, dtype=np.float32).fit_transform(DOCS)
+    assert X.dtype == np.float32